@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'service_manager.accounts'
+
+    def ready(self):
+        import service_manager.accounts.checks
+        import service_manager.accounts.signals
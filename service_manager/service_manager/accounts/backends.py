@@ -0,0 +1,77 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import transaction
+
+PERMISSIONS_KEY_PREFIX = 'permissions'
+# Changed when the permissions of many users change at once, e.g. the permissions of a group
+GLOBAL_VERSION_KEY = f'{PERMISSIONS_KEY_PREFIX}:version'
+
+DEFAULT_CACHE_TIMEOUT = 60 * 60
+
+
+def user_version_key(user_id):
+    return f'{PERMISSIONS_KEY_PREFIX}:version:{user_id}'
+
+
+def get_permissions_key(user_id):
+    """
+    Cache key of the permissions of the user, which changes with the global and the user's version.
+    """
+    keys = [GLOBAL_VERSION_KEY, user_version_key(user_id)]
+    versions = cache.get_many(keys)
+
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+
+    return f'{PERMISSIONS_KEY_PREFIX}:{user_id}:' + '.'.join(versions[key] for key in keys)
+
+
+def _delete_versions(keys):
+    cache.delete_many(keys)
+    # Once more after the commit, in case another request cached the old permissions meanwhile
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_user_permissions(*user_ids):
+    if user_ids:
+        _delete_versions([user_version_key(user_id) for user_id in user_ids])
+
+
+def invalidate_all_permissions():
+    _delete_versions([GLOBAL_VERSION_KEY])
+
+
+class CachedPermissionsBackend(ModelBackend):
+    """
+    ModelBackend which keeps the user and group permissions of every user in the shared cache,
+    so the permission checks of a request don't query the database once they are cached.
+    The signals of the accounts app invalidate them when the users, groups or permissions change.
+    """
+    PERMISSION_NAMES = ('user', 'group')
+
+    def _get_permissions(self, user_obj, obj, from_name):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+
+        perm_cache_name = f'_{from_name}_perm_cache'
+        if not hasattr(user_obj, perm_cache_name):
+            for (name, perms) in self.__get_cached_permissions(user_obj).items():
+                setattr(user_obj, f'_{name}_perm_cache', perms)
+        return getattr(user_obj, perm_cache_name)
+
+    def __get_cached_permissions(self, user_obj):
+        key = get_permissions_key(user_obj.pk)
+        permissions = cache.get(key)
+        if permissions is None:
+            permissions = {
+                name: super(CachedPermissionsBackend, self)._get_permissions(user_obj, None, name)
+                for name in self.PERMISSION_NAMES
+            }
+            timeout = getattr(settings, 'PERMISSIONS_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT)
+            cache.set(key, permissions, timeout)
+        return permissions
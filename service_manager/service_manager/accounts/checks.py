@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core import checks
+
+CACHED_PERMISSIONS_BACKEND = 'service_manager.accounts.backends.CachedPermissionsBackend'
+PER_PROCESS_CACHE_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_permissions_cache(app_configs, **kwargs):
+    """
+    The permissions cached by a process are invalidated in that process only, unless the cache is shared.
+    """
+    if settings.DEBUG or CACHED_PERMISSIONS_BACKEND not in settings.AUTHENTICATION_BACKENDS:
+        return []
+    if settings.CACHES['default']['BACKEND'] != PER_PROCESS_CACHE_BACKEND:
+        return []
+    return [checks.Error(
+        'The permissions are cached per process, the other processes miss their changes '
+        'for PERMISSIONS_CACHE_TIMEOUT seconds.',
+        hint='Configure a cache shared by the processes with CACHE_BACKEND and CACHE_LOCATION, e.g. Redis.',
+        id='accounts.E001',
+    )]
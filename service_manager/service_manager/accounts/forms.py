@@ -6,6 +6,7 @@ from service_manager.accounts.models import Profile
 from service_manager.accounts.tasks import send_password_reset_email_async
 from service_manager.core.forms import BootstrapFormMixin
 from service_manager.core.validators import validate_digits_only
+from service_manager.mailing import outbox
 
 UserModel = get_user_model()
 
@@ -67,7 +68,8 @@ class PasswordResetForm(BootstrapFormMixin, auth_forms.PasswordResetForm):
                   from_email, to_email, html_email_template_name=None):
         context['user'] = context['user'].id
 
-        send_password_reset_email_async.delay(
+        outbox.publish(
+            send_password_reset_email_async,
             subject_template_name=subject_template_name,
             email_template_name=email_template_name,
             context=context, from_email=from_email, to_email=to_email,
@@ -1,9 +1,59 @@
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import UserManager
+from django.db import models
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
+
+
+def profile_full_name_expression(prefix=''):
+    """
+    SQL counterpart of Profile.full_name.
+    """
+    return Concat(f'{prefix}first_name', Value(' '), f'{prefix}last_name', output_field=CharField())
+
+
+def user_display_name_subquery(user_ref='pk'):
+    """
+    Full name from the profile of the user referenced by the outer query, empty when the user has no profile.
+    """
+    from service_manager.accounts.models import Profile
+
+    profiles = Profile.objects.filter(app_user_id=OuterRef(user_ref)).values(
+        full_name=profile_full_name_expression(),
+    )
+
+    return Coalesce(Subquery(profiles, output_field=CharField()), Value(''))
+
+
+class AppUserQuerySet(models.QuerySet):
+    def refresh_display_name(self):
+        """
+        Copy the full name from the profile of every user in the queryset with a single UPDATE.
+        """
+        return self.update(display_name=user_display_name_subquery())
+
+    def display_names(self):
+        """
+        {pk: display name} of the users in the queryset, loaded with a single query.
+        Users without a profile are shown by their email, like AppUser.__str__ does.
+        """
+        return {
+            pk: display_name or email
+            for (pk, display_name, email) in self.values_list('pk', 'display_name', 'email')
+        }
 
 
 class AppUserManager(BaseUserManager):
+    def get_queryset(self):
+        return AppUserQuerySet(self.model, using=self._db)
+
+    def refresh_display_name(self):
+        return self.get_queryset().refresh_display_name()
+
+    def display_names(self):
+        return self.get_queryset().display_names()
+
     def _create_user(self, email, password, **extra_fields):
         """
         Create and save a user with the given username, email, and password.
@@ -0,0 +1,43 @@
+# Generated by Django 4.1.1 on 2026-10-18 21:00
+
+from django.db import migrations, models
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
+
+
+def copy_display_names(apps, schema_editor):
+    AppUser = apps.get_model("accounts", "AppUser")
+    Profile = apps.get_model("accounts", "Profile")
+
+    # The full name of the profile at this point, "<first name> <last name>"
+    profiles = Profile.objects.filter(app_user_id=OuterRef("pk")).values(
+        full_name=Concat(
+            "first_name", Value(" "), "last_name", output_field=CharField()
+        )
+    )
+
+    AppUser.objects.update(
+        display_name=Coalesce(Subquery(profiles, output_field=CharField()), Value(""))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_alter_appuser_email_alter_profile_app_user_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="appuser",
+            name="display_name",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                max_length=41,
+                verbose_name="display_name",
+            ),
+        ),
+        migrations.RunPython(copy_display_names, migrations.RunPython.noop),
+    ]
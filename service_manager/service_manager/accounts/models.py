@@ -7,6 +7,8 @@ from django.utils.translation import gettext_lazy as _
 
 
 class AppUser(auth_models.AbstractBaseUser, auth_models.PermissionsMixin):
+    DISPLAY_NAME_MAX_LENGTH = 41
+
     email = models.EmailField(
         unique=True,
         null=False,
@@ -26,14 +28,21 @@ class AppUser(auth_models.AbstractBaseUser, auth_models.PermissionsMixin):
         default=True,
     )
 
+    # Copy of Profile.full_name, kept in sync by the Profile signals,
+    # so showing a user doesn't need a query for the profile
+    display_name = models.CharField(
+        _('display_name'),
+        max_length=DISPLAY_NAME_MAX_LENGTH,
+        blank=True,
+        default='',
+        editable=False,
+    )
+
     USERNAME_FIELD = 'email'
 
     @property
     def profile_full_name(self):
-        profile = Profile.objects.filter(pk=self.pk)
-        if profile:
-            return profile[0].full_name
-        return self.email
+        return self.display_name or self.email
 
     objects = AppUserManager()
 
@@ -0,0 +1,63 @@
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from service_manager.accounts.backends import invalidate_user_permissions, invalidate_all_permissions
+from service_manager.accounts.models import AppUser, Profile
+
+
+def update_display_name(profile, display_name):
+    AppUser.objects.filter(pk=profile.app_user_id).update(display_name=display_name)
+
+    # Keep the user instance which created or edited the profile up to date as well
+    if Profile.app_user.is_cached(profile):
+        profile.app_user.display_name = display_name
+
+
+@receiver(post_save, sender=Profile)
+def profile_saved(sender, instance, **kwargs):
+    update_display_name(instance, instance.full_name)
+
+
+@receiver(post_delete, sender=Profile)
+def profile_deleted(sender, instance, **kwargs):
+    update_display_name(instance, '')
+
+
+@receiver(post_save, sender=AppUser)
+@receiver(post_delete, sender=AppUser)
+def user_changed(sender, instance, **kwargs):
+    """
+    E.g. a user who becomes a superuser gets all permissions.
+    """
+    invalidate_user_permissions(instance.pk)
+
+
+@receiver(m2m_changed, sender=AppUser.groups.through)
+@receiver(m2m_changed, sender=AppUser.user_permissions.through)
+def user_groups_or_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    user.groups / user.user_permissions or the reverse group.user_set / permission.user_set changed.
+    """
+    if not action.startswith('post_'):
+        return
+
+    if not reverse:
+        invalidate_user_permissions(instance.pk)
+    elif pk_set is not None:
+        invalidate_user_permissions(*pk_set)
+    else:
+        invalidate_all_permissions()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate_all_permissions()
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def groups_or_permissions_changed(sender, **kwargs):
+    invalidate_all_permissions()
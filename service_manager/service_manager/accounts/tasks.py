@@ -1,7 +1,8 @@
 from celery import shared_task
 from django.contrib.auth import get_user_model
-from django.contrib.auth.forms import PasswordResetForm
-from django.contrib.auth.models import User
+from django.template import loader
+
+from service_manager.mailing.dispatch import queue_email
 
 
 @shared_task
@@ -10,12 +11,18 @@ def send_password_reset_email_async(subject_template_name, email_template_name,
     user_model = get_user_model()
     context['user'] = user_model.objects.get(pk=context['user'])
 
-    PasswordResetForm.send_mail(
-        None,
-        subject_template_name,
-        email_template_name,
-        context,
-        from_email,
-        to_email,
-        html_email_template_name
+    # The same email PasswordResetForm.send_mail sends, queued to go out with the next batch
+    subject = loader.render_to_string(subject_template_name, context)
+    subject = ''.join(subject.splitlines())
+    body = loader.render_to_string(email_template_name, context)
+    html_body = None
+    if html_email_template_name is not None:
+        html_body = loader.render_to_string(html_email_template_name, context)
+
+    queue_email(
+        subject=subject,
+        message=body,
+        html_message=html_body,
+        from_email=from_email,
+        recipient_list=[to_email],
     )
@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from service_manager.accounts.forms import RegisterForm
+from service_manager.accounts.models import Profile
+
+UserModel = get_user_model()
+
+
+class AppUserDisplayNameTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        self.user = UserModel.objects.create_user(**self.USER_DATA)
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=self.user)
+
+    def test_str__when_profile_is_created__expect_full_name_without_queries(self):
+        user = UserModel.objects.get(pk=self.user.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual('Dev User', str(user))
+
+    def test_str__when_user_has_no_profile__expect_email(self):
+        user = UserModel.objects.create_user(email='other@dev.com', password='dev')
+
+        self.assertEqual('other@dev.com', str(user))
+
+    def test_register_form__expect_display_name_stored(self):
+        form = RegisterForm(data={
+            'email': 'new@dev.com',
+            'first_name': 'New',
+            'last_name': 'Technician',
+            'phone_number': '123456',
+            'password1': 'Str0ng-Passw0rd',
+            'password2': 'Str0ng-Passw0rd',
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+
+        user = form.save()
+
+        self.assertEqual('New Technician', str(user))
+        self.assertEqual('New Technician', UserModel.objects.get(pk=user.pk).display_name)
+
+    def test_edit_profile__expect_display_name_updated(self):
+        self.client.login(**self.USER_DATA)
+
+        self.client.post(reverse('edit_profile', kwargs={'pk': self.user.pk}), data={
+            'first_name': 'Senior',
+            'last_name': 'Technician',
+            'phone_number': '123456',
+        })
+
+        self.assertEqual('Senior Technician', UserModel.objects.get(pk=self.user.pk).display_name)
+
+    def test_delete_profile__expect_email_shown(self):
+        Profile.objects.get(pk=self.user.pk).delete()
+
+        self.assertEqual('dev@dev.com', str(UserModel.objects.get(pk=self.user.pk)))
+
+    def test_display_names__expect_single_query(self):
+        UserModel.objects.create_user(email='other@dev.com', password='dev')
+
+        with self.assertNumQueries(1):
+            display_names = UserModel.objects.order_by('pk').display_names()
+
+        self.assertEqual(['Dev User', 'other@dev.com'], list(display_names.values()))
+
+    def test_refresh_display_name__when_profile_is_updated_in_bulk__expect_synced(self):
+        Profile.objects.filter(pk=self.user.pk).update(first_name='Bulk')
+
+        UserModel.objects.filter(pk=self.user.pk).refresh_display_name()
+
+        self.assertEqual('Bulk User', UserModel.objects.get(pk=self.user.pk).display_name)
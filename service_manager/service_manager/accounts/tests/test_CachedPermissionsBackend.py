@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from service_manager.accounts.checks import check_permissions_cache
+from service_manager.accounts.models import Profile
+
+UserModel = get_user_model()
+
+
+class CachedPermissionsBackendTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        cache.clear()
+
+        self.user = UserModel.objects.create_user(**self.USER_DATA)
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=self.user)
+        self.group = Group.objects.create(name='Technicians')
+        self.group.permissions.add(Permission.objects.get(codename='view_customer'))
+        self.user.groups.add(self.group)
+
+    def __has_perm(self, perm):
+        return UserModel.objects.get(pk=self.user.pk).has_perm(perm)
+
+    def test_has_perm__when_permissions_are_cached__expect_no_queries(self):
+        self.assertTrue(self.__has_perm('customers.view_customer'))
+        user = UserModel.objects.get(pk=self.user.pk)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm('customers.view_customer'))
+            self.assertFalse(user.has_perm('customers.add_customer'))
+
+    def test_has_perm__when_user_permission_is_added__expect_granted(self):
+        self.assertFalse(self.__has_perm('customers.add_customer'))
+
+        self.user.user_permissions.add(Permission.objects.get(codename='add_customer'))
+
+        self.assertTrue(self.__has_perm('customers.add_customer'))
+
+    def test_has_perm__when_group_permission_is_added__expect_granted(self):
+        self.assertFalse(self.__has_perm('customers.change_customer'))
+
+        self.group.permissions.add(Permission.objects.get(codename='change_customer'))
+
+        self.assertTrue(self.__has_perm('customers.change_customer'))
+
+    def test_has_perm__when_user_is_removed_from_group__expect_revoked(self):
+        self.assertTrue(self.__has_perm('customers.view_customer'))
+
+        self.group.user_set.remove(self.user)
+
+        self.assertFalse(self.__has_perm('customers.view_customer'))
+
+    def test_has_perm__when_user_becomes_superuser__expect_granted(self):
+        self.assertFalse(self.__has_perm('customers.delete_customer'))
+
+        self.user.is_superuser = True
+        self.user.save()
+
+        self.assertTrue(self.__has_perm('customers.delete_customer'))
+
+    def test_get__when_page_is_opened_again__expect_no_permission_queries(self):
+        self.client.login(**self.USER_DATA)
+        self.client.get(reverse('customers_list'))
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('customers_list'))
+
+        permission_queries = [x['sql'] for x in context.captured_queries
+                              if f'"{Permission._meta.db_table}"' in x['sql']]
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([], permission_queries)
+
+
+class PermissionsCacheCheckTests(SimpleTestCase):
+    @override_settings(DEBUG=False, CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_check__when_cache_is_per_process__expect_error(self):
+        self.assertEqual(['accounts.E001'], [x.id for x in check_permissions_cache(None)])
+
+    @override_settings(DEBUG=False, CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}})
+    def test_check__when_cache_is_shared__expect_no_errors(self):
+        self.assertEqual([], check_permissions_cache(None))
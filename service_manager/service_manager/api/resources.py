@@ -0,0 +1,165 @@
+from dataclasses import dataclass
+
+from django.db.models import Prefetch
+
+from service_manager.customers.models import Customer, CustomerAsset
+from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail, ArchivedServiceOrderHeader, \
+    ArchivedServiceOrderDetail
+
+
+class ResourceError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Relation:
+    """
+    Related resource which can be embedded with ?include=.
+    `accessor` is the foreign key (one) or the reverse relation (many) on the model,
+    `related_field` the foreign key back to the model, which is loaded with the related objects (many).
+    """
+    resource: type
+    accessor: str
+    many: bool = False
+    related_field: str = None
+
+
+class Resource:
+    """
+    Read-only view of a model for the JSON API.
+    Only the requested fields are loaded, the relations to one object are selected with a join
+    and every relation to many objects is prefetched with one more query, whatever the number of rows.
+    """
+    model = None
+    fields = ()
+    relations = {}
+    ordering = ('pk',)
+    permission_required = None
+
+    @classmethod
+    def get_queryset(cls):
+        return cls.model.objects.all()
+
+    @classmethod
+    def parse_fields(cls, value):
+        if not value:
+            return cls.fields
+        fields = tuple(x.strip() for x in value.split(',') if x.strip())
+        unknown = [x for x in fields if x not in cls.fields]
+        if unknown:
+            raise ResourceError(f'Unknown fields: {", ".join(unknown)}')
+        return fields
+
+    @classmethod
+    def parse_includes(cls, value):
+        if not value:
+            return ()
+        includes = tuple(x.strip() for x in value.split(',') if x.strip())
+        unknown = [x for x in includes if x not in cls.relations]
+        if unknown:
+            raise ResourceError(f'Unknown relations: {", ".join(unknown)}')
+        return includes
+
+    @classmethod
+    def build_queryset(cls, fields, includes=(), related_fields=None):
+        """
+        The queryset of the resource with `fields` and the `includes` relations (with `related_fields[name]`).
+        """
+        related_fields = related_fields or {}
+        queryset = cls.get_queryset()
+        only = [cls.model._meta.pk.name, *fields]
+        for name in includes:
+            relation = cls.relations[name]
+            relation_fields = related_fields.get(name, relation.resource.fields)
+            if relation.many:
+                related_queryset = relation.resource.get_queryset() \
+                    .only(relation.resource.model._meta.pk.name, relation.related_field, *relation_fields) \
+                    .order_by(*relation.resource.ordering)
+                queryset = queryset.prefetch_related(
+                    Prefetch(relation.accessor, queryset=related_queryset, to_attr=cls.prefetch_attr(name)))
+            else:
+                queryset = queryset.select_related(relation.accessor)
+                only.extend([relation.accessor, *(f'{relation.accessor}__{x}' for x in relation_fields)])
+                if hasattr(relation.resource.model, 'active'):
+                    only.append(f'{relation.accessor}__active')
+        return queryset.only(*only)
+
+    @staticmethod
+    def prefetch_attr(name):
+        return f'api_{name}'
+
+    @classmethod
+    def serialize(cls, obj, fields, includes=(), related_fields=None):
+        related_fields = related_fields or {}
+        data = {name: getattr(obj, name) for name in fields}
+        for name in includes:
+            relation = cls.relations[name]
+            relation_fields = related_fields.get(name, relation.resource.fields)
+            if relation.many:
+                data[name] = [relation.resource.serialize(x, relation_fields)
+                              for x in getattr(obj, cls.prefetch_attr(name))]
+            else:
+                related = getattr(obj, relation.accessor)
+                # A soft deleted related object is left out, the way the pages leave it out
+                is_shown = related is not None and getattr(related, 'active', True)
+                data[name] = relation.resource.serialize(related, relation_fields) if is_shown else None
+        return data
+
+
+class CustomerResource(Resource):
+    model = Customer
+    fields = ('id', 'name', 'vat', 'email_address', 'phone_number', 'type_id', 'created_on', 'updated_on')
+    ordering = ('name',)
+    permission_required = 'customers.view_customer'
+
+
+class CustomerAssetResource(Resource):
+    model = CustomerAsset
+    fields = ('id', 'serial_number', 'product_number', 'customer_id', 'asset_id', 'created_on', 'updated_on')
+    permission_required = 'customers.view_customerasset'
+    relations = {
+        'customer': Relation(CustomerResource, 'customer'),
+    }
+
+
+class ServiceOrderDetailResource(Resource):
+    model = ServiceOrderDetail
+    fields = ('id', 'service_order_id', 'material_id', 'quantity', 'discount', 'created_on', 'updated_on')
+    permission_required = 'main.view_serviceorderdetail'
+
+
+class ServiceOrderResource(Resource):
+    model = ServiceOrderHeader
+    fields = (
+        'id', 'problem_description', 'is_serviced', 'is_completed', 'total_amount', 'customer_id',
+        'customer_asset_id', 'department_id', 'accepted_by_id', 'serviced_by_id', 'serviced_on',
+        'completed_by_id', 'completed_on', 'created_on', 'updated_on',
+    )
+    ordering = ('-created_on',)
+    permission_required = 'main.view_serviceorderheader'
+    relations = {
+        'customer': Relation(CustomerResource, 'customer'),
+        'customer_asset': Relation(CustomerAssetResource, 'customer_asset'),
+        'details': Relation(ServiceOrderDetailResource, 'serviceorderdetail_set', many=True,
+                            related_field='service_order'),
+    }
+
+
+# The service orders moved to the archive (see main/archive.py), with the same ids and fields
+class ArchivedServiceOrderDetailResource(ServiceOrderDetailResource):
+    model = ArchivedServiceOrderDetail
+
+
+class ArchivedServiceOrderResource(ServiceOrderResource):
+    model = ArchivedServiceOrderHeader
+    relations = {
+        **ServiceOrderResource.relations,
+        'details': Relation(ArchivedServiceOrderDetailResource, 'serviceorderdetail_set', many=True,
+                            related_field='service_order'),
+    }
+
+
+# Declared once both resources exist, they refer to each other
+CustomerResource.relations = {
+    'customer_assets': Relation(CustomerAssetResource, 'customerasset_set', many=True, related_field='customer'),
+}
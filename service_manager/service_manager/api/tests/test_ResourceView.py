@@ -0,0 +1,150 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from service_manager.accounts.models import Profile
+from service_manager.core.query_budget import QueryRecorder
+from service_manager.customers.models import Customer, CustomerAsset
+from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail
+from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset, MaterialCategory, \
+    Material
+
+UserModel = get_user_model()
+
+
+class ResourceViewTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserModel.objects.create_user(**self.USER_DATA)
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=self.user)
+        for codename in ('view_serviceorderheader', 'view_customer'):
+            self.user.user_permissions.add(Permission.objects.get(codename=codename))
+
+        self.customer = Customer.objects.create(
+            type=CustomerType.objects.create(name='Business'),
+            name='Testing Inc.',
+            vat='123444121',
+            email_address='testing@inc.com',
+            phone_number='100921122',
+        )
+        self.customer_asset = CustomerAsset.objects.create(
+            customer=self.customer,
+            asset=Asset.objects.create(
+                category=AssetCategory.objects.create(name='Phones'),
+                brand=Brand.objects.create(name='Apple'),
+                model_name='iPhone',
+                model_number='13 Pro',
+            ),
+            serial_number='SN-1',
+        )
+        self.material = Material.objects.create(name='Screen', price=100,
+                                                category=MaterialCategory.objects.create(name='Parts'))
+        self.service_orders = [self.__create_service_order(i) for i in range(3)]
+
+        self.client.login(**self.USER_DATA)
+
+    def __create_service_order(self, i):
+        service_order = ServiceOrderHeader.objects.create(
+            customer=self.customer,
+            customer_asset=self.customer_asset,
+            problem_description=f'Problem {i}',
+            send_emails=False,
+        )
+        for quantity in (1, 2):
+            ServiceOrderDetail.objects.create(service_order=service_order, material=self.material,
+                                              quantity=quantity, discount=0)
+        return service_order
+
+    def __get(self, url_name, params=None, **kwargs):
+        # Every request is measured with the permissions not cached yet
+        cache.clear()
+        recorder = QueryRecorder()
+        with recorder.record():
+            response = self.client.get(reverse(url_name, kwargs=kwargs or None), params)
+        return response, recorder.count
+
+    def test_get__when_fields_are_given__expect_only_those_fields(self):
+        response, _ = self.__get('api_v1_service_order', {'fields': 'id,problem_description'},
+                                 pk=self.service_orders[0].pk)
+
+        self.assertEqual({'data': {'id': self.service_orders[0].pk, 'problem_description': 'Problem 0'}},
+                         response.json())
+
+    def test_get__when_relations_are_included__expect_same_queries_for_any_number_of_rows(self):
+        for codename in ('view_customerasset', 'view_serviceorderdetail'):
+            self.user.user_permissions.add(Permission.objects.get(codename=codename))
+        params = {
+            'include': 'customer,customer_asset,details',
+            'fields': 'id',
+            'fields[customer]': 'name',
+            'fields[customer_asset]': 'serial_number',
+            'fields[details]': 'quantity',
+        }
+        response, queries_count = self.__get('api_v1_service_orders', params)
+        self.__create_service_order(3)
+        self.__create_service_order(4)
+        more_response, more_queries_count = self.__get('api_v1_service_orders', params)
+
+        self.assertEqual(queries_count, more_queries_count)
+        self.assertEqual(5, len(more_response.json()['data']))
+        self.assertEqual({
+            'id': self.service_orders[0].pk,
+            'customer': {'name': 'Testing Inc.'},
+            'customer_asset': {'serial_number': 'SN-1'},
+            'details': [{'quantity': 1.0}, {'quantity': 2.0}],
+        }, response.json()['data'][-1])
+
+    def test_get__when_ids_are_given__expect_those_objects(self):
+        ids = f'{self.service_orders[0].pk},{self.service_orders[2].pk}'
+
+        response, _ = self.__get('api_v1_service_orders', {'ids': ids, 'fields': 'id'})
+
+        self.assertEqual([{'id': self.service_orders[2].pk}, {'id': self.service_orders[0].pk}],
+                         response.json()['data'])
+
+    def test_get__when_following_the_next_cursor__expect_every_object_once(self):
+        response, _ = self.__get('api_v1_service_orders', {'fields': 'id', 'limit': 2})
+        next_response = self.client.get(response.json()['next'])
+
+        ids = [x['id'] for x in response.json()['data'] + next_response.json()['data']]
+        self.assertEqual([x.pk for x in reversed(self.service_orders)], ids)
+        self.assertIsNone(next_response.json()['next'])
+        self.assertIsNotNone(next_response.json()['previous'])
+
+    def test_get__when_field_is_unknown__expect_bad_request(self):
+        response, _ = self.__get('api_v1_customers', {'fields': 'id,password'})
+
+        self.assertEqual(400, response.status_code)
+        self.assertEqual({'error': 'Unknown fields: password'}, response.json())
+
+    def test_get__when_object_is_soft_deleted__expect_not_found(self):
+        self.service_orders[0].delete()
+
+        response, _ = self.__get('api_v1_service_order', pk=self.service_orders[0].pk)
+
+        self.assertEqual(404, response.status_code)
+
+    def test_get__when_user_has_no_permission__expect_forbidden(self):
+        response, _ = self.__get('api_v1_customer_assets')
+
+        self.assertEqual(403, response.status_code)
+
+    def test_get__when_user_has_no_permission_for_included_relation__expect_forbidden(self):
+        response, _ = self.__get('api_v1_customers', {'include': 'customer_assets'})
+
+        self.assertEqual(403, response.status_code)
+        self.assertEqual({'error': 'Permission denied.'}, response.json())
+
+    def test_get__when_user_is_not_logged__expect_unauthorized(self):
+        self.client.logout()
+
+        response, _ = self.__get('api_v1_customers')
+
+        self.assertEqual(401, response.status_code)
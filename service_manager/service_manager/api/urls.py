@@ -0,0 +1,42 @@
+from django.urls import path
+
+from service_manager.api.resources import ServiceOrderResource, ServiceOrderDetailResource, CustomerResource, \
+    CustomerAssetResource, ArchivedServiceOrderResource, ArchivedServiceOrderDetailResource
+from service_manager.api.views import ResourceView
+
+urlpatterns = [
+    path('service_orders/', ResourceView.as_view(resource=ServiceOrderResource), name='api_v1_service_orders'),
+    path('service_orders/<int:pk>/', ResourceView.as_view(resource=ServiceOrderResource), name='api_v1_service_order'),
+    path('service_order_details/', ResourceView.as_view(resource=ServiceOrderDetailResource),
+         name='api_v1_service_order_details'),
+    path('service_order_details/<int:pk>/', ResourceView.as_view(resource=ServiceOrderDetailResource),
+         name='api_v1_service_order_detail'),
+    path('archived_service_orders/', ResourceView.as_view(resource=ArchivedServiceOrderResource),
+         name='api_v1_archived_service_orders'),
+    path('archived_service_orders/<int:pk>/', ResourceView.as_view(resource=ArchivedServiceOrderResource),
+         name='api_v1_archived_service_order'),
+    path('archived_service_order_details/', ResourceView.as_view(resource=ArchivedServiceOrderDetailResource),
+         name='api_v1_archived_service_order_details'),
+    path('archived_service_order_details/<int:pk>/', ResourceView.as_view(resource=ArchivedServiceOrderDetailResource),
+         name='api_v1_archived_service_order_detail'),
+    path('customers/', ResourceView.as_view(resource=CustomerResource), name='api_v1_customers'),
+    path('customers/<int:pk>/', ResourceView.as_view(resource=CustomerResource), name='api_v1_customer'),
+    path('customer_assets/', ResourceView.as_view(resource=CustomerAssetResource), name='api_v1_customer_assets'),
+    path('customer_assets/<int:pk>/', ResourceView.as_view(resource=CustomerAssetResource), name='api_v1_customer_asset'),
+]
+
+# Maximum number of queries per request, enforced by main/tests/test_query_budgets.py
+query_budgets = {
+    'api_v1_service_orders': 5,
+    'api_v1_service_order': 5,
+    'api_v1_service_order_details': 5,
+    'api_v1_service_order_detail': 5,
+    'api_v1_archived_service_orders': 5,
+    'api_v1_archived_service_order': 5,
+    'api_v1_archived_service_order_details': 5,
+    'api_v1_archived_service_order_detail': 5,
+    'api_v1_customers': 5,
+    'api_v1_customer': 5,
+    'api_v1_customer_assets': 5,
+    'api_v1_customer_asset': 5,
+}
@@ -0,0 +1,128 @@
+import re
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, Http404
+import django.views.generic as views
+
+from service_manager.api.resources import ResourceError
+from service_manager.core.pagination import KeysetPaginator
+
+DEFAULT_PAGE_SIZE = 25
+DEFAULT_MAX_PAGE_SIZE = 100
+
+RELATED_FIELDS_PARAM_RE = re.compile(r'^fields\[(?P<name>\w+)]$')
+
+
+def error_response(status, message):
+    return JsonResponse({'error': message}, status=status)
+
+
+class ResourceView(views.View):
+    """
+    Read-only JSON endpoint of a resource, a single object when the url has a pk, otherwise a list.
+
+    Query parameters:
+    - fields: comma separated fields to return, fields[<relation>] the fields of an included relation
+    - include: comma separated relations to embed, the user needs the permission of their resources as well
+    - ids: comma separated primary keys to fetch at once, instead of a page
+    - cursor, limit: the page (the "next" and "previous" links of the response) and its size
+    """
+    resource = None
+
+    def get(self, request, pk=None):
+        if not request.user.is_authenticated:
+            return error_response(401, 'Authentication required.')
+        if not request.user.has_perm(self.resource.permission_required):
+            return error_response(403, 'Permission denied.')
+
+        try:
+            queryset = self.get_queryset()
+            if not self.has_include_permissions():
+                return error_response(403, 'Permission denied.')
+            if pk is not None:
+                return self.render_object(queryset, pk)
+            ids = self.parse_ids()
+            if ids is not None:
+                return self.render_objects(queryset.filter(pk__in=ids).order_by(*self.resource.ordering))
+            return self.render_page(queryset)
+        except ResourceError as ex:
+            return error_response(400, str(ex))
+        except Http404:
+            return error_response(404, 'Not found.')
+
+    def get_queryset(self):
+        params = self.request.GET
+        self.fields = self.resource.parse_fields(params.get('fields'))
+        self.includes = self.resource.parse_includes(params.get('include'))
+        self.related_fields = {}
+        for (key, value) in params.items():
+            match = RELATED_FIELDS_PARAM_RE.match(key)
+            if not match:
+                continue
+            name = match.group('name')
+            if name not in self.includes:
+                raise ResourceError(f'Fields of a relation which is not included: {name}')
+            self.related_fields[name] = self.resource.relations[name].resource.parse_fields(value)
+        return self.resource.build_queryset(self.fields, self.includes, self.related_fields)
+
+    # The included relations are embedded only for the users who may view them on their own as well
+    def has_include_permissions(self):
+        return all(self.request.user.has_perm(self.resource.relations[x].resource.permission_required)
+                   for x in self.includes)
+
+    def get_max_page_size(self):
+        return getattr(settings, 'API_MAX_PAGE_SIZE', DEFAULT_MAX_PAGE_SIZE)
+
+    def parse_ids(self):
+        value = self.request.GET.get('ids')
+        if value is None:
+            return None
+        try:
+            ids = [int(x) for x in value.split(',') if x.strip()]
+        except ValueError:
+            raise ResourceError('The ids must be integers.')
+        if len(ids) > self.get_max_page_size():
+            raise ResourceError(f'At most {self.get_max_page_size()} ids can be fetched at once.')
+        return ids
+
+    def parse_limit(self):
+        value = self.request.GET.get('limit')
+        if not value:
+            return getattr(settings, 'API_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+        try:
+            limit = int(value)
+        except ValueError:
+            raise ResourceError('The limit must be an integer.')
+        return min(max(limit, 1), self.get_max_page_size())
+
+    def serialize(self, obj):
+        return self.resource.serialize(obj, self.fields, self.includes, self.related_fields)
+
+    def render(self, data):
+        return JsonResponse(data, encoder=DjangoJSONEncoder)
+
+    def render_object(self, queryset, pk):
+        obj = queryset.filter(pk=pk).first()
+        if obj is None:
+            raise Http404
+        return self.render({'data': self.serialize(obj)})
+
+    def render_objects(self, queryset):
+        return self.render({'data': [self.serialize(x) for x in queryset]})
+
+    def render_page(self, queryset):
+        paginator = KeysetPaginator(queryset, self.parse_limit(), self.resource.ordering)
+        page = paginator.page(self.request.GET.get('cursor'))
+        return self.render({
+            'data': [self.serialize(x) for x in page],
+            'next': self.page_url(page.next_cursor),
+            'previous': self.page_url(page.previous_cursor),
+        })
+
+    def page_url(self, cursor):
+        if cursor is None:
+            return None
+        params = self.request.GET.copy()
+        params['cursor'] = cursor
+        return self.request.build_absolute_uri(f'{self.request.path}?{params.urlencode()}')
@@ -0,0 +1,237 @@
+import logging
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+
+from celery import signals as celery_signals
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.dispatch import receiver
+
+logger = logging.getLogger('service_manager.db')
+
+DEFAULT_POOL_TIMEOUT = 30
+# Waits for a connection longer than this are logged as warnings
+SLOW_WAIT_SECONDS = 0.1
+# How often a waiting thread looks for an idle connection to close
+IDLE_CHECK_INTERVAL = 0.05
+
+
+@dataclass
+class PoolStats:
+    size: int
+    in_use: int = 0
+    idle: int = 0
+    connects: int = 0
+    timeouts: int = 0
+    idle_closed: int = 0
+    total_wait: float = 0
+    max_wait: float = 0
+
+    @property
+    def average_wait(self):
+        return self.total_wait / self.connects if self.connects else 0
+
+
+class PoolSlot:
+    """
+    The place of one open connection in the pool, released once however the connection ends.
+    """
+
+    def __init__(self):
+        self.released = False
+        # Closed by another thread while idle, the owner has to open a new connection
+        self.taken_over = False
+        self.raw_connection = None
+
+
+class ConnectionPool:
+    """
+    The connections of a database alias opened by the threads of the process, at most `size` at a time.
+    A connection kept open between the requests or the tasks of its thread is idle meanwhile:
+    a thread waiting for a slot closes the longest idle connection and takes over its slot.
+    """
+
+    def __init__(self, alias, size):
+        self.alias = alias
+        self.size = size
+        self.stats = PoolStats(size=size)
+        self.__slots = threading.BoundedSemaphore(size)
+        self.__lock = threading.Lock()
+        self.__idle = {}
+
+    def acquire(self, timeout):
+        started = time.monotonic()
+        acquired = self.__slots.acquire(blocking=False)
+        while not acquired:
+            self.__close_idle()
+            remaining = started + timeout - time.monotonic()
+            if remaining <= 0:
+                break
+            acquired = self.__slots.acquire(timeout=min(remaining, IDLE_CHECK_INTERVAL))
+        waited = time.monotonic() - started
+
+        with self.__lock:
+            if acquired:
+                self.stats.in_use += 1
+                self.stats.connects += 1
+                self.stats.total_wait += waited
+                self.stats.max_wait = max(self.stats.max_wait, waited)
+            else:
+                self.stats.timeouts += 1
+
+        if not acquired:
+            logger.error('No connection of "%s" got free within %.1fs, %d in use', self.alias, waited, self.size)
+            return None
+        if waited >= SLOW_WAIT_SECONDS:
+            logger.warning('Waited %.3fs for a connection of "%s", %d in use', waited, self.alias, self.size)
+        return PoolSlot()
+
+    def release(self, slot):
+        with self.__lock:
+            if slot.released:
+                return
+            slot.released = True
+            if self.__idle.pop(slot, None) is not None:
+                self.stats.idle -= 1
+            self.stats.in_use -= 1
+        self.__slots.release()
+
+    def mark_idle(self, slot, raw_connection):
+        with self.__lock:
+            if slot.released or slot in self.__idle:
+                return
+            slot.raw_connection = raw_connection
+            self.__idle[slot] = time.monotonic()
+            self.stats.idle += 1
+
+    def mark_busy(self, slot):
+        """
+        Take the connection of the slot back into use, returns False when it was closed meanwhile.
+        """
+        with self.__lock:
+            if self.__idle.pop(slot, None) is not None:
+                self.stats.idle -= 1
+            slot.raw_connection = None
+            return not slot.taken_over
+
+    def __close_idle(self):
+        with self.__lock:
+            if not self.__idle:
+                return
+            slot = min(self.__idle, key=self.__idle.get)
+            slot.taken_over = True
+            self.stats.idle_closed += 1
+        try:
+            slot.raw_connection.close()
+        except Exception:
+            logger.exception('Closing an idle connection of "%s" failed', self.alias)
+        self.release(slot)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, size):
+    with _pools_lock:
+        pool = _pools.get(alias)
+        if pool is None or pool.size != size:
+            pool = _pools[alias] = ConnectionPool(alias, size)
+        return pool
+
+
+def get_pool_stats():
+    """
+    The PoolStats of the process by database alias.
+    """
+    return {alias: pool.stats for (alias, pool) in _pools.items()}
+
+
+def _reset_pools():
+    global _pools_lock
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+# The forked processes (gunicorn and celery workers) don't use the connections of the parent, they open their own
+os.register_at_fork(after_in_child=_reset_pools)
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    DatabaseWrapper mixin which opens at most POOL_SIZE connections of the database per process,
+    waiting up to POOL_TIMEOUT seconds for a free one. Without POOL_SIZE nothing is limited.
+    Django keeps the connections open between the requests and the tasks for CONN_MAX_AGE seconds
+    and checks them before reusing them with CONN_HEALTH_CHECKS. Until they are reused they are idle,
+    so the threads waiting for a connection can close them. The slot of a connection whose thread ended
+    is released when the connection is garbage collected.
+    """
+    pool = None
+    pool_slot = None
+    pool_finalizer = None
+
+    def get_new_connection(self, conn_params):
+        size = self.settings_dict.get('POOL_SIZE')
+        if not size:
+            return super().get_new_connection(conn_params)
+
+        pool = get_pool(self.alias, size)
+        timeout = self.settings_dict.get('POOL_TIMEOUT') or DEFAULT_POOL_TIMEOUT
+        slot = pool.acquire(timeout)
+        if slot is None:
+            raise self.Database.OperationalError(
+                f'No connection of "{self.alias}" got free within {timeout}s, {size} in use')
+        try:
+            connection = super().get_new_connection(conn_params)
+        except Exception:
+            pool.release(slot)
+            raise
+
+        self.pool = pool
+        self.pool_slot = slot
+        self.pool_finalizer = weakref.finalize(self, pool.release, slot)
+        return connection
+
+    def _close(self):
+        try:
+            super()._close()
+        finally:
+            if self.pool_slot is not None:
+                self.pool_finalizer.detach()
+                self.pool.release(self.pool_slot)
+                self.pool_slot = None
+
+    def mark_idle(self):
+        if self.pool_slot is None or self.connection is None or self.in_atomic_block:
+            return
+        # The data of an in-memory SQLite database (e.g. of the tests) is gone with its connection
+        if getattr(self, 'is_in_memory_db', lambda: False)():
+            return
+        self.pool.mark_idle(self.pool_slot, self.connection)
+
+    def mark_busy(self):
+        if self.pool_slot is not None and not self.pool.mark_busy(self.pool_slot):
+            # Closed by a waiting thread, the next query opens a new connection
+            self.close()
+
+
+def _pooled_connections():
+    return [x for x in connections.all(initialized_only=True) if isinstance(x, PooledDatabaseWrapperMixin)]
+
+
+# Connected after close_old_connections of Django, so the obsolete connections are closed already
+@receiver(request_started)
+@receiver(celery_signals.task_prerun)
+def connections_busy(**kwargs):
+    for connection in _pooled_connections():
+        connection.mark_busy()
+
+
+@receiver(request_finished)
+@receiver(celery_signals.task_postrun)
+def connections_idle(**kwargs):
+    for connection in _pooled_connections():
+        connection.mark_idle()
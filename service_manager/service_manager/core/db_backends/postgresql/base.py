@@ -0,0 +1,7 @@
+from django.db.backends.postgresql import base
+
+from service_manager.core.db_backends.pooling import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    pass
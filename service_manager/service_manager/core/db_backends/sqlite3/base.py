@@ -0,0 +1,7 @@
+from django.db.backends.sqlite3 import base
+
+from service_manager.core.db_backends.pooling import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    pass
@@ -0,0 +1,125 @@
+import random
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Set on the responses of the requests which wrote, the next requests of the client read from the primary
+PIN_COOKIE_NAME = 'primary_db_pin'
+
+DEFAULT_PIN_SECONDS = 5
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Read from the primary only: a lagging replica would e.g. miss a new session, a changed password or permission
+PRIMARY_ONLY_APPS = {'auth', 'accounts', 'contenttypes', 'sessions'}
+
+_current_routing_state = ContextVar('db_routing_state', default=None)
+
+
+def get_replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+class RoutingState:
+    """
+    Where the reads of the current request or task go: to `replica` while reading from a replica,
+    unless the request is pinned to the primary or wrote already.
+    """
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.replica = None
+        self.wrote = False
+
+    @property
+    def read_alias(self):
+        if self.pinned or self.wrote:
+            return None
+        return self.replica
+
+
+@contextmanager
+def routing_state(pinned=False):
+    state = RoutingState(pinned=pinned)
+    token = _current_routing_state.set(state)
+    try:
+        yield state
+    finally:
+        _current_routing_state.reset(token)
+
+
+@contextmanager
+def read_from_replica():
+    """
+    Send the reads within to one of the replicas, until something is written.
+    Outside of a request (e.g. in a celery task) the block gets its own routing state.
+    """
+    with ExitStack() as stack:
+        state = _current_routing_state.get() or stack.enter_context(routing_state())
+        replicas = get_replica_aliases()
+        previous_replica = state.replica
+        state.replica = random.choice(replicas) if replicas else None
+        try:
+            yield state
+        finally:
+            state.replica = previous_replica
+
+
+class PrimaryReplicaRouter:
+    """
+    Writes go to the primary ("default") database, reads too, except within read_from_replica().
+    Once a request or a task writes, it reads from the primary, so it sees its own changes.
+    The authentication and session data (PRIMARY_ONLY_APPS) is always read from the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        state = _current_routing_state.get()
+        return state.read_alias if state else None
+
+    def db_for_write(self, model, **hints):
+        state = _current_routing_state.get()
+        if state:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replicas get the schema from the primary
+        if db in get_replica_aliases():
+            return False
+        return None
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin the requests which may write (POST etc.) to the primary database.
+    The client of a request which wrote reads from the primary for DB_REPLICA_PIN_SECONDS,
+    e.g. the page it is redirected to, until the replicas caught up.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pinned = request.method not in SAFE_METHODS or PIN_COOKIE_NAME in request.COOKIES
+        with routing_state(pinned=pinned) as state:
+            response = self.get_response(request)
+
+        if state.wrote and get_replica_aliases():
+            response.set_cookie(
+                PIN_COOKIE_NAME,
+                '1',
+                max_age=getattr(settings, 'DB_REPLICA_PIN_SECONDS', DEFAULT_PIN_SECONDS),
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
@@ -0,0 +1,54 @@
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY_PREFIX = 'fragment_version'
+
+
+def version_key(model, pk):
+    return f'{VERSION_KEY_PREFIX}:{model._meta.concrete_model._meta.label_lower}:{pk}'
+
+
+def get_versions(*instances):
+    """
+    Version of the cached template fragments which show the instances, e.g. for {% cache ... vary_on %}.
+    Every instance gets a random version the first time it is asked for, so when a version is invalidated
+    (or evicted from the cache) the fragments rendered with the old one are never used again.
+    """
+    keys = [version_key(type(x), x.pk) for x in instances if x is not None]
+    versions = cache.get_many(keys)
+
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+
+    return '.'.join(versions[key] for key in keys)
+
+
+def get_related_versions(instance, name, related_model, load, timeout=None):
+    """
+    Version of the `related_model` instances (e.g. the materials of the detail lines) the fragments of the instance
+    show as well. Their ids are cached with the version of the instance, which changes whenever they can change,
+    `load()` returns them when they are not cached yet.
+    """
+    key = f'{version_key(type(instance), instance.pk)}:{name}:{get_versions(instance)}'
+    pks = cache.get(key)
+    if pks is None:
+        pks = sorted(set(load()))
+        cache.set(key, pks, timeout=timeout)
+    return get_versions(*(related_model(pk=pk) for pk in pks))
+
+
+def invalidate(model, *pks):
+    """
+    Bump the versions of the instances, so the fragments which show them are rendered again.
+    """
+    if not pks:
+        return
+
+    keys = [version_key(model, pk) for pk in pks]
+    cache.delete_many(keys)
+    # Once more after the commit, in case another request cached the old rows under a new version meanwhile
+    transaction.on_commit(lambda: cache.delete_many(keys))
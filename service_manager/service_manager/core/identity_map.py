@@ -0,0 +1,92 @@
+from contextvars import ContextVar
+
+_current_identity_map = ContextVar('identity_map', default=None)
+
+
+class IdentityMap:
+    """
+    Model instances and related objects already loaded while handling the current request,
+    so template tags, filters and view helpers can reuse them instead of querying again.
+    """
+
+    def __init__(self):
+        self.__instances = {}
+        self.__related = {}
+        self.__memo = {}
+
+    @staticmethod
+    def key(model, pk):
+        model = model._meta.concrete_model
+        return model._meta.label, model._meta.pk.to_python(pk)
+
+    def add(self, *instances):
+        """
+        Register the instances together with the objects loaded with them (select_related and prefetch_related).
+        """
+        for instance in instances:
+            if instance is None or instance.pk is None:
+                continue
+            key = self.key(type(instance), instance.pk)
+            if self.__instances.get(key) is instance:
+                continue
+            self.__instances[key] = instance
+
+            self.add(*instance._state.fields_cache.values())
+            for prefetched in getattr(instance, '_prefetched_objects_cache', {}).values():
+                self.add(*prefetched)
+        return instances[0] if len(instances) == 1 else instances
+
+    def get(self, model, pk):
+        """
+        The instance with the given primary key, loaded at most once per request.
+        Soft deleted records are returned as well, like the base manager does.
+        """
+        key = self.key(model, pk)
+        if key not in self.__instances:
+            self.add(model._base_manager.get(pk=pk))
+        return self.__instances[key]
+
+    def related(self, instance, name, *related_entities):
+        """
+        The active objects of a reverse relation (e.g. "serviceordernote_set"), loaded at most once per request.
+        Objects which are already prefetched are reused, otherwise they are loaded with `related_entities` selected.
+        """
+        key = (*self.key(type(instance), instance.pk), name)
+        if key not in self.__related:
+            # The related manager returns the prefetched objects, if any. Its .all() would filter them
+            # by "active" in the database again, so the soft deleted ones are left out here instead.
+            queryset = getattr(instance, name).get_queryset()
+            if queryset._result_cache is None and related_entities:
+                queryset = queryset.select_related(*related_entities)
+            objects = [x for x in queryset if getattr(x, 'active', True)]
+            self.add(*objects)
+            self.__related[key] = objects
+        return self.__related[key]
+
+    def memoize(self, key, func, *args, **kwargs):
+        """
+        The result of `func` for `key`, calculated at most once per request.
+        """
+        if key not in self.__memo:
+            self.__memo[key] = func(*args, **kwargs)
+        return self.__memo[key]
+
+
+def get_identity_map():
+    """
+    The identity map of the current request.
+    Outside of a request every call gets an empty map, so nothing is cached.
+    """
+    return _current_identity_map.get() or IdentityMap()
+
+
+class IdentityMapMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _current_identity_map.set(IdentityMap())
+        try:
+            return self.get_response(request)
+        finally:
+            _current_identity_map.reset(token)
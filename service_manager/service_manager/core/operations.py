@@ -0,0 +1,37 @@
+from django.db import NotSupportedError
+from django.db.migrations import AddIndex
+
+
+class AddIndexConcurrently(AddIndex):
+    """
+    AddIndex which builds the index with CREATE INDEX CONCURRENTLY on PostgreSQL, so the table stays writable
+    while the index is built. The other databases build it the usual way.
+    Like the PostgreSQL only operation of django.contrib.postgres, it needs a migration with `atomic = False`.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            self.__ensure_not_in_transaction(schema_editor)
+            schema_editor.add_index(model, self.index, concurrently=True)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            self.__ensure_not_in_transaction(schema_editor)
+            schema_editor.remove_index(model, self.index, concurrently=True)
+
+    def describe(self):
+        return f'Concurrently create index {self.index.name} on {self.model_name}'
+
+    @staticmethod
+    def __ensure_not_in_transaction(schema_editor):
+        if schema_editor.connection.in_atomic_block:
+            raise NotSupportedError('Indexes can only be built concurrently in a migration with "atomic = False".')
+
@@ -0,0 +1,349 @@
+import base64
+import datetime
+import hashlib
+import json
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+from django.http import Http404
+from django.utils.translation import gettext_lazy as _
+
+DEFAULT_COUNT_CACHE_TIMEOUT = 60
+DEFAULT_COUNT_CACHE_MIN_ROWS = 1000
+DEFAULT_COUNT_ESTIMATE_THRESHOLD = 10000
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    """
+    Keep the microseconds of datetime values, DjangoJSONEncoder cuts them to milliseconds
+    and the cursor would skip or repeat rows created within the same millisecond.
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(direction, values):
+    data = json.dumps({'d': direction, 'v': values}, cls=CursorJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(cursor + padding).decode())
+        direction, values = data['d'], data['v']
+    except (ValueError, TypeError, KeyError):
+        raise Http404(_('Invalid page.'))
+
+    if direction not in (NEXT, PREVIOUS) or (values is not None and not isinstance(values, list)):
+        raise Http404(_('Invalid page.'))
+    return direction, values
+
+
+def resolve_ordering(model, ordering, annotations=()):
+    """
+    Expand an ordering tuple to the concrete columns the database sorts by, the way Django does it:
+    a relation is sorted by the ordering of the related model or by its primary key.
+    Names in `annotations` are kept as they are.
+    The primary key is appended as a tie-breaker, so every key is unique.
+    Returns a list of (lookup path, descending) pairs.
+    """
+    keys = []
+    for field_name in ordering:
+        descending = field_name.startswith('-')
+        if field_name.lstrip('-') in annotations:
+            keys.append((field_name.lstrip('-'), descending))
+        else:
+            keys.extend(_resolve_field(model, field_name.lstrip('-'), descending))
+
+    if not any(path in ('pk', model._meta.pk.name) for (path, descending) in keys):
+        keys.append(('pk', keys[-1][1] if keys else False))
+    return keys
+
+
+def _resolve_field(model, path, descending):
+    if path == 'pk':
+        return [('pk', descending)]
+
+    field = None
+    current_model = model
+    for part in path.split(LOOKUP_SEP):
+        field = current_model._meta.get_field(part)
+        if field.is_relation:
+            current_model = field.related_model
+
+    if not field.is_relation:
+        return [(path, descending)]
+
+    related_ordering = current_model._meta.ordering
+    if not related_ordering:
+        return [(f'{path}{LOOKUP_SEP}pk', descending)]
+
+    keys = []
+    for related_field_name in related_ordering:
+        related_descending = related_field_name.startswith('-') != descending
+        related_path = f'{path}{LOOKUP_SEP}{related_field_name.lstrip("-")}'
+        keys.extend(_resolve_field(model, related_path, related_descending))
+    return keys
+
+
+def resolve_key_field(model, path, annotations=None):
+    """
+    The field of an ordering key (see resolve_ordering) and whether its value can be NULL:
+    the field is nullable or a relation on the way to it is.
+    The values of annotations are taken as nullable.
+    """
+    annotations = annotations or {}
+    if path in annotations:
+        return annotations[path].output_field, True
+    if path == 'pk':
+        return model._meta.pk, False
+
+    field = None
+    nullable = False
+    current_model = model
+    for part in path.split(LOOKUP_SEP):
+        field = current_model._meta.pk if part == 'pk' else current_model._meta.get_field(part)
+        nullable = nullable or field.null
+        if field.is_relation:
+            current_model = field.related_model
+    if field.is_relation:
+        field = field.target_field
+    return field, nullable
+
+
+def count_rows(queryset):
+    """
+    Cheap total for a paginated queryset.
+    Large exact counts are cached for a short time, small ones are cheap and always counted.
+    On PostgreSQL the planner estimate is used instead once it goes above
+    KEYSET_PAGINATION_COUNT_ESTIMATE_THRESHOLD, because counting a big table means scanning it.
+    Returns (count, is_estimate).
+    """
+    threshold = getattr(settings, 'KEYSET_PAGINATION_COUNT_ESTIMATE_THRESHOLD', DEFAULT_COUNT_ESTIMATE_THRESHOLD)
+    timeout = getattr(settings, 'KEYSET_PAGINATION_COUNT_CACHE_TIMEOUT', DEFAULT_COUNT_CACHE_TIMEOUT)
+    cache_min_rows = getattr(settings, 'KEYSET_PAGINATION_COUNT_CACHE_MIN_ROWS', DEFAULT_COUNT_CACHE_MIN_ROWS)
+
+    queryset = queryset.order_by()
+    sql, params = queryset.query.sql_with_params()
+
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]['Plan']['Plan Rows'])
+        if estimate > threshold:
+            return estimate, True
+
+    cache_key = 'keyset_count:' + hashlib.md5(f'{queryset.db}:{sql}:{params!r}'.encode()).hexdigest()
+    count = cache.get(cache_key)
+    if count is None:
+        count = queryset.count()
+        if count >= cache_min_rows:
+            cache.set(cache_key, count, timeout)
+    return count, False
+
+
+class KeysetPaginator:
+    """
+    Cursor based paginator.
+    Every page is read with an indexed range condition on the ordering keys instead of an OFFSET,
+    so the cost of a page doesn't depend on how deep it is.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.keys = resolve_ordering(queryset.model, ordering, queryset.query.annotations)
+        self.key_fields = [resolve_key_field(queryset.model, path, queryset.query.annotations)
+                           for (path, descending) in self.keys]
+        self.__count = None
+
+    @property
+    def count(self):
+        self.__count_rows()
+        return self.__count[0]
+
+    @property
+    def count_is_estimate(self):
+        self.__count_rows()
+        return self.__count[1]
+
+    @property
+    def num_pages(self):
+        return max(1, math.ceil(self.count / self.per_page))
+
+    @property
+    def first_cursor(self):
+        return ''
+
+    @property
+    def last_cursor(self):
+        return encode_cursor(PREVIOUS, None)
+
+    def __count_rows(self):
+        if self.__count is None:
+            self.__count = count_rows(self.queryset)
+
+    def __annotations(self):
+        return {f'keyset_{i}': F(path) for (i, (path, _)) in enumerate(self.keys)}
+
+    def __order_by(self, reverse):
+        # NULL sorts after every value, on every database, so the conditions of __after() match the order
+        return [F(path).desc(nulls_first=True) if descending != reverse else F(path).asc(nulls_last=True)
+                for (path, descending) in self.keys]
+
+    def __after_value(self, path, nullable, value, descending):
+        """
+        Rows whose `path` comes strictly after `value` in the order of the key.
+        """
+        if value is None:
+            # Only the values before NULL are left, those come after it in descending order
+            return Q(**{f'{path}__isnull': False}) if descending else None
+        condition = Q(**{f'{path}__{"lt" if descending else "gt"}': value})
+        if nullable and not descending:
+            condition |= Q(**{f'{path}__isnull': True})
+        return condition
+
+    def __after(self, values, reverse):
+        """
+        Rows strictly after `values` in the (possibly reversed) page order.
+        """
+        condition = None
+        for i, ((path, descending), (field, nullable)) in enumerate(zip(self.keys, self.key_fields)):
+            branch = self.__after_value(path, nullable, values[i], descending != reverse)
+            if branch is None:
+                continue
+            # A None value is compared with IS NULL
+            for (previous_path, previous_descending), value in zip(self.keys[:i], values):
+                branch &= Q(**{previous_path: value})
+            condition = branch if condition is None else condition | branch
+        return condition if condition is not None else Q(pk__in=[])
+
+    def __to_python(self, values):
+        """
+        The values of a cursor as the types of the key fields, a tampered cursor is an invalid page.
+        """
+        if len(values) != len(self.keys):
+            raise Http404(_('Invalid page.'))
+        try:
+            return [None if value is None else field.to_python(value)
+                    for ((field, nullable), value) in zip(self.key_fields, values)]
+        except (ValidationError, TypeError, ValueError):
+            raise Http404(_('Invalid page.'))
+
+    def cursor(self, direction, obj):
+        return encode_cursor(direction, [getattr(obj, f'keyset_{i}') for i in range(len(self.keys))])
+
+    def page_queryset(self, cursor=None):
+        """
+        The rows of the page `cursor` points to, plus one to tell whether there are more.
+        """
+        direction, values = decode_cursor(cursor) if cursor else (NEXT, None)
+        if values is not None:
+            values = self.__to_python(values)
+
+        reverse = direction == PREVIOUS
+        queryset = self.queryset.annotate(**self.__annotations()).order_by(*self.__order_by(reverse))
+        if values is not None:
+            queryset = queryset.filter(self.__after(values, reverse))
+        return queryset[:self.per_page + 1]
+
+    def page(self, cursor=None):
+        direction, values = decode_cursor(cursor) if cursor else (NEXT, None)
+        reverse = direction == PREVIOUS
+
+        rows = list(self.page_queryset(cursor))
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if reverse:
+            rows.reverse()
+            has_previous, has_next = has_more, values is not None
+        else:
+            has_previous, has_next = values is not None, has_more
+
+        return KeysetPage(rows, self, has_previous, has_next)
+
+
+class KeysetPage:
+    def __init__(self, object_list, paginator, has_previous, has_next):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.__has_previous = has_previous
+        self.__has_next = has_next
+
+    def __repr__(self):
+        return f'<Keyset page of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_previous(self):
+        return self.__has_previous
+
+    def has_next(self):
+        return self.__has_next
+
+    def has_other_pages(self):
+        return self.__has_previous or self.__has_next
+
+    @property
+    def previous_cursor(self):
+        if not self.__has_previous or not self.object_list:
+            return None
+        return self.paginator.cursor(PREVIOUS, self.object_list[0])
+
+    @property
+    def next_cursor(self):
+        if not self.__has_next or not self.object_list:
+            return None
+        return self.paginator.cursor(NEXT, self.object_list[-1])
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin which replaces the page number pagination with cursor (keyset) pagination
+    over the view's ordering. The links are built with the "params" context variable, which keeps
+    the other query parameters (search, sort).
+    """
+    paginator_class = KeysetPaginator
+    cursor_kwarg = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        ordering = queryset.query.order_by or self.get_ordering() or queryset.model._meta.ordering
+        paginator = self.paginator_class(queryset, page_size, ordering)
+        cursor = self.kwargs.get(self.cursor_kwarg) or self.request.GET.get(self.cursor_kwarg)
+        page = paginator.page(cursor)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        request = self.request.GET.copy()
+        request.pop(self.cursor_kwarg, None)
+        request.pop('page', None)
+        context['params'] = request.urlencode()
+
+        return context
@@ -0,0 +1,139 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from importlib import import_module
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('service_manager.query_budget')
+
+# URL configurations which declare a `query_budgets` dict (url name -> max number of queries)
+QUERY_BUDGET_URLCONFS = (
+    'service_manager.main.urls',
+    'service_manager.customers.urls',
+    'service_manager.master_data.urls',
+    'service_manager.api.urls',
+)
+
+DEFAULT_N_PLUS_ONE_THRESHOLD = 5
+
+_query_budgets = None
+
+
+def get_query_budgets():
+    global _query_budgets
+    if _query_budgets is None:
+        budgets = {}
+        for urlconf in QUERY_BUDGET_URLCONFS:
+            budgets.update(getattr(import_module(urlconf), 'query_budgets', {}))
+        _query_budgets = budgets
+    return _query_budgets
+
+
+def get_query_budget(url_name):
+    return get_query_budgets().get(url_name)
+
+
+def get_n_plus_one_threshold():
+    return getattr(settings, 'QUERY_BUDGET_N_PLUS_ONE_THRESHOLD', DEFAULT_N_PLUS_ONE_THRESHOLD)
+
+
+class QueryRecorder:
+    """
+    Collect the SQL statements executed on all database connections while recording.
+    Works with DEBUG turned off, because it relies on execute wrappers instead of connection.queries.
+    """
+    WHITESPACE_RE = re.compile(r'\s+')
+    IN_CLAUSE_RE = re.compile(r'IN \((?:%s, )*%s\)')
+    NUMBER_RE = re.compile(r'\b\d+\b')
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.monotonic() - start))
+
+    @contextmanager
+    def record(self):
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(self))
+            yield self
+
+    @classmethod
+    def shape_of(cls, sql):
+        """
+        Reduce a statement to its shape, so the same query with different parameters is counted together.
+        """
+        shape = cls.WHITESPACE_RE.sub(' ', sql).strip()
+        shape = cls.IN_CLAUSE_RE.sub('IN (...)', shape)
+        return cls.NUMBER_RE.sub('?', shape)
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_time(self):
+        return sum(duration for (_, duration) in self.queries)
+
+    @property
+    def shapes(self):
+        return Counter(self.shape_of(sql) for (sql, _) in self.queries)
+
+    def repeated_shapes(self, threshold=None):
+        """
+        Query shapes executed at least `threshold` times - the usual sign of an N+1 pattern.
+        """
+        if threshold is None:
+            threshold = get_n_plus_one_threshold()
+        return {shape: times for (shape, times) in self.shapes.items() if times >= threshold}
+
+    def describe(self):
+        lines = [f'{self.count} queries in {self.total_time * 1000:.1f} ms']
+        for (shape, times) in self.shapes.most_common():
+            lines.append(f'  {times}x {shape}')
+        return '\n'.join(lines)
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the queries of every request and report the ones which exceed the budget declared for
+    the resolved url name or which repeat the same query shape (N+1).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with recorder.record():
+            response = self.get_response(request)
+
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        self.__report(request, url_name, recorder)
+
+        if settings.DEBUG:
+            response['X-Query-Count'] = str(recorder.count)
+            response['X-Query-Time'] = f'{recorder.total_time * 1000:.1f}ms'
+
+        return response
+
+    @staticmethod
+    def __report(request, url_name, recorder):
+        budget = get_query_budget(url_name)
+        if budget is not None and recorder.count > budget:
+            logger.warning('Query budget exceeded for "%s" (%s): %s > %s\n%s',
+                           url_name, request.path, recorder.count, budget, recorder.describe())
+
+        repeated_shapes = recorder.repeated_shapes()
+        if repeated_shapes:
+            logger.warning('Possible N+1 queries for "%s" (%s):\n%s', url_name, request.path,
+                           '\n'.join(f'  {times}x {shape}' for (shape, times) in repeated_shapes.items()))
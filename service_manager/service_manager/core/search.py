@@ -0,0 +1,337 @@
+from functools import reduce
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.migrations.operations.base import Operation
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+from django.utils.module_loading import import_string
+
+# The trigram tokenizer of FTS5 and the pg_trgm indexes need at least 3 characters to match
+MIN_INDEXED_SEARCH_LENGTH = 3
+
+INDEX_CHUNK_SIZE = 500
+
+# Added to the rank of the rows which start with the searched text
+PREFIX_MATCH_BOOST = 1.0
+
+DEFAULT_SEARCH_BACKENDS = {
+    'postgresql': 'service_manager.core.search.PostgresTrigramSearchBackend',
+    'sqlite': 'service_manager.core.search.SQLiteFTS5SearchBackend',
+}
+
+_search_indexes = {}
+
+
+def search_table_name(db_table):
+    return f'{db_table}_search'
+
+
+def search_column_name(field_path):
+    return field_path.replace(LOOKUP_SEP, '_')
+
+
+class SearchIndex:
+    """
+    The fields of a model which are searched with `search()`.
+    Fields of related models are given as lookups (e.g. "category__name").
+    """
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = tuple(fields)
+        self.table = search_table_name(model._meta.db_table)
+
+    def __repr__(self):
+        return f'<SearchIndex {self.model._meta.label}: {", ".join(self.fields)}>'
+
+    @property
+    def related_paths(self):
+        """
+        (related model, lookup from the indexed model) for every relation the indexed fields go through.
+        """
+        paths = []
+        for field_path in self.fields:
+            model = self.model
+            parts = field_path.split(LOOKUP_SEP)
+            for i, part in enumerate(parts[:-1]):
+                model = model._meta.get_field(part).related_model
+                paths.append((model, LOOKUP_SEP.join(parts[:i + 1])))
+        return paths
+
+    def rows(self, queryset):
+        return queryset.order_by().values_list('pk', *self.fields)
+
+
+def register(model, fields):
+    """
+    Make `model` searchable on `fields` and keep its search index in sync with the model signals.
+    """
+    index = SearchIndex(model, fields)
+    _search_indexes[model] = index
+
+    uid = f'search_index:{model._meta.label}'
+    post_save.connect(_index_saved_instance, sender=model, dispatch_uid=uid)
+    post_delete.connect(_remove_deleted_instance, sender=model, dispatch_uid=uid)
+    for (related_model, path) in index.related_paths:
+        post_save.connect(_reindex_related_instances(index, path), sender=related_model, weak=False,
+                          dispatch_uid=f'{uid}:{path}')
+    return index
+
+
+def get_search_index(model):
+    return _search_indexes.get(model)
+
+
+def get_search_indexes():
+    return list(_search_indexes.values())
+
+
+def get_search_backend(using='default'):
+    vendor = connections[using].vendor
+    backend_path = getattr(settings, 'SEARCH_BACKEND', None) or DEFAULT_SEARCH_BACKENDS.get(vendor)
+    if not backend_path:
+        return IContainsSearchBackend()
+    return import_string(backend_path)()
+
+
+def search(queryset, value):
+    """
+    Filter `queryset` down to the rows matching `value` in the registered fields of its model.
+    The rows are annotated with "search_rank" and the best matches come first.
+    """
+    index = get_search_index(queryset.model)
+    if index is None:
+        raise LookupError(f'{queryset.model._meta.label} is not registered for search')
+
+    value = value.strip()
+    if not value:
+        return queryset
+
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    queryset = get_search_backend(queryset.db).search(queryset, index, value)
+    return queryset.order_by('-search_rank', *ordering)
+
+
+def update_search_index(model, pks, using=None):
+    index = get_search_index(model)
+    if index is None or not pks:
+        return
+    using = using or router.db_for_write(model)
+    get_search_backend(using).update(index, pks, using)
+
+
+def remove_from_search_index(model, pks, using=None):
+    index = get_search_index(model)
+    if index is None or not pks:
+        return
+    using = using or router.db_for_write(model)
+    get_search_backend(using).remove(index, pks, using)
+
+
+def rebuild_search_index(index, using='default'):
+    get_search_backend(using).rebuild(index, using)
+
+
+def _index_saved_instance(sender, instance, using, **kwargs):
+    update_search_index(sender, [instance.pk], using)
+
+
+def _remove_deleted_instance(sender, instance, using, **kwargs):
+    remove_from_search_index(sender, [instance.pk], using)
+
+
+def _reindex_related_instances(index, path):
+    def receiver(sender, instance, created, using, **kwargs):
+        if created:
+            return
+        pks = list(index.model._base_manager.using(using).filter(**{path: instance}).values_list('pk', flat=True))
+        update_search_index(index.model, pks, using)
+
+    return receiver
+
+
+class IContainsSearchBackend:
+    """
+    Plain case insensitive "contains" filters, used for the databases without a dedicated backend.
+    Nothing has to be kept in sync.
+    """
+
+    def search(self, queryset, index, value):
+        return queryset.filter(self.contains_condition(index, value)) \
+            .annotate(search_rank=self.prefix_rank(index, value))
+
+    def update(self, index, pks, using):
+        pass
+
+    def remove(self, index, pks, using):
+        pass
+
+    def rebuild(self, index, using):
+        pass
+
+    @staticmethod
+    def contains_condition(index, value):
+        return reduce(Q.__or__, (Q(**{f'{field}__icontains': value}) for field in index.fields))
+
+    @staticmethod
+    def prefix_rank(index, value):
+        starts_with = reduce(Q.__or__, (Q(**{f'{field}__istartswith': value}) for field in index.fields))
+        return Case(When(starts_with, then=Value(PREFIX_MATCH_BOOST)), default=Value(0.0), output_field=FloatField())
+
+
+class PostgresTrigramSearchBackend(IContainsSearchBackend):
+    """
+    The "contains" filters are served by the trigram GIN indexes created by `CreateSearchIndex`
+    on UPPER(column), the expression Django compiles `icontains` to.
+    The rows are ranked by word similarity, matches at the beginning of a field come first.
+    """
+
+    def search(self, queryset, index, value):
+        from django.contrib.postgres.search import TrigramWordSimilarity
+        from django.db.models.functions import Greatest
+
+        similarities = [TrigramWordSimilarity(value, field) for field in index.fields]
+        similarity = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+
+        return queryset.filter(self.contains_condition(index, value)) \
+            .annotate(search_rank=self.prefix_rank(index, value) + similarity)
+
+
+class SQLiteFTS5SearchBackend(IContainsSearchBackend):
+    """
+    Every registered model has an FTS5 shadow table (created by `CreateSearchIndex`) with the trigram tokenizer,
+    which matches any substring of at least 3 characters, like `icontains`.
+    The rows are ranked by bm25, matches at the beginning of a field come first.
+    """
+
+    def search(self, queryset, index, value):
+        if len(value) < MIN_INDEXED_SEARCH_LENGTH:
+            return super().search(queryset, index, value)
+
+        connection = connections[queryset.db]
+        table = connection.ops.quote_name(index.table)
+        model_table = connection.ops.quote_name(queryset.model._meta.db_table)
+        pk_column = connection.ops.quote_name(queryset.model._meta.pk.column)
+        match = '"' + value.replace('"', '""') + '"'
+
+        matches = RawSQL(f'SELECT rowid FROM {table} WHERE {table} MATCH %s', (match,))
+        bm25 = RawSQL(
+            f'SELECT -bm25({table}) FROM {table} WHERE {table} MATCH %s AND {table}.rowid = {model_table}.{pk_column}',
+            (match,),
+            output_field=FloatField(),
+        )
+
+        return queryset.filter(pk__in=matches) \
+            .annotate(search_rank=self.prefix_rank(index, value) + bm25)
+
+    def update(self, index, pks, using):
+        pks = list(pks)
+        self.remove(index, pks, using)
+        self.__insert(index, pks, using)
+
+    def remove(self, index, pks, using):
+        connection = connections[using]
+        table = connection.ops.quote_name(index.table)
+        with connection.cursor() as cursor:
+            for chunk in _chunks(list(pks)):
+                cursor.execute(f'DELETE FROM {table} WHERE rowid IN ({", ".join(["%s"] * len(chunk))})', chunk)
+
+    def rebuild(self, index, using):
+        connection = connections[using]
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {connection.ops.quote_name(index.table)}')
+        pks = index.model._base_manager.using(using).order_by('pk').values_list('pk', flat=True)
+        self.__insert(index, list(pks), using)
+
+    @staticmethod
+    def __insert(index, pks, using):
+        connection = connections[using]
+        table = connection.ops.quote_name(index.table)
+        columns = ', '.join(connection.ops.quote_name(search_column_name(field)) for field in index.fields)
+        placeholders = ', '.join(['%s'] * (len(index.fields) + 1))
+
+        with connection.cursor() as cursor:
+            for chunk in _chunks(pks):
+                rows = index.rows(index.model._base_manager.using(using).filter(pk__in=chunk))
+                cursor.executemany(f'INSERT INTO {table} (rowid, {columns}) VALUES ({placeholders})', list(rows))
+
+
+def _chunks(items, size=INDEX_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class CreateSearchIndex(Operation):
+    """
+    Create the database objects the search backend of the database needs for a model:
+    the pg_trgm GIN indexes on PostgreSQL, the FTS5 shadow table on SQLite.
+    `fields` are frozen in the migration, like the fields of a model.
+    """
+    reversible = True
+    reduces_to_sql = False
+
+    def __init__(self, model_name, fields):
+        self.model_name = model_name
+        self.fields = tuple(fields)
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        vendor = schema_editor.connection.vendor
+        if vendor == 'postgresql':
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            for (table, column, name) in self.__trigram_indexes(model, schema_editor):
+                schema_editor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+                )
+        elif vendor == 'sqlite':
+            quote_name = schema_editor.quote_name
+            table = quote_name(search_table_name(model._meta.db_table))
+            columns = ', '.join(quote_name(search_column_name(field)) for field in self.fields)
+            schema_editor.execute(f"CREATE VIRTUAL TABLE {table} USING fts5({columns}, tokenize='trigram')")
+            SQLiteFTS5SearchBackend().rebuild(SearchIndex(model, self.fields), schema_editor.connection.alias)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        vendor = schema_editor.connection.vendor
+        if vendor == 'postgresql':
+            for (_, _, name) in self.__trigram_indexes(model, schema_editor):
+                schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+        elif vendor == 'sqlite':
+            table = schema_editor.quote_name(search_table_name(model._meta.db_table))
+            schema_editor.execute(f'DROP TABLE IF EXISTS {table}')
+
+    def describe(self):
+        return f'Create search index on {self.model_name} ({", ".join(self.fields)})'
+
+    @property
+    def migration_name_fragment(self):
+        return f'{self.model_name.lower()}_search_index'
+
+    def deconstruct(self):
+        return self.__class__.__name__, [], {'model_name': self.model_name, 'fields': self.fields}
+
+    def __trigram_indexes(self, model, schema_editor):
+        for field_path in self.fields:
+            current_model = model
+            parts = field_path.split(LOOKUP_SEP)
+            for part in parts[:-1]:
+                current_model = current_model._meta.get_field(part).related_model
+            field = current_model._meta.get_field(parts[-1])
+            db_table = current_model._meta.db_table
+            yield (
+                schema_editor.quote_name(db_table),
+                schema_editor.quote_name(field.column),
+                schema_editor.quote_name(f'{db_table}_{field.column}_trgm'),
+            )
@@ -0,0 +1,103 @@
+import socketserver
+import threading
+from contextlib import contextmanager
+
+from service_manager.core.query_budget import QueryRecorder, get_query_budget
+
+
+class QueryBudgetTestMixin:
+    """
+    TestCase mixin which enforces the query budgets declared next to the url patterns.
+    """
+
+    @contextmanager
+    def assertQueryBudget(self, url_name):
+        budget = get_query_budget(url_name)
+        if budget is None:
+            self.fail(f'No query budget declared for "{url_name}"')
+
+        recorder = QueryRecorder()
+        with recorder.record():
+            yield recorder
+
+        self.assertLessEqual(
+            recorder.count,
+            budget,
+            f'Query budget exceeded for "{url_name}": {recorder.count} > {budget}\n{recorder.describe()}',
+        )
+
+    @contextmanager
+    def assertNoRepeatedQueries(self, threshold=None):
+        recorder = QueryRecorder()
+        with recorder.record():
+            yield recorder
+
+        repeated_shapes = recorder.repeated_shapes(threshold)
+        self.assertFalse(
+            repeated_shapes,
+            'Possible N+1 queries:\n' + '\n'.join(f'  {times}x {shape}' for (shape, times) in repeated_shapes.items()),
+        )
+
+
+class SMTPSink:
+    """
+    Local SMTP server which accepts every message and keeps it, to test the email delivery end to end:
+
+        with SMTPSink() as sink, override_settings(EMAIL_HOST=sink.host, EMAIL_PORT=sink.port, ...):
+            ...
+        sink.messages, sink.connections_count
+    """
+
+    def __init__(self, host='127.0.0.1'):
+        self.messages = []
+        self.connections_count = 0
+        self.lock = threading.Lock()
+        self.__server = socketserver.ThreadingTCPServer((host, 0), self.__get_handler_class())
+        self.__server.daemon_threads = True
+        self.host, self.port = self.__server.server_address
+
+    def __enter__(self):
+        threading.Thread(target=self.__server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def __get_handler_class(self):
+        sink = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                with sink.lock:
+                    sink.connections_count += 1
+
+                self.reply('220 sink')
+                for line in self.rfile:
+                    command = line.decode().strip().upper()
+                    if command.startswith('EHLO') or command.startswith('HELO'):
+                        self.reply('250 sink')
+                    elif command == 'DATA':
+                        self.reply('354 End data with <CR><LF>.<CR><LF>')
+                        self.read_message()
+                        self.reply('250 OK')
+                    elif command == 'QUIT':
+                        self.reply('221 Bye')
+                        return
+                    else:
+                        # MAIL, RCPT, RSET, NOOP
+                        self.reply('250 OK')
+
+            def read_message(self):
+                lines = []
+                for line in self.rfile:
+                    if line in (b'.\r\n', b'.\n'):
+                        break
+                    lines.append(line)
+                with sink.lock:
+                    sink.messages.append(b''.join(lines).decode())
+
+            def reply(self, response):
+                self.wfile.write(f'{response}\r\n'.encode())
+
+        return Handler
@@ -1,3 +1,14 @@
+import hashlib
+
+from django.contrib import messages
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from service_manager.accounts.backends import get_permissions_key
+from service_manager.core.db_routers import SAFE_METHODS, read_from_replica
+
+
 class BootstrapFormViewMixin:
     def get_form(self, **kwargs):
         form = super().get_form(**kwargs)
@@ -13,3 +24,135 @@ class BootstrapFormViewMixin:
                 field.widget.attrs['class'] = ''
 
             field.widget.attrs['class'] += ' form-control'
+
+
+class ReplicaReadMixin:
+    """
+    Read the pages of a view from a read replica (see core/db_routers.py), unless the request is pinned
+    to the primary. The response is rendered within, as the templates evaluate the querysets lazily.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+
+        with read_from_replica():
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        return response
+
+
+class SortableListViewMixin:
+    """
+    Order a list view by the "sort" query parameter.
+    Only the keys of sort_fields are accepted, a leading "-" sorts in descending order.
+    The primary key is added as a tie-breaker, so the pages don't overlap.
+    """
+    sort_fields = {}
+    default_sort = None
+
+    def get_sort(self):
+        sort = self.request.GET.get('sort', self.default_sort)
+        if sort and sort.lstrip('-') in self.sort_fields:
+            return sort
+        return self.default_sort
+
+    def get_ordering(self):
+        sort = self.get_sort()
+        direction = '-' if sort.startswith('-') else ''
+        field = self.sort_fields[sort.lstrip('-')]
+        return f'{direction}{field}', f'{direction}pk'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        request = self.request.GET.copy()
+        request.pop('page', None)
+        request.pop('cursor', None)
+        request.pop('sort', None)
+        context['sort'] = self.get_sort()
+        context['sort_params'] = request.urlencode()
+
+        return context
+
+
+def related_rows_version(model, fk_name, *aggregates):
+    """
+    Subqueries which tell whether the rows of `model` pointing to the outer row with `fk_name` changed:
+    their number, the number of active ones (bulk soft deletes don't touch updated_on) and
+    the `aggregates` of them, by default their latest updated_on.
+    """
+    aggregates = aggregates or (Max('updated_on'),)
+    rows = model._base_manager.filter(**{fk_name: OuterRef('pk')}).order_by().values(fk_name)
+    expressions = [Count('pk', distinct=True), Count('pk', filter=Q(active=True), distinct=True), *aggregates]
+    return [Subquery(rows.annotate(value=x).values('value')) for x in expressions]
+
+
+class ConditionalGetMixin:
+    """
+    DetailView mixin which answers GET with 304 Not Modified while the page the client has is still current,
+    without loading the object or rendering the template.
+
+    The ETag is read with a single query: the `etag_fields` of the object (e.g. "updated_on" of it and of
+    the related objects the page shows) and the subqueries of `get_etag_subqueries()` for the rows
+    which point to it, together with the versions of `get_etag_versions()`. It also covers the query string
+    and what the page depends on for the user: the user, their permissions, the language and the CSRF token.
+    Pages with flash messages are always rendered.
+    """
+    etag_fields = ('updated_on',)
+
+    def get_etag_subqueries(self):
+        return []
+
+    def get_etag_versions(self):
+        """
+        Versions kept outside of the database (e.g. in the cache) the page depends on as well.
+        """
+        return []
+
+    def get_etag_queryset(self):
+        return self.model._base_manager.filter(pk=self.kwargs[self.pk_url_kwarg])
+
+    def get_etag_values(self):
+        annotations = {f'etag_{i}': x for (i, x) in enumerate(self.get_etag_subqueries())}
+        return self.get_etag_queryset().annotate(**annotations) \
+            .values_list(*self.etag_fields, *annotations) \
+            .first()
+
+    def get_etag(self, values):
+        user = self.request.user
+        parts = [
+            *values,
+            *self.get_etag_versions(),
+            self.request.get_full_path(),
+            user.pk,
+            getattr(user, 'display_name', ''),
+            get_permissions_key(user.pk) if user.is_authenticated else '',
+            getattr(self.request, 'LANGUAGE_CODE', ''),
+            self.request.META.get('CSRF_COOKIE', ''),
+        ]
+        return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+    @staticmethod
+    def get_last_modified(values):
+        dates = [x for x in values if hasattr(x, 'timestamp')]
+        return max(dates) if dates else None
+
+    def get(self, request, *args, **kwargs):
+        values = self.get_etag_values()
+        if values is None or messages.get_messages(request):
+            return super().get(request, *args, **kwargs)
+
+        etag = self.get_etag(values)
+        last_modified = self.get_last_modified(values)
+        last_modified_timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified_timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            response['ETag'] = etag
+            if last_modified_timestamp is not None:
+                response['Last-Modified'] = http_date(last_modified_timestamp)
+        # The browsers keep the page, but check with the server before showing it again
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
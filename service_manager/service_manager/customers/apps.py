@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class CustomersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'service_manager.customers'
+
+    def ready(self):
+        from service_manager.core import search
+
+        search.register(self.get_model('Customer'), ('name', 'vat'))
+        search.register(self.get_model('CustomerAsset'), ('serial_number',))
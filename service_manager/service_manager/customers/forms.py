@@ -1,6 +1,8 @@
 from django import forms
+from django.utils.translation import gettext_lazy as _
 
 from service_manager.core.forms import BootstrapFormMixin
+from service_manager.customers.importers import IMPORTERS
 from service_manager.customers.models import Customer, CustomerAsset, CustomerRepresentative, CustomerDepartment
 from service_manager.master_data.models import Asset
 
@@ -18,7 +20,8 @@ class CreateCustomerForm(EditCustomerForm):
 class CreateCustomerAssetForm(BootstrapFormMixin, forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['asset'].queryset = Asset.objects.all()
+        # The choices show the brand and the category of every asset
+        self.fields['asset'].queryset = Asset.objects.all().select_related('brand', 'category')
         pass
 
     class Meta:
@@ -48,3 +51,30 @@ class CreateCustomerDepartmentForm(BootstrapFormMixin, forms.ModelForm):
     class Meta:
         model = CustomerDepartment
         fields = ('name',)
+
+
+class ImportCustomersForm(BootstrapFormMixin, forms.Form):
+    KIND_CHOICES = (
+        ('customers', _('Customers')),
+        ('representatives', _('Representatives')),
+        ('departments', _('Departments')),
+        ('assets', _('Assets')),
+    )
+
+    kind = forms.ChoiceField(label=_('Import'), choices=KIND_CHOICES)
+    csv_file = forms.FileField(label=_('CSV file'))
+
+    def __init__(self, *args, user, customer=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user = user
+        # The customers are imported on their own, the other rows for the given customer
+        self.fields['kind'].choices = [
+            (kind, label) for (kind, label) in self.KIND_CHOICES
+            if IMPORTERS[kind].requires_customer == (customer is not None)
+        ]
+
+    def clean_kind(self):
+        kind = self.cleaned_data['kind']
+        if not self.user.has_perm(IMPORTERS[kind].permission_required):
+            raise forms.ValidationError(_('You are not allowed to import %(kind)s.'), params={'kind': kind})
+        return kind
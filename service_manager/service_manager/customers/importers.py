@@ -0,0 +1,294 @@
+import csv
+import io
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+from service_manager.customers.models import Customer, CustomerRepresentative, CustomerDepartment, CustomerAsset
+from service_manager.customers.validators import numbers_only_batch_validator, phone_number_batch_validator, \
+    email_batch_validator
+from service_manager.master_data.models import CustomerType, Asset, Brand
+
+logger = logging.getLogger('service_manager.customers')
+
+DEFAULT_CHUNK_SIZE = 2000
+# More errors than this are not reported, the file has to be fixed anyway
+MAX_REPORTED_ERRORS = 50
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    max_length: int
+    required: bool = True
+    # Batch validators, which take the non-empty values and return {position: messages}
+    validators: tuple = ()
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    seconds: float = 0
+
+
+def validate_rows(columns, rows, lines):
+    """
+    Validate the rows column by column and return their (line, message) errors.
+    `lines` are the line numbers of the rows in the file.
+    Only plain data goes in and out, so chunks can be validated in other processes.
+    """
+    errors = []
+    for column in columns:
+        values = [row.get(column.name) for row in rows]
+        non_empty = []
+        for (i, value) in enumerate(values):
+            line = lines[i]
+            if not value:
+                if column.required:
+                    errors.append((line, f'{column.name}: {_("This field is required.")}'))
+            elif len(value) > column.max_length:
+                errors.append((line, f'{column.name}: ' + str(
+                    _('Ensure this value has at most %(max_length)d characters.') % {'max_length': column.max_length})))
+            else:
+                non_empty.append(i)
+
+        for validator in column.validators:
+            invalid = validator([values[i] for i in non_empty])
+            for (position, messages) in invalid.items():
+                errors.extend((lines[non_empty[position]], f'{column.name}: {x}') for x in messages)
+    return errors
+
+
+def _validate_chunk(args):
+    return validate_rows(*args)
+
+
+class BulkImporter:
+    """
+    Imports the rows of a CSV file (with a header row) in chunks.
+    The whole file is validated first, column by column and optionally across `workers` processes,
+    the references are resolved from lookups loaded once and nothing is saved unless every row is valid.
+    The rows are then inserted with bulk_create, a chunk per query, all in one transaction.
+    """
+    model = None
+    columns = ()
+    permission_required = None
+    requires_customer = True
+
+    def __init__(self, customer=None, chunk_size=None, workers=None):
+        if self.requires_customer and customer is None:
+            raise ValueError(f'{self.model.__name__} rows are imported for a customer')
+        self.customer = customer
+        self.chunk_size = chunk_size or getattr(settings, 'IMPORT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+        self.workers = workers or 0
+
+    def import_file(self, file):
+        """
+        Import the CSV `file` (text or binary) and return the result.
+        Raises ValidationError with the errors of the file, if any.
+        """
+        started = time.monotonic()
+        lines, rows = self.read(file)
+        errors = self.validate(lines, rows)
+        if not errors:
+            objs, errors = self.build(lines, rows)
+        if errors:
+            errors = sorted(errors)
+            reported = [_('Line %(line)d: %(message)s') % {'line': line, 'message': message}
+                        for (line, message) in errors[:MAX_REPORTED_ERRORS]]
+            if len(errors) > MAX_REPORTED_ERRORS:
+                reported.append(_('%(count)d more errors') % {'count': len(errors) - MAX_REPORTED_ERRORS})
+            raise ValidationError(reported, code='invalid')
+
+        created = self.save(objs)
+        result = ImportResult(created=created, seconds=time.monotonic() - started)
+        logger.info('Imported %d %s rows in %.3fs', created, self.model.__name__, result.seconds)
+        return result
+
+    def read(self, file):
+        if isinstance(file, (bytes, bytearray)):
+            file = io.BytesIO(file)
+        if not isinstance(file, io.TextIOBase):
+            # The files uploaded or opened in binary mode, the BOM of Excel exports is dropped
+            file = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+
+        # The file is decoded and parsed while it is read
+        try:
+            return self.__read_rows(csv.DictReader(file))
+        except (UnicodeDecodeError, csv.Error) as ex:
+            raise ValidationError(
+                _('The file is not a valid UTF-8 CSV file: %(error)s') % {'error': ex},
+                code='invalid',
+            )
+
+    def __read_rows(self, reader):
+        missing = [x.name for x in self.columns if x.required and x.name not in (reader.fieldnames or ())]
+        if missing:
+            raise ValidationError(
+                _('Missing columns: %(columns)s') % {'columns': ', '.join(missing)},
+                code='invalid',
+            )
+        lines = []
+        rows = []
+        for row in reader:
+            lines.append(reader.line_num)
+            rows.append({key: (value or '').strip() for (key, value) in row.items() if key})
+        return lines, rows
+
+    def validate(self, lines, rows):
+        chunks = [
+            (self.columns, rows[i:i + self.chunk_size], lines[i:i + self.chunk_size])
+            for i in range(0, len(rows), self.chunk_size)
+        ]
+        if self.workers > 1 and len(chunks) > 1:
+            # The workers are forked where possible, so they share the settings and translations of this process
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork') if 'fork' in methods else None
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+                results = list(executor.map(_validate_chunk, chunks))
+        else:
+            results = [_validate_chunk(x) for x in chunks]
+        return [error for errors in results for error in errors]
+
+    def build(self, lines, rows):
+        """
+        Create the (unsaved) model instances of the rows and return them with the errors of the references.
+        """
+        lookups = self.load_lookups()
+        objs = []
+        errors = []
+        for (line, row) in zip(lines, rows):
+            try:
+                objs.append(self.build_instance(row, lookups))
+            except ValidationError as ex:
+                errors.extend((line, message) for message in ex.messages)
+        return objs, errors
+
+    def load_lookups(self):
+        return {}
+
+    def build_instance(self, row, lookups):
+        raise NotImplementedError
+
+    def save(self, objs):
+        # A failing chunk rolls back the ones before it, so a file is never imported in part
+        with transaction.atomic():
+            for i in range(0, len(objs), self.chunk_size):
+                self.model.objects.bulk_create(objs[i:i + self.chunk_size])
+        return len(objs)
+
+
+class CustomerImporter(BulkImporter):
+    model = Customer
+    permission_required = 'customers.add_customer'
+    requires_customer = False
+    columns = (
+        Column('type', CustomerType.NAME_MAX_LENGTH),
+        Column('name', Customer.NAME_MAX_LENGTH),
+        Column('vat', Customer.VAT_MAX_LENGTH, required=False, validators=(numbers_only_batch_validator,)),
+        Column('email_address', Customer.EMAIL_MAX_LENGTH, validators=(email_batch_validator,)),
+        Column('phone_number', Customer.PHONE_NUMBER_MAX_LENGTH, validators=(phone_number_batch_validator,)),
+    )
+
+    def load_lookups(self):
+        return {
+            'types': {name.lower(): pk for (pk, name) in CustomerType.objects.all().values_list('pk', 'name')},
+        }
+
+    def build_instance(self, row, lookups):
+        type_id = lookups['types'].get(row['type'].lower())
+        if type_id is None:
+            raise ValidationError(_('Unknown customer type "%(name)s"') % {'name': row['type']})
+
+        return Customer(
+            type_id=type_id,
+            name=row['name'],
+            vat=row.get('vat') or None,
+            email_address=row['email_address'],
+            phone_number=row['phone_number'],
+        )
+
+
+class CustomerRepresentativeImporter(BulkImporter):
+    model = CustomerRepresentative
+    permission_required = 'customers.add_customerrepresentative'
+    columns = (
+        Column('first_name', CustomerRepresentative.FIRST_NAME_MAX_LENGTH),
+        Column('last_name', CustomerRepresentative.LAST_NAME_MAX_LENGTH),
+        Column('email_address', CustomerRepresentative.EMAIL_ADDRESS_MAX_LENGTH, required=False,
+               validators=(email_batch_validator,)),
+        Column('phone_number', CustomerRepresentative.PHONE_NUMBER_MAX_LENGTH,
+               validators=(phone_number_batch_validator,)),
+    )
+
+    def build_instance(self, row, lookups):
+        return CustomerRepresentative(
+            customer=self.customer,
+            first_name=row['first_name'],
+            last_name=row['last_name'],
+            email_address=row.get('email_address') or None,
+            phone_number=row['phone_number'],
+        )
+
+
+class CustomerDepartmentImporter(BulkImporter):
+    model = CustomerDepartment
+    permission_required = 'customers.add_customerdepartment'
+    columns = (
+        Column('name', CustomerDepartment.NAME_MAX_LENGTH),
+    )
+
+    def build_instance(self, row, lookups):
+        return CustomerDepartment(customer=self.customer, name=row['name'])
+
+
+class CustomerAssetImporter(BulkImporter):
+    """
+    The assets are referenced by brand, model name and model number, as they are shown in the master data.
+    """
+    model = CustomerAsset
+    permission_required = 'customers.add_customerasset'
+    columns = (
+        Column('brand', Brand.NAME_MAX_LENGTH),
+        Column('model_name', Asset.MODEL_NAME_MAX_LENGTH),
+        Column('model_number', Asset.MODEL_NUMBER_MAX_LENGTH),
+        Column('serial_number', CustomerAsset.SERIAL_NUMBER_MAX_LENGTH, required=False),
+        Column('product_number', CustomerAsset.PRODUCT_NUMBER_MAX_LENGTH, required=False),
+    )
+
+    @staticmethod
+    def asset_key(brand, model_name, model_number):
+        return brand.lower(), model_name.lower(), model_number.lower()
+
+    def load_lookups(self):
+        assets = Asset.objects.all().values_list('pk', 'brand__name', 'model_name', 'model_number')
+        return {
+            'assets': {self.asset_key(*values): pk for (pk, *values) in assets},
+        }
+
+    def build_instance(self, row, lookups):
+        asset_id = lookups['assets'].get(self.asset_key(row['brand'], row['model_name'], row['model_number']))
+        if asset_id is None:
+            raise ValidationError(_('Unknown asset "%(brand)s %(model_name)s %(model_number)s"') % row)
+
+        return CustomerAsset(
+            customer=self.customer,
+            asset_id=asset_id,
+            serial_number=row.get('serial_number') or None,
+            product_number=row.get('product_number') or None,
+        )
+
+
+IMPORTERS = {
+    'customers': CustomerImporter,
+    'representatives': CustomerRepresentativeImporter,
+    'departments': CustomerDepartmentImporter,
+    'assets': CustomerAssetImporter,
+}
@@ -0,0 +1,36 @@
+from django.core.exceptions import ValidationError
+from django.core.management import BaseCommand, CommandError
+
+from service_manager.customers.importers import IMPORTERS
+from service_manager.customers.models import Customer
+
+
+class Command(BaseCommand):
+    help = 'Import customers, or the representatives, departments or assets of a customer, from a CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=IMPORTERS)
+        parser.add_argument('path', help='CSV file with a header row')
+        parser.add_argument('--customer', type=int, help='Customer the representatives, departments or assets of')
+        parser.add_argument('--chunk-size', type=int, help='Rows validated and inserted together')
+        parser.add_argument('--workers', type=int, default=0, help='Validate the chunks in this many processes')
+
+    def handle(self, *args, **options):
+        importer_class = IMPORTERS[options['kind']]
+        customer = None
+        if importer_class.requires_customer:
+            if options['customer'] is None:
+                raise CommandError(f'--customer is required to import {options["kind"]}')
+            try:
+                customer = Customer.objects.get(pk=options['customer'])
+            except Customer.DoesNotExist:
+                raise CommandError(f'Customer {options["customer"]} does not exist')
+
+        importer = importer_class(customer=customer, chunk_size=options['chunk_size'], workers=options['workers'])
+        try:
+            with open(options['path'], 'rb') as file:
+                result = importer.import_file(file)
+        except ValidationError as ex:
+            raise CommandError('\n'.join(ex.messages))
+
+        self.stdout.write(f'Imported {result.created} {options["kind"]} in {result.seconds:.2f}s')
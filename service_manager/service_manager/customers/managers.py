@@ -1,5 +1,8 @@
 from django.db import models
 from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+
+from service_manager.core.search import get_search_index, update_search_index
 
 
 class ActiveQuerySet(models.QuerySet):
@@ -29,6 +32,37 @@ class ActiveManager(models.Manager):
     #     return super().get_queryset().filter(active=True)
 
 
+class SearchIndexedQuerySet(ActiveQuerySet):
+    """
+    Keep the search index in sync for the bulk operations, which don't send model signals.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        update_search_index(self.model, [obj.pk for obj in objs if obj.pk is not None], self.db)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        update_search_index(self.model, [obj.pk for obj in objs], self.db)
+        return rows
+
+    def update(self, **kwargs):
+        index = get_search_index(self.model)
+        if index is None or not any(field.split(LOOKUP_SEP)[0] in kwargs for field in index.fields):
+            return super().update(**kwargs)
+
+        pks = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        update_search_index(self.model, pks, self.db)
+        return rows
+
+
+class SearchIndexedManager(ActiveManager):
+    def get_queryset(self):
+        return SearchIndexedQuerySet(self.model, using=self._db)
+
+
 class AllRecordsQuerySet(models.QuerySet):
     def all(self):
         return self.all()
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+from service_manager.core.search import CreateSearchIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("customers", "0009_alter_customer_phone_number_alter_customer_type_and_more"),
+    ]
+
+    operations = [
+        CreateSearchIndex(model_name="customer", fields=("name", "vat")),
+        CreateSearchIndex(model_name="customerasset", fields=("serial_number",)),
+    ]
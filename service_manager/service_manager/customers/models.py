@@ -2,6 +2,7 @@ from django.core.validators import EmailValidator
 from django.db import models
 
 from service_manager.core.models import BaseAuditEntity, ActiveModel
+from service_manager.customers.managers import SearchIndexedManager
 from service_manager.customers.validators import numbers_only_validator, phone_number_validator
 from service_manager.master_data.models import Asset, CustomerType
 from django.utils.translation import gettext_lazy as _
@@ -50,6 +51,8 @@ class Customer(ActiveModel, BaseAuditEntity):
         verbose_name=_('type'),
     )
 
+    objects = SearchIndexedManager()
+
     def __str__(self):
         return self.name
 
@@ -152,6 +155,8 @@ class CustomerAsset(ActiveModel, BaseAuditEntity):
         verbose_name=_('asset'),
     )
 
+    objects = SearchIndexedManager()
+
     def __str__(self):
         return f'{str(self.customer)}---{str(self.asset)}--{self.serial_number}---{self.product_number}'
 
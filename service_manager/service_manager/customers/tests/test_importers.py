@@ -0,0 +1,138 @@
+import io
+import tempfile
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command, CommandError
+from django.db import connection, IntegrityError
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from service_manager.customers.importers import CustomerImporter, CustomerAssetImporter, \
+    CustomerRepresentativeImporter
+from service_manager.customers.models import Customer, CustomerAsset, CustomerRepresentative
+from service_manager.customers.validators import phone_number_batch_validator, numbers_only_batch_validator
+from service_manager.master_data.models import CustomerType, Asset, AssetCategory, Brand
+
+
+class BatchValidatorsTests(TestCase):
+    def test_phone_number_batch_validator__expect_positions_of_invalid_values(self):
+        errors = phone_number_batch_validator(['+359 888', '0888a', '123', '12-3'])
+
+        self.assertEqual([1, 3], list(errors))
+
+    def test_numbers_only_batch_validator__expect_messages_of_single_validator(self):
+        errors = numbers_only_batch_validator(['123', '12a'])
+
+        self.assertEqual({1: ['Please, enter digits only.']}, errors)
+
+
+class BulkImporterTests(TestCase):
+    def setUp(self):
+        self.customer_type = CustomerType.objects.create(name='Business')
+        self.customer = Customer.objects.create(
+            type=self.customer_type,
+            name='Testing Inc.',
+            vat='123444121',
+            email_address='testing@inc.com',
+            phone_number='100921122',
+        )
+        self.asset = Asset.objects.create(
+            category=AssetCategory.objects.create(name='Printers'),
+            brand=Brand.objects.create(name='HP'),
+            model_name='LaserJet',
+            model_number='M404',
+        )
+
+    def test_import_file__when_rows_are_valid__expect_created_in_chunks(self):
+        rows = ''.join(f'hp,laserjet,M404,SN-{i},PN-{i}\n' for i in range(5))
+        csv_file = io.StringIO('brand,model_name,model_number,serial_number,product_number\n' + rows)
+
+        with CaptureQueriesContext(connection) as context:
+            result = CustomerAssetImporter(customer=self.customer, chunk_size=2).import_file(csv_file)
+
+        inserts = [x for x in context.captured_queries if x['sql'].startswith('INSERT INTO "customers_customerasset" ')]
+        self.assertEqual(3, len(inserts))
+        self.assertEqual(5, result.created)
+        self.assertEqual(5, CustomerAsset.objects.filter(customer=self.customer, asset=self.asset).count())
+
+    def test_import_file__when_chunk_fails__expect_nothing_created(self):
+        rows = ''.join(f'hp,laserjet,M404,SN-{i},PN-{i}\n' for i in range(5))
+        csv_file = io.StringIO('brand,model_name,model_number,serial_number,product_number\n' + rows)
+        bulk_create = CustomerAsset.objects.bulk_create
+
+        def bulk_create_failing_last_chunk(objs):
+            if len(objs) < 2:
+                raise IntegrityError('Duplicate serial number')
+            return bulk_create(objs)
+
+        with mock.patch.object(CustomerAsset.objects, 'bulk_create', side_effect=bulk_create_failing_last_chunk):
+            with self.assertRaises(IntegrityError):
+                CustomerAssetImporter(customer=self.customer, chunk_size=2).import_file(csv_file)
+
+        self.assertEqual(0, CustomerAsset.objects.count())
+
+    def test_import_file__when_file_is_not_utf8__expect_error(self):
+        csv_file = io.BytesIO(
+            'type,name,email_address,phone_number\nBusiness,Müller,m@inc.com,0888\n'.encode('latin-1'))
+
+        with self.assertRaises(ValidationError) as context:
+            CustomerImporter().import_file(csv_file)
+
+        self.assertIn('The file is not a valid UTF-8 CSV file', context.exception.messages[0])
+        self.assertEqual(1, Customer.objects.count())
+
+    def test_import_file__when_row_is_invalid__expect_nothing_created(self):
+        csv_file = io.BytesIO(
+            b'type,name,vat,email_address,phone_number\n'
+            b'business,First,123,first@inc.com,0888\n'
+            b'business,Second,12a,second@inc.com,0888-1\n'
+        )
+
+        with self.assertRaises(ValidationError) as context:
+            CustomerImporter().import_file(csv_file)
+
+        self.assertEqual([
+            'Line 3: phone_number: The allowed characters are: +, space and digits.',
+            'Line 3: vat: Please, enter digits only.',
+        ], context.exception.messages)
+        self.assertEqual(1, Customer.objects.count())
+
+    def test_import_file__when_reference_is_unknown__expect_error(self):
+        csv_file = io.StringIO('type,name,email_address,phone_number\nGovernment,Ministry,m@gov.com,0888\n')
+
+        with self.assertRaises(ValidationError) as context:
+            CustomerImporter().import_file(csv_file)
+
+        self.assertEqual(['Line 2: Unknown customer type "Government"'], context.exception.messages)
+
+    def test_import_file__when_column_is_missing__expect_error(self):
+        csv_file = io.StringIO('first_name,phone_number\nJohn,0888\n')
+
+        with self.assertRaises(ValidationError) as context:
+            CustomerRepresentativeImporter(customer=self.customer).import_file(csv_file)
+
+        self.assertEqual(['Missing columns: last_name'], context.exception.messages)
+
+    def test_import_file__when_validated_in_processes__expect_created(self):
+        rows = ''.join(f'First {i},Last {i},,0888{i}\n' for i in range(10))
+        csv_file = io.StringIO('first_name,last_name,email_address,phone_number\n' + rows)
+
+        result = CustomerRepresentativeImporter(customer=self.customer, chunk_size=3, workers=2).import_file(csv_file)
+
+        self.assertEqual(10, result.created)
+        self.assertEqual(10, CustomerRepresentative.objects.filter(customer=self.customer).count())
+
+    def test_command__expect_rows_imported(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as file:
+            file.write('name\nSales\nSupport\n')
+            file.flush()
+
+            call_command('import_customers', 'departments', file.name, customer=self.customer.pk,
+                         stdout=io.StringIO())
+
+        self.assertEqual(['Sales', 'Support'], [x.name for x in self.customer.customerdepartment_set.all()])
+
+    def test_command__when_customer_is_missing__expect_error(self):
+        with self.assertRaises(CommandError):
+            call_command('import_customers', 'assets', 'assets.csv')
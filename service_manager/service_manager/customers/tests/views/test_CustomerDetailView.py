@@ -1,7 +1,10 @@
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 
+from service_manager.accounts.models import Profile
 from service_manager.customers.models import Customer, CustomerRepresentative, CustomerAsset, CustomerDepartment
 from service_manager.main.models import ServiceOrderHeader
 from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset
@@ -263,3 +266,66 @@ class CustomerDetailViewTests(TestCase):
         customer_departments = response.context['customer_departments']
 
         self.assertEqual(len(customer_departments), 0)
+
+
+class CustomerDetailViewConditionalGetTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        cache.clear()
+        user = UserModel.objects.create_user(**self.USER_DATA)
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=user)
+        user.user_permissions.add(Permission.objects.get(codename='view_customer'))
+
+        self.customer = Customer.objects.create(
+            name='Test Customer Name',
+            email_address='test@test.com',
+            phone_number='987654321',
+            type=CustomerType.objects.create(name='Business'),
+        )
+        CustomerAsset.objects.create(
+            customer=self.customer,
+            asset=Asset.objects.create(
+                category=AssetCategory.objects.create(name='Monitor'),
+                brand=Brand.objects.create(name='Apple'),
+                model_name='iPhone',
+                model_number='13 Pro',
+            ),
+        )
+        self.client.login(**self.USER_DATA)
+
+    def __get(self, etag=None, **params):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(reverse('customer_detail', kwargs={'pk': self.customer.pk}), params, **headers)
+
+    def test_get__when_page_is_unchanged__expect_not_modified(self):
+        response = self.__get()
+
+        self.assertEqual(304, self.__get(response['ETag']).status_code)
+        self.assertIn('Last-Modified', response)
+
+    def test_get__when_department_is_added__expect_page_rendered(self):
+        etag = self.__get(show_departments='')['ETag']
+
+        CustomerDepartment.objects.create(customer=self.customer, name='Sales')
+        response = self.__get(etag, show_departments='')
+
+        self.assertContains(response, 'Sales')
+
+    def test_get__when_assets_are_deleted_in_bulk__expect_page_rendered(self):
+        etag = self.__get()['ETag']
+
+        CustomerAsset.objects.filter(customer=self.customer).delete()
+        response = self.__get(etag)
+
+        self.assertEqual(200, response.status_code)
+
+    def test_get__when_search_changes__expect_page_rendered(self):
+        etag = self.__get()['ETag']
+
+        response = self.__get(etag, departments='Sales')
+
+        self.assertEqual(200, response.status_code)
@@ -0,0 +1,120 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from service_manager.accounts.models import Profile
+from service_manager.core.query_budget import QueryRecorder
+from service_manager.customers.models import Customer, CustomerAsset, CustomerDepartment
+from service_manager.main.models import ServiceOrderHeader
+from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset
+
+UserModel = get_user_model()
+
+
+class CustomerTabViewTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        cache.clear()
+        user = UserModel.objects.create_user(**self.USER_DATA)
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=user)
+        for codename in ('view_customer', 'add_serviceorderheader'):
+            user.user_permissions.add(Permission.objects.get(codename=codename))
+
+        self.customer = Customer.objects.create(
+            name='Test Customer Name',
+            email_address='test@test.com',
+            phone_number='987654321',
+            type=CustomerType.objects.create(name='Business'),
+        )
+        self.client.login(**self.USER_DATA)
+
+    def __create_assets(self, count):
+        assets = []
+        for i in range(CustomerAsset.objects.count(), CustomerAsset.objects.count() + count):
+            asset = Asset.objects.create(
+                category=AssetCategory.objects.create(name=f'Category {i:02}'),
+                brand=Brand.objects.create(name=f'Brand {i:02}'),
+                model_name=f'Model {i:02}',
+                model_number=f'{i}',
+            )
+            assets.append(CustomerAsset.objects.create(customer=self.customer, asset=asset))
+        return assets
+
+    def __get(self, url_name='customer_detail', **params):
+        kwargs = {'pk': self.customer.pk} if url_name == 'customer_detail' else {'customer_id': self.customer.pk}
+        cache.clear()
+        recorder = QueryRecorder()
+        with recorder.record():
+            response = self.client.get(reverse(url_name, kwargs=kwargs), params)
+        return response, recorder.count
+
+    def test_get__when_customer_has_many_assets__expect_first_page(self):
+        self.__create_assets(12)
+
+        response, _ = self.__get()
+
+        self.assertEqual(10, len(response.context['customer_assets']))
+        self.assertTrue(response.context['page_obj'].has_next())
+
+    def test_get__when_next_page_is_requested__expect_remaining_assets(self):
+        assets = self.__create_assets(12)
+        response, _ = self.__get()
+
+        response, _ = self.__get(cursor=response.context['page_obj'].next_cursor)
+
+        self.assertEqual([x.pk for x in assets[10:]], [x.pk for x in response.context['customer_assets']])
+
+    def test_get__when_assets_are_added__expect_same_query_count(self):
+        self.__create_assets(3)
+        _, expected_count = self.__get()
+
+        self.__create_assets(20)
+        _, count = self.__get()
+
+        # The row count of the paginator is added once there is more than one page
+        self.assertEqual(expected_count + 1, count)
+
+    def test_get__when_asset_is_being_serviced__expect_its_id(self):
+        (serviced_asset, _) = self.__create_assets(2)
+        ServiceOrderHeader.objects.create(
+            customer=self.customer,
+            customer_asset=serviced_asset,
+            problem_description='Some description',
+            send_emails=False,
+        )
+
+        response, _ = self.__get()
+
+        self.assertEqual({serviced_asset.pk}, response.context['assets_being_serviced'])
+        self.assertContains(response, 'Create Order', count=1)
+
+    def test_get__when_tab_is_requested__expect_only_the_tab(self):
+        self.__create_assets(1)
+
+        response, _ = self.__get('customer_assets')
+
+        self.assertTemplateUsed(response, 'customer_asset/customer_assets.html')
+        self.assertTemplateNotUsed(response, 'base.html')
+        self.assertContains(response, 'Model 00')
+
+    def test_get__when_departments_tab_is_paginated__expect_cursor_of_next_page(self):
+        for i in range(11):
+            CustomerDepartment.objects.create(customer=self.customer, name=f'Department {i:02}')
+
+        response, _ = self.__get('customer_departments')
+
+        self.assertEqual(10, len(response.context['customer_departments']))
+        self.assertContains(response, f'cursor={response.context["page_obj"].next_cursor}')
+
+    def test_get__when_user_has_no_permission__expect_forbidden(self):
+        UserModel.objects.get(email=self.USER_DATA['email']).user_permissions.clear()
+
+        response, _ = self.__get('customer_representatives')
+
+        self.assertEqual(403, response.status_code)
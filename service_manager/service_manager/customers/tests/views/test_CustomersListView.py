@@ -1,9 +1,13 @@
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
 from django.test import TestCase
 from django.urls import reverse
 
+from service_manager.accounts.models import Profile
+from service_manager.core.pagination import NEXT, encode_cursor, resolve_ordering
+from service_manager.core.search import search
 from service_manager.customers.models import Customer
-from service_manager.master_data.models import CustomerType
+from service_manager.master_data.models import CustomerType, Asset, Material, MaterialCategory
 
 UserModel = get_user_model()
 
@@ -108,3 +112,152 @@ class CustomersListViewTests(TestCase):
 
         customers = response.context['object_list']
         self.assertEqual(len(customers), 1)
+
+
+class CustomersListViewPaginationTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        user = UserModel.objects.create_user(**self.USER_DATA)
+        user.user_permissions.add(Permission.objects.get(codename='view_customer'))
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=user)
+        self.client.login(**self.USER_DATA)
+
+        customer_type = CustomerType.objects.create(name='Business')
+        # Equal names make the primary key decide the order between them
+        Customer.objects.bulk_create(
+            Customer(name=f'Customer {i // 2:02d}', vat='123456789', email_address=f'test{i}@test.com',
+                     phone_number='123456789', type=customer_type)
+            for i in range(25)
+        )
+
+    def __get_names(self, response):
+        return [customer.name for customer in response.context['object_list']]
+
+    def test_get__when_following_next_cursors__expect_every_customer_once(self):
+        url = reverse('customers_list')
+        response = self.client.get(url)
+        pks = [customer.pk for customer in response.context['object_list']]
+
+        while response.context['page_obj'].has_next():
+            response = self.client.get(url, data={'cursor': response.context['page_obj'].next_cursor})
+            pks += [customer.pk for customer in response.context['object_list']]
+
+        expected_pks = list(Customer.objects.order_by('name', 'pk').values_list('pk', flat=True))
+        self.assertEqual(pks, expected_pks)
+
+    def test_get__when_following_previous_cursor__expect_first_page(self):
+        url = reverse('customers_list')
+        first_page = self.client.get(url)
+        second_page = self.client.get(url, data={'cursor': first_page.context['page_obj'].next_cursor})
+
+        response = self.client.get(url, data={'cursor': second_page.context['page_obj'].previous_cursor})
+
+        self.assertEqual(self.__get_names(response), self.__get_names(first_page))
+        self.assertFalse(response.context['page_obj'].has_previous())
+
+    def test_get__when_opening_last_page__expect_last_customers(self):
+        url = reverse('customers_list')
+        first_page = self.client.get(url)
+
+        response = self.client.get(url, data={'cursor': first_page.context['paginator'].last_cursor})
+
+        expected_names = list(Customer.objects.order_by('name', 'pk').values_list('name', flat=True))[-10:]
+        self.assertEqual(self.__get_names(response), expected_names)
+        self.assertFalse(response.context['page_obj'].has_next())
+        self.assertEqual(response.context['paginator'].count, 25)
+
+    def test_get__when_searching__expect_cursor_links_to_keep_search(self):
+        response = self.client.get(reverse('customers_list'), data={'search_value': 'Customer', 'cursor': ''})
+
+        self.assertEqual(response.context['params'], 'search_value=Customer')
+
+    def test_get__when_cursor_is_invalid__expect_not_found(self):
+        response = self.client.get(reverse('customers_list'), data={'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_get__when_cursor_values_are_tampered__expect_not_found(self):
+        for values in (['abc', 'abc'], [{}, {}]):
+            with self.subTest(values=values):
+                response = self.client.get(reverse('customers_list'), data={'cursor': encode_cursor(NEXT, values)})
+
+                self.assertEqual(response.status_code, 404)
+
+    def test_resolve_ordering__when_ordered_by_relations__expect_related_ordering_and_pk(self):
+        keys = resolve_ordering(Asset, ('category', '-brand', 'model_name'))
+
+        self.assertEqual(keys, [
+            ('category__name', False),
+            ('brand__name', True),
+            ('model_name', False),
+            ('pk', False),
+        ])
+
+
+class CustomersListViewSearchTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        user = UserModel.objects.create_user(**self.USER_DATA)
+        user.user_permissions.add(Permission.objects.get(codename='view_customer'))
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=user)
+        self.client.login(**self.USER_DATA)
+
+        self.customer_type = CustomerType.objects.create(name='Business')
+
+    def __create_customer(self, name, vat='123456789'):
+        return Customer.objects.create(name=name, vat=vat, email_address='test@test.com', phone_number='123456789',
+                                       type=self.customer_type)
+
+    def __search(self, search_value):
+        response = self.client.get(reverse('customers_list'), data={'search_value': search_value})
+        return [customer.name for customer in response.context['object_list']]
+
+    def test_get__when_search_matches_the_beginning__expect_it_first(self):
+        self.__create_customer('Best Service')
+        self.__create_customer('Service Point')
+        self.__create_customer('Other')
+
+        self.assertEqual(self.__search('service'), ['Service Point', 'Best Service'])
+
+    def test_get__when_customers_are_bulk_created__expect_them_found(self):
+        Customer.objects.bulk_create(
+            Customer(name=name, vat='123456789', email_address='test@test.com', phone_number='123456789',
+                     type=self.customer_type)
+            for name in ('Alpha Ltd', 'Beta Ltd', 'Gamma')
+        )
+
+        self.assertCountEqual(self.__search('ltd'), ['Alpha Ltd', 'Beta Ltd'])
+
+    def test_get__when_customer_is_renamed__expect_new_name_found(self):
+        customer = self.__create_customer('Old Name')
+        customer.name = 'New Name'
+        customer.save()
+        Customer.objects.filter(pk=customer.pk).update(vat='555000')
+
+        self.assertEqual(self.__search('old'), [])
+        self.assertEqual(self.__search('new'), ['New Name'])
+        self.assertEqual(self.__search('555'), ['New Name'])
+
+    def test_get__when_search_is_shorter_than_a_trigram__expect_contains_match(self):
+        self.__create_customer('AB Trade')
+        self.__create_customer('Other')
+
+        self.assertEqual(self.__search('ab'), ['AB Trade'])
+
+    def test_search__when_related_name_changes__expect_reindexed(self):
+        category = MaterialCategory.objects.create(name='Screens')
+        Material.objects.create(name='Display', price=10, category=category)
+
+        category.name = 'Panels'
+        category.save()
+
+        self.assertEqual([material.name for material in search(Material.objects.all(), 'panel')], ['Display'])
+        self.assertFalse(search(Material.objects.all(), 'screen').exists())
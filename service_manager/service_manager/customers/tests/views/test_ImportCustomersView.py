@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from service_manager.accounts.models import Profile
+from service_manager.customers.models import Customer
+from service_manager.master_data.models import CustomerType
+
+UserModel = get_user_model()
+
+
+class ImportCustomersViewTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        self.user = UserModel.objects.create_user(**self.USER_DATA)
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=self.user)
+        self.user.user_permissions.add(Permission.objects.get(codename='view_customer'))
+        self.customer = Customer.objects.create(
+            type=CustomerType.objects.create(name='Business'),
+            name='Testing Inc.',
+            email_address='testing@inc.com',
+            phone_number='100921122',
+        )
+        self.client.login(**self.USER_DATA)
+
+    @staticmethod
+    def __csv_file(content):
+        return SimpleUploadedFile('import.csv', content.encode(), content_type='text/csv')
+
+    def test_get__expect_correct_template(self):
+        response = self.client.get(reverse('import_customers'))
+
+        self.assertTemplateUsed(response, 'customer/customer_import.html')
+        self.assertEqual(['customers'], [x for (x, _) in response.context['form'].fields['kind'].choices])
+
+    def test_post__when_user_can_add_customers__expect_imported(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='add_customer'))
+
+        response = self.client.post(reverse('import_customers'), {
+            'kind': 'customers',
+            'csv_file': self.__csv_file('type,name,vat,email_address,phone_number\n'
+                                        'Business,Imported Ltd.,,imported@ltd.com,+359 888\n'),
+        })
+
+        self.assertRedirects(response, reverse('customers_list'))
+        self.assertTrue(Customer.objects.filter(name='Imported Ltd.', vat=None).exists())
+
+    def test_post__when_user_cannot_add_assets__expect_nothing_imported(self):
+        response = self.client.post(reverse('import_customer_records', kwargs={'customer_id': self.customer.pk}), {
+            'kind': 'departments',
+            'csv_file': self.__csv_file('name\nSales\n'),
+        })
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn('kind', response.context['form'].errors)
+        self.assertFalse(self.customer.customerdepartment_set.exists())
+
+    def test_post__when_file_is_invalid__expect_errors_shown(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='add_customerdepartment'))
+
+        response = self.client.post(reverse('import_customer_records', kwargs={'customer_id': self.customer.pk}), {
+            'kind': 'departments',
+            'csv_file': self.__csv_file('name\nSales\n\n,\n'),
+        })
+
+        self.assertEqual(['Line 4: name: This field is required.'], response.context['form'].errors['csv_file'])
+        self.assertFalse(self.customer.customerdepartment_set.exists())
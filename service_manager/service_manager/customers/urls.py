@@ -3,7 +3,7 @@ from service_manager.customers.views import CustomersListView, EditCustomerView,
     DeleteCustomerView, CreateCustomerAssetView, EditCustomerAssetView, DeleteCustomerAssetView, \
     CreateCustomerRepresentativeView, EditCustomerRepresentativeView, DeleteCustomerRepresentativeView, \
     CreateCustomerDepartmentView, EditCustomerDepartmentView, DeleteCustomerDepartmentView, \
-    CustomerDetailView, CustomerAssetDetailView
+    CustomerDetailView, CustomerAssetDetailView, ImportCustomersView, CustomerTabView
 
 urlpatterns = [
     path('', CustomersListView.as_view(), name='customers_list'),
@@ -11,6 +11,12 @@ urlpatterns = [
     path('<int:pk>/', EditCustomerView.as_view(), name='edit_customer'),
     path('create/', CreateCustomerView.as_view(), name='create_customer'),
     path('delete/<int:pk>', DeleteCustomerView.as_view(), name='delete_customer'),
+    path('<int:customer_id>/assets/', CustomerTabView.as_view(tab='assets'), name='customer_assets'),
+    path('<int:customer_id>/representatives/', CustomerTabView.as_view(tab='representatives'),
+         name='customer_representatives'),
+    path('<int:customer_id>/departments/', CustomerTabView.as_view(tab='departments'), name='customer_departments'),
+    path('import/', ImportCustomersView.as_view(), name='import_customers'),
+    path('<int:customer_id>/import/', ImportCustomersView.as_view(), name='import_customer_records'),
     path('<int:customer_id>/customer_asset/create/', CreateCustomerAssetView.as_view(), name='create_customer_asset'),
     path('<int:customer_id>/customer_asset/detail/<int:pk>/', CustomerAssetDetailView.as_view(),
          name='customer_asset_detail'),
@@ -30,3 +36,27 @@ urlpatterns = [
     path('<int:customer_id>/customer_department/delete/<int:pk>/', DeleteCustomerDepartmentView.as_view(),
          name='delete_customer_department'),
 ]
+
+# Maximum number of queries per page, enforced by main/tests/test_query_budgets.py
+query_budgets = {
+    'customers_list': 7,
+    'customer_detail': 9,
+    'customer_assets': 7,
+    'customer_representatives': 6,
+    'customer_departments': 6,
+    'edit_customer': 7,
+    'create_customer': 6,
+    'delete_customer': 6,
+    'import_customers': 5,
+    'import_customer_records': 6,
+    'create_customer_asset': 8,
+    'customer_asset_detail': 13,
+    'edit_customer_asset': 7,
+    'delete_customer_asset': 6,
+    'create_customer_representative': 7,
+    'edit_customer_representative': 7,
+    'delete_customer_representative': 6,
+    'create_customer_department': 7,
+    'edit_customer_department': 7,
+    'delete_customer_department': 6,
+}
@@ -1,6 +1,12 @@
+import re
+
 from django.core.exceptions import ValidationError
+from django.core.validators import EmailValidator
 from django.utils.translation import gettext_lazy as _
 
+NUMBERS_ONLY_PATTERN = re.compile(r'\d*')
+PHONE_NUMBER_PATTERN = re.compile(r'[\d+ ]*')
+
 
 def numbers_only_validator(value):
     if not all([x.isdigit() for x in str(value)]):
@@ -12,3 +18,31 @@ def phone_number_validator(value):
     for c in str(value):
         if not c.isdigit() and c not in allowed_chars:
             raise ValidationError(_('The allowed characters are: +, space and digits.'), code='invalid')
+
+
+def validate_in_batch(validator, values, pattern=None):
+    """
+    Run the validator over the values and return {position: messages} for the invalid ones.
+    The values which fully match `pattern` are known to be valid and are not checked one by one.
+    """
+    errors = {}
+    for (i, value) in enumerate(values):
+        if pattern is not None and pattern.fullmatch(str(value)):
+            continue
+        try:
+            validator(value)
+        except ValidationError as ex:
+            errors[i] = ex.messages
+    return errors
+
+
+def numbers_only_batch_validator(values):
+    return validate_in_batch(numbers_only_validator, values, NUMBERS_ONLY_PATTERN)
+
+
+def phone_number_batch_validator(values):
+    return validate_in_batch(phone_number_validator, values, PHONE_NUMBER_PATTERN)
+
+
+def email_batch_validator(values):
+    return validate_in_batch(EmailValidator(), values)
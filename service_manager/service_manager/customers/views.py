@@ -1,16 +1,29 @@
+from itertools import chain
+from operator import attrgetter
+
 import django.views.generic as views
+from django.conf import settings
+from django.contrib import messages
+from django.core.exceptions import ValidationError
+from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
-from django.db.models import Q
+from django.db.models import Max, Q, Sum, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth import mixins as auth_mixins
+from django.utils.translation import gettext_lazy as _
 
+from service_manager.core.pagination import KeysetPaginationMixin, KeysetPaginator
+from service_manager.core.search import search
+from service_manager.core.views import ConditionalGetMixin, ReplicaReadMixin, related_rows_version
 from service_manager.customers.forms import EditCustomerForm, CreateCustomerForm, CreateCustomerAssetForm, \
     EditCustomerAssetForm, CreateCustomerRepresentativeForm, EditCustomerRepresentativeForm, \
-    CreateCustomerDepartmentForm
+    CreateCustomerDepartmentForm, ImportCustomersForm
+from service_manager.customers.importers import IMPORTERS
 from service_manager.customers.models import Customer, CustomerAsset, CustomerRepresentative, CustomerDepartment
-from service_manager.main.models import ServiceOrderHeader
+from service_manager.main.models import ServiceOrderHeader, ArchivedServiceOrderHeader
 
 
-class CustomersListView(auth_mixins.PermissionRequiredMixin, views.ListView):
+class CustomersListView(ReplicaReadMixin, auth_mixins.PermissionRequiredMixin, KeysetPaginationMixin, views.ListView):
     model = Customer
     template_name = 'customer/customers.html'
     ordering = ('name',)
@@ -18,56 +31,151 @@ class CustomersListView(auth_mixins.PermissionRequiredMixin, views.ListView):
 
     permission_required = 'customers.view_customer'
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-
-        request = self.request.GET.copy()
-        params = request.pop('page', True) and request.urlencode()
-        context['params'] = params
-
-        return context
-
     def get_queryset(self):
         queryset = super().get_queryset()
 
         search_text = self.request.GET.get('search_value', None)
         if search_text:
-            queryset = queryset.filter(Q(name__icontains=search_text) | Q(vat__icontains=search_text))
+            queryset = search(queryset, search_text)
         return queryset
 
 
-class CustomerDetailView(auth_mixins.PermissionRequiredMixin, views.DetailView):
-    model = Customer
-    template_name = 'customer/customer_detail.html'
+class CustomerTabsMixin:
+    """
+    The assets, representatives and departments of a customer, shown one tab and one page at a time.
+    Every tab is read with the same number of queries, however many rows the customer has.
+    """
+    TABS = ('assets', 'representatives', 'departments')
+    paginate_by = 10
+    cursor_kwarg = 'cursor'
 
-    permission_required = 'customers.view_customer'
+    def get_active_tab(self):
+        for tab in self.TABS[1:]:
+            if f'show_{tab}' in self.request.GET:
+                return tab
+        return self.TABS[0]
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        customer = context['customer']
-
-        context['customer_assets'] = customer.customerasset_set.all()
-        context['customer_representatives'] = customer.customerrepresentative_set.all()
-        context['customer_departments'] = customer.customerdepartment_set.all()
+    def get_customer_assets(self, customer):
+        # The serial number is optional, the cursor of the pages can't compare NULLs
+        queryset = customer.customerasset_set.all() \
+            .select_related('asset__brand', 'asset__category') \
+            .annotate(serial_number_key=Coalesce('serial_number', Value(''))) \
+            .order_by('asset__category__name', 'asset__brand__name', 'asset__model_name', 'serial_number_key')
 
         search_text = self.request.GET.get('search_value', None)
         if search_text:
-            context['customer_assets'] = customer.customerasset_set.filter(serial_number__icontains=search_text)
+            queryset = search(queryset, search_text)
+        return queryset
+
+    def get_customer_representatives(self, customer):
+        queryset = customer.customerrepresentative_set.all()
 
         representative_search = self.request.GET.get('representative', None)
         if representative_search:
-            context['customer_representatives'] = customer.customerrepresentative_set.filter(
+            queryset = queryset.filter(
                 Q(first_name__icontains=representative_search) | Q(last_name__icontains=representative_search))
+        return queryset
+
+    def get_customer_departments(self, customer):
+        queryset = customer.customerdepartment_set.all()
 
         department_search = self.request.GET.get('departments', None)
         if department_search:
-            context['customer_departments'] = customer.customerdepartment_set.filter(name__icontains=department_search)
+            queryset = queryset.filter(name__icontains=department_search)
+        return queryset
+
+    @staticmethod
+    def get_assets_being_serviced(customer_assets):
+        """
+        Ids of the assets (of the page) which have an open service order.
+        """
+        return set(
+            ServiceOrderHeader.objects.filter(customer_asset_id__in=[x.pk for x in customer_assets], is_completed=False)
+            .values_list('customer_asset_id', flat=True)
+        )
+
+    def paginate_tab(self, queryset):
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        paginator = KeysetPaginator(queryset, self.paginate_by, ordering)
+        return paginator.page(self.request.GET.get(self.cursor_kwarg))
+
+    def get_tab_context_data(self, customer):
+        """
+        The page of the active tab, the querysets of the other tabs are left unevaluated.
+        """
+        tab = self.get_active_tab()
+        context = {
+            'active_tab': tab,
+            'customer_assets': self.get_customer_assets(customer),
+            'customer_representatives': self.get_customer_representatives(customer),
+            'customer_departments': self.get_customer_departments(customer),
+            'assets_being_serviced': set(),
+        }
+
+        page = self.paginate_tab(context[f'customer_{tab}'])
+        context[f'customer_{tab}'] = page.object_list
+        context['page_obj'] = page
+        if tab == 'assets':
+            context['assets_being_serviced'] = self.get_assets_being_serviced(page.object_list)
+
+        params = self.request.GET.copy()
+        params.pop(self.cursor_kwarg, None)
+        context['params'] = params.urlencode()
+        return context
 
-        customer_open_service_orders = ServiceOrderHeader.objects.filter(customer_id=customer.id, is_completed=False)
-        assets_being_serviced = [x.customer_asset for x in customer_open_service_orders.all()]
 
-        context['assets_being_serviced'] = assets_being_serviced
+class CustomerDetailView(auth_mixins.PermissionRequiredMixin, ConditionalGetMixin, CustomerTabsMixin,
+                         views.DetailView):
+    model = Customer
+    template_name = 'customer/customer_detail.html'
 
+    permission_required = 'customers.view_customer'
+
+    etag_fields = ('updated_on', 'type__updated_on')
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('type')
+
+    def get_etag_subqueries(self):
+        return [
+            *related_rows_version(CustomerAsset, 'customer', Max('updated_on'), Max('asset__updated_on'),
+                                  Max('asset__brand__updated_on'), Max('asset__category__updated_on')),
+            *related_rows_version(CustomerRepresentative, 'customer'),
+            *related_rows_version(CustomerDepartment, 'customer'),
+            # The assets being serviced
+            *related_rows_version(ServiceOrderHeader, 'customer'),
+        ]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(self.get_tab_context_data(context['customer']))
+        return context
+
+
+class CustomerTabView(auth_mixins.PermissionRequiredMixin, CustomerTabsMixin, views.TemplateView):
+    """
+    A page of one tab of the customer detail page, without the rest of the page, so the tab can load it in place.
+    """
+    TAB_TEMPLATES = {
+        'assets': 'customer_asset/customer_assets.html',
+        'representatives': 'customer_representatives/customer_representatives.html',
+        'departments': 'customer_department/customer_departments.html',
+    }
+    tab = None
+
+    permission_required = 'customers.view_customer'
+
+    def get_active_tab(self):
+        return self.tab
+
+    def get_template_names(self):
+        return [self.TAB_TEMPLATES[self.tab]]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        customer = get_object_or_404(Customer.objects.all(), pk=self.kwargs['customer_id'])
+        context['customer'] = customer
+        context.update(self.get_tab_context_data(customer))
         return context
 
 
@@ -129,17 +237,36 @@ class CreateCustomerAssetView(auth_mixins.PermissionRequiredMixin, views.CreateV
         return context
 
 
-class CustomerAssetDetailView(auth_mixins.PermissionRequiredMixin, views.DetailView):
+class CustomerAssetDetailView(ReplicaReadMixin, auth_mixins.PermissionRequiredMixin, ConditionalGetMixin,
+                              views.DetailView):
     model = CustomerAsset
     template_name = 'customer_asset/customer_asset_detail.html'
 
     permission_required = 'customers.view_customerasset'
 
+    etag_fields = ('updated_on', 'customer__updated_on', 'asset__updated_on', 'asset__brand__updated_on',
+                   'asset__category__updated_on')
+
+    def get_etag_subqueries(self):
+        # The totals of the orders are refreshed with a bulk update, which doesn't change updated_on
+        return related_rows_version(ServiceOrderHeader, 'customer_asset', Max('updated_on'), Sum('total_amount'),
+                                    Max('serviced_by__display_name'))
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        service_orders = ServiceOrderHeader.objects.filter(customer_asset_id=self.object.pk).order_by('-created_on')
+        # The service history includes the orders moved to the archive tables (see main/archive.py)
+        service_orders = sorted(
+            chain(
+                ServiceOrderHeader.objects.filter(customer_asset_id=self.object.pk).select_related('serviced_by'),
+                ArchivedServiceOrderHeader.all_records.filter(customer_asset_id=self.object.pk)
+                .select_related('serviced_by'),
+            ),
+            key=attrgetter('created_on'),
+            reverse=True,
+        )
         context['service_orders'] = service_orders
+        context['service_orders_total_amount'] = f'{sum(x.total_amount for x in service_orders if x.active):.2f}'
         return context
 
 
@@ -272,3 +399,56 @@ class DeleteCustomerDepartmentView(auth_mixins.PermissionRequiredMixin, views.De
         if customer_id:
             return reverse_lazy('customer_detail', kwargs={'pk': customer_id}) + '?show_departments'
         return reverse_lazy('customers_list')
+
+
+class ImportCustomersView(auth_mixins.PermissionRequiredMixin, views.FormView):
+    """
+    Upload of a CSV file with customers or, for the customer in the url, with its representatives,
+    departments or assets.
+    """
+    form_class = ImportCustomersForm
+    template_name = 'customer/customer_import.html'
+
+    permission_required = 'customers.view_customer'
+
+    def get_customer(self):
+        customer_id = self.kwargs.get('customer_id')
+        if customer_id is None:
+            return None
+        return get_object_or_404(Customer.objects.all(), pk=customer_id)
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['user'] = self.request.user
+        kwargs['customer'] = self.customer
+        return kwargs
+
+    def get(self, request, *args, **kwargs):
+        self.customer = self.get_customer()
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        self.customer = self.get_customer()
+        return super().post(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['customer'] = self.customer
+        return context
+
+    def form_valid(self, form):
+        kind = form.cleaned_data['kind']
+        importer = IMPORTERS[kind](customer=self.customer, workers=settings.IMPORT_WORKERS)
+        try:
+            result = importer.import_file(form.cleaned_data['csv_file'])
+        except ValidationError as ex:
+            form.add_error('csv_file', ex)
+            return self.form_invalid(form)
+
+        messages.success(self.request, _('Imported %(count)d %(kind)s.') % {'count': result.created, 'kind': kind})
+        return super().form_valid(form)
+
+    def get_success_url(self):
+        if self.customer is None:
+            return reverse_lazy('customers_list')
+        return reverse_lazy('customer_detail', kwargs={'pk': self.customer.pk})
@@ -0,0 +1,30 @@
+from django.contrib import admin
+
+from service_manager.mailing.models import QueuedEmail, OutboxEvent
+
+
+@admin.register(QueuedEmail)
+class QueuedEmailAdmin(admin.ModelAdmin):
+    list_display = ('id', 'subject', 'recipients', 'created_on', 'sent_on', 'attempts',)
+    list_filter = ('sent_on',)
+    search_fields = ('subject',)
+    date_hierarchy = 'created_on'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task_name', 'kwargs', 'created_on', 'published_on',)
+    list_filter = ('task_name', 'published_on',)
+    date_hierarchy = 'created_on'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,153 @@
+import logging
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+
+from service_manager.mailing.models import QueuedEmail
+
+logger = logging.getLogger('service_manager.mailing')
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_SEND_RATE = 0
+DEFAULT_FLUSH_DELAY = 5
+
+FLUSH_SCHEDULED_KEY = 'mailing:flush_scheduled'
+
+
+def queue_email(subject, recipient_list, message='', html_message=None, from_email=None):
+    """
+    Queue the email, it is sent with the next batch shortly after the current transaction is committed.
+    Takes the arguments of django.core.mail.send_mail.
+    """
+    queued_email = QueuedEmail.objects.create(
+        subject=subject[:QueuedEmail.SUBJECT_MAX_LENGTH],
+        body=message or '',
+        html_body=html_message or '',
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipient_list),
+    )
+    transaction.on_commit(schedule_flush)
+    return queued_email
+
+
+def schedule_flush():
+    """
+    Start sending the queue after a short delay, so a burst of emails goes out in a few batches.
+    Only one flush is scheduled at a time, as long as the processes share the cache.
+    The emails which are left behind (e.g. the broker is down) are sent by the periodic sweep (EMAIL_SWEEP_INTERVAL).
+    """
+    from service_manager.mailing.tasks import send_queued_emails
+
+    delay = getattr(settings, 'EMAIL_FLUSH_DELAY', DEFAULT_FLUSH_DELAY)
+    if not cache.add(FLUSH_SCHEDULED_KEY, True, timeout=delay + 60):
+        return
+    try:
+        send_queued_emails.apply_async(countdown=delay)
+    except Exception:
+        # The next email schedules a flush again, the sweep sends this one meanwhile
+        cache.delete(FLUSH_SCHEDULED_KEY)
+        logger.exception('Scheduling the email flush failed')
+
+
+@dataclass
+class BatchReport:
+    sent: int
+    failed: int
+    seconds: float
+    disconnected: bool = False
+
+
+class EmailDispatcher:
+    """
+    Sends the queued emails in batches over a single SMTP connection, at most `rate` emails per second (0 for no limit).
+    Several dispatchers can run at the same time, on PostgreSQL each one locks the batch it sends.
+    """
+
+    def __init__(self, batch_size=None, rate=None, connection=None):
+        self.batch_size = batch_size or getattr(settings, 'EMAIL_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+        self.rate = rate if rate is not None else getattr(settings, 'EMAIL_SEND_RATE', DEFAULT_SEND_RATE)
+        self.connection = connection
+
+    def send_pending(self, limit=None):
+        """
+        Send the pending emails (at most `limit`) and return a report per batch.
+        """
+        reports = []
+        connection = self.connection or get_connection()
+        connection.open()
+        try:
+            started = time.monotonic()
+            sent_count = 0
+            # The failed emails are retried by the next run, not again by this one
+            last_pk = 0
+            while limit is None or sent_count < limit:
+                batch_size = self.batch_size if limit is None else min(self.batch_size, limit - sent_count)
+                report, last_pk = self.__send_batch(connection, batch_size, last_pk)
+                if report is None:
+                    break
+
+                reports.append(report)
+                if report.disconnected:
+                    break
+                sent_count += report.sent + report.failed
+                self.__throttle(started, sent_count)
+        finally:
+            connection.close()
+        return reports
+
+    @transaction.atomic
+    def __send_batch(self, connection, batch_size, last_pk):
+        queryset = QueuedEmail.objects.pending().filter(pk__gt=last_pk)
+        if db_connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        batch = list(queryset[:batch_size])
+        if not batch:
+            return None, last_pk
+
+        started = time.monotonic()
+        sent = []
+        failed = []
+        disconnected = False
+        for queued_email in batch:
+            queued_email.attempts += 1
+            try:
+                connection.send_messages([queued_email.to_message(connection)])
+            except Exception as ex:
+                queued_email.last_error = repr(ex)
+                failed.append(queued_email)
+                # Start over with a new connection, in case the error closed this one
+                if not self.__reconnect(connection):
+                    disconnected = True
+                    break
+            else:
+                queued_email.sent_on = timezone.now()
+                sent.append(queued_email)
+
+        QueuedEmail.objects.bulk_update(sent + failed, ['attempts', 'sent_on', 'last_error'])
+
+        report = BatchReport(sent=len(sent), failed=len(failed), seconds=time.monotonic() - started,
+                             disconnected=disconnected)
+        logger.info('Sent %d of %d emails in %.3fs', report.sent, len(batch), report.seconds)
+        return report, batch[-1].pk
+
+    @staticmethod
+    def __reconnect(connection):
+        connection.close()
+        try:
+            connection.open()
+        except Exception:
+            logger.exception('Could not reconnect to the email server')
+            return False
+        return True
+
+    def __throttle(self, started, sent_count):
+        if not self.rate:
+            return
+        wait = sent_count / self.rate - (time.monotonic() - started)
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management import BaseCommand
+from django.db import close_old_connections
+
+from service_manager.mailing.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = 'Publish the pending outbox events to Celery, once or every --interval seconds'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='Keep draining with this many seconds in between')
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        while True:
+            published_count = drain_outbox()
+            if published_count or not interval:
+                self.stdout.write(f'Published {published_count} tasks')
+            if not interval:
+                return
+
+            close_old_connections()
+            time.sleep(interval)
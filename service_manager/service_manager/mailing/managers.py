@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.db import models
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+class QueuedEmailQuerySet(models.QuerySet):
+    def pending(self):
+        """
+        Emails which are not sent yet and have attempts left, oldest first.
+        """
+        max_attempts = getattr(settings, 'EMAIL_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+        return self.filter(sent_on__isnull=True, attempts__lt=max_attempts).order_by('pk')
+
+
+class QueuedEmailManager(models.Manager):
+    def get_queryset(self):
+        return QueuedEmailQuerySet(self.model, using=self._db)
+
+    def pending(self):
+        return self.get_queryset().pending()
+
+
+class OutboxEventQuerySet(models.QuerySet):
+    def pending(self):
+        return self.filter(published_on__isnull=True).order_by('pk')
+
+
+class OutboxEventManager(models.Manager):
+    def get_queryset(self):
+        return OutboxEventQuerySet(self.model, using=self._db)
+
+    def pending(self):
+        return self.get_queryset().pending()
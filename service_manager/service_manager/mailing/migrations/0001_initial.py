@@ -0,0 +1,33 @@
+# Generated by Django 4.1.1 on 2026-10-18 21:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255, verbose_name='subject')),
+                ('body', models.TextField(blank=True, verbose_name='body')),
+                ('html_body', models.TextField(blank=True, verbose_name='html_body')),
+                ('from_email', models.CharField(blank=True, max_length=254, verbose_name='from_email')),
+                ('recipients', models.JSONField(verbose_name='recipients')),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('sent_on', models.DateTimeField(blank=True, null=True, verbose_name='sent_on')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='attempts')),
+                ('last_error', models.TextField(blank=True, verbose_name='last_error')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='queuedemail',
+            index=models.Index(condition=models.Q(('sent_on__isnull', True)), fields=['id'], name='queued_email_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.1.1 on 2026-10-18 21:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mailing', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_name', models.CharField(max_length=255, verbose_name='task_name')),
+                ('kwargs', models.JSONField(default=dict, verbose_name='kwargs')),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('published_on', models.DateTimeField(blank=True, null=True, verbose_name='published_on')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='outboxevent',
+            index=models.Index(condition=models.Q(('published_on__isnull', True)), fields=['id'], name='outbox_event_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,117 @@
+from django.core.mail import EmailMultiAlternatives
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from service_manager.mailing.managers import QueuedEmailManager, OutboxEventManager
+
+
+class QueuedEmail(models.Model):
+    """
+    Outgoing email, waiting to be sent with the next batch (see mailing/dispatch.py).
+    """
+    SUBJECT_MAX_LENGTH = 255
+    FROM_EMAIL_MAX_LENGTH = 254
+
+    subject = models.CharField(
+        _('subject'),
+        max_length=SUBJECT_MAX_LENGTH,
+    )
+
+    body = models.TextField(
+        _('body'),
+        blank=True,
+    )
+
+    html_body = models.TextField(
+        _('html_body'),
+        blank=True,
+    )
+
+    from_email = models.CharField(
+        _('from_email'),
+        max_length=FROM_EMAIL_MAX_LENGTH,
+        blank=True,
+    )
+
+    recipients = models.JSONField(
+        _('recipients'),
+    )
+
+    created_on = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    sent_on = models.DateTimeField(
+        _('sent_on'),
+        null=True,
+        blank=True,
+    )
+
+    attempts = models.PositiveIntegerField(
+        _('attempts'),
+        default=0,
+    )
+
+    last_error = models.TextField(
+        _('last_error'),
+        blank=True,
+    )
+
+    objects = QueuedEmailManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(sent_on__isnull=True), name='queued_email_pending_idx'),
+        ]
+
+    def to_message(self, connection=None):
+        message = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email or None,
+            to=self.recipients,
+            connection=connection,
+        )
+        if self.html_body:
+            message.attach_alternative(self.html_body, 'text/html')
+        return message
+
+    def __str__(self):
+        return self.subject
+
+
+class OutboxEvent(models.Model):
+    """
+    Celery task to run once the transaction which wrote the event is committed (see mailing/outbox.py).
+    """
+    TASK_NAME_MAX_LENGTH = 255
+
+    task_name = models.CharField(
+        _('task_name'),
+        max_length=TASK_NAME_MAX_LENGTH,
+    )
+
+    kwargs = models.JSONField(
+        _('kwargs'),
+        default=dict,
+    )
+
+    created_on = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    published_on = models.DateTimeField(
+        _('published_on'),
+        null=True,
+        blank=True,
+    )
+
+    objects = OutboxEventManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(published_on__isnull=True), name='outbox_event_pending_idx'),
+        ]
+
+    def __str__(self):
+        return self.task_name
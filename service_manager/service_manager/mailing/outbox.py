@@ -0,0 +1,56 @@
+import json
+import logging
+
+from celery import current_app
+from django.conf import settings
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+
+from service_manager.mailing.models import OutboxEvent
+
+logger = logging.getLogger('service_manager.mailing')
+
+DEFAULT_DRAIN_BATCH_SIZE = 500
+
+
+def publish(task, **kwargs):
+    """
+    Run the Celery task with the keyword arguments after the current transaction is committed.
+    The event is written in the same transaction, so it is lost only if the transaction is rolled back,
+    and the request doesn't talk to the broker. drain_outbox() publishes it to Celery.
+    """
+    return OutboxEvent.objects.create(task_name=task.name, kwargs=kwargs)
+
+
+def drain_outbox(app=None, batch_size=None):
+    """
+    Publish the pending events to Celery over one broker connection and return the number of published tasks.
+    The same task with the same arguments is published once per batch, however many events asked for it.
+    A failure while publishing leaves the batch pending, so a task may be published more than once.
+    """
+    app = app or current_app
+    batch_size = batch_size or getattr(settings, 'OUTBOX_DRAIN_BATCH_SIZE', DEFAULT_DRAIN_BATCH_SIZE)
+
+    published_count = 0
+    while True:
+        with transaction.atomic():
+            queryset = OutboxEvent.objects.pending()
+            if db_connection.features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True)
+            events = list(queryset[:batch_size])
+            if not events:
+                return published_count
+
+            tasks = {}
+            for event in events:
+                key = (event.task_name, json.dumps(event.kwargs, sort_keys=True))
+                tasks.setdefault(key, event)
+
+            with app.producer_or_acquire() as producer:
+                for event in tasks.values():
+                    app.send_task(event.task_name, kwargs=event.kwargs, producer=producer)
+
+            OutboxEvent.objects.filter(pk__in=[x.pk for x in events]).update(published_on=timezone.now())
+
+        logger.info('Published %d tasks for %d outbox events', len(tasks), len(events))
+        published_count += len(tasks)
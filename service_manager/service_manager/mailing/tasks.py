@@ -0,0 +1,28 @@
+from celery import shared_task
+from django.core.cache import cache
+
+from service_manager.mailing.dispatch import EmailDispatcher, FLUSH_SCHEDULED_KEY, schedule_flush
+from service_manager.mailing.outbox import drain_outbox
+
+
+@shared_task
+def send_queued_emails():
+    # Emails queued from now on schedule the next flush
+    cache.delete(FLUSH_SCHEDULED_KEY)
+
+    reports = EmailDispatcher().send_pending()
+    failed = sum(x.failed for x in reports)
+    if failed:
+        schedule_flush()
+
+    return {
+        'batches': len(reports),
+        'sent': sum(x.sent for x in reports),
+        'failed': failed,
+        'seconds': sum(x.seconds for x in reports),
+    }
+
+
+@shared_task
+def publish_outbox_events():
+    return drain_outbox()
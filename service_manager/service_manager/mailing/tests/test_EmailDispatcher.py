@@ -0,0 +1,86 @@
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from service_manager.core.testing import SMTPSink
+from service_manager.mailing.dispatch import EmailDispatcher, FLUSH_SCHEDULED_KEY, queue_email, schedule_flush
+from service_manager.mailing.models import QueuedEmail
+from service_manager.mailing.tasks import send_queued_emails
+
+
+class EmailDispatcherTests(TestCase):
+    def __queue(self, count):
+        for i in range(count):
+            queue_email(
+                subject=f'Order {i}',
+                message=f'Order {i} is accepted',
+                html_message=f'<p>Order {i} is accepted</p>',
+                from_email='service@manager.com',
+                recipient_list=[f'customer{i}@testing.com'],
+            )
+
+    def test_send_pending__expect_sent_in_batches(self):
+        self.__queue(5)
+
+        reports = EmailDispatcher(batch_size=2, rate=0).send_pending()
+
+        self.assertEqual([2, 2, 1], [x.sent for x in reports])
+        self.assertEqual(5, len(mail.outbox))
+        self.assertEqual(['customer0@testing.com'], mail.outbox[0].to)
+        self.assertEqual([('<p>Order 0 is accepted</p>', 'text/html')], mail.outbox[0].alternatives)
+        self.assertFalse(QueuedEmail.objects.pending().exists())
+
+    def test_send_pending__when_limit_is_given__expect_rest_left_pending(self):
+        self.__queue(3)
+
+        reports = EmailDispatcher(batch_size=10, rate=0).send_pending(limit=2)
+
+        self.assertEqual(2, sum(x.sent for x in reports))
+        self.assertEqual(1, QueuedEmail.objects.pending().count())
+
+    def test_schedule_flush__when_broker_is_unavailable__expect_next_flush_not_blocked(self):
+        cache.delete(FLUSH_SCHEDULED_KEY)
+
+        with mock.patch.object(send_queued_emails, 'apply_async', side_effect=OSError('Connection refused')), \
+                self.assertLogs('service_manager.mailing', 'ERROR'):
+            schedule_flush()
+
+        self.assertIsNone(cache.get(FLUSH_SCHEDULED_KEY))
+
+    def test_send_pending__when_nothing_is_queued__expect_no_batches(self):
+        self.assertEqual([], EmailDispatcher().send_pending())
+
+    def test_send_pending__when_sending_fails__expect_retried_until_max_attempts(self):
+        self.__queue(1)
+        QueuedEmail.objects.update(recipients=['not an email\nheader'])
+
+        with override_settings(EMAIL_MAX_ATTEMPTS=2):
+            for _ in range(3):
+                EmailDispatcher(rate=0).send_pending()
+
+            queued_email = QueuedEmail.objects.get()
+            self.assertEqual(2, queued_email.attempts)
+            self.assertIsNone(queued_email.sent_on)
+            self.assertNotEqual('', queued_email.last_error)
+            self.assertFalse(QueuedEmail.objects.pending().exists())
+
+    def test_send_pending__when_smtp_server_is_used__expect_one_connection(self):
+        self.__queue(5)
+
+        with SMTPSink() as sink, override_settings(
+                EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+                EMAIL_HOST=sink.host,
+                EMAIL_PORT=sink.port,
+                EMAIL_HOST_USER='',
+                EMAIL_HOST_PASSWORD='',
+                EMAIL_USE_SSL=False,
+                EMAIL_USE_TLS=False,
+        ):
+            reports = EmailDispatcher(batch_size=2, rate=0).send_pending()
+
+        self.assertEqual(5, sum(x.sent for x in reports))
+        self.assertEqual(5, len(sink.messages))
+        self.assertIn('Subject: Order 0', sink.messages[0])
+        self.assertEqual(1, sink.connections_count)
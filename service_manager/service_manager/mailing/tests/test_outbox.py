@@ -0,0 +1,74 @@
+from celery import Celery
+from django.db import transaction
+from django.test import TestCase
+
+from service_manager.customers.models import Customer, CustomerAsset
+from service_manager.mailing.models import OutboxEvent
+from service_manager.mailing.outbox import drain_outbox, publish
+from service_manager.main.models import ServiceOrderHeader
+from service_manager.main.tasks import send_successful_service_order_creation_email, send_contact_us_email
+from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        # Celery's in-memory transport instead of a broker
+        self.app = Celery('outbox_tests', broker='memory://', set_as_current=False)
+
+        customer = Customer.objects.create(
+            type=CustomerType.objects.create(name='Business'),
+            name='Testing Inc.',
+            vat='123444121',
+            email_address='testing@inc.com',
+            phone_number='100921122',
+        )
+        self.customer_asset = CustomerAsset.objects.create(
+            customer=customer,
+            asset=Asset.objects.create(
+                category=AssetCategory.objects.create(name='Monitor'),
+                brand=Brand.objects.create(name='Apple'),
+                model_name='iPhone',
+                model_number='13 Pro',
+            ),
+            serial_number='SN-Apple-21',
+            product_number='California-PN_33',
+        )
+
+    def __create_service_order(self):
+        return ServiceOrderHeader.objects.create(
+            customer=self.customer_asset.customer,
+            customer_asset=self.customer_asset,
+            problem_description='Broken screen',
+        )
+
+    def test_create_service_order__expect_notification_event_written(self):
+        service_order = self.__create_service_order()
+
+        event = OutboxEvent.objects.pending().get(task_name=send_successful_service_order_creation_email.name)
+        self.assertEqual(send_successful_service_order_creation_email.name, event.task_name)
+        self.assertEqual({'service_order_id': service_order.pk}, event.kwargs)
+
+    def test_create_service_order__when_transaction_is_rolled_back__expect_no_event(self):
+        try:
+            with transaction.atomic():
+                self.__create_service_order()
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_drain_outbox__expect_pending_events_published_once(self):
+        self.__create_service_order()
+        self.__create_service_order()
+        publish(send_contact_us_email, email_data={'message': 'Hello'})
+        publish(send_contact_us_email, email_data={'message': 'Hello'})
+        # The rebuilds of the daily facts the orders published as well are covered by the reports tests
+        OutboxEvent.objects.exclude(task_name__in=[send_successful_service_order_creation_email.name,
+                                                   send_contact_us_email.name]).delete()
+
+        published_count = drain_outbox(app=self.app, batch_size=2)
+
+        self.assertEqual(3, published_count)
+        self.assertFalse(OutboxEvent.objects.pending().exists())
+        self.assertEqual(0, drain_outbox(app=self.app))
@@ -1,9 +1,7 @@
 from django.contrib import admin
-from django.db.models import Count, Q, Sum
 from django.urls import reverse_lazy
 from django.utils.html import format_html
 
-from service_manager.customers.models import CustomerAsset
 from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail
 
 
@@ -18,45 +16,38 @@ class ServiceOrderHeaderAdmin(admin.ModelAdmin):
      - custom calculated field
      - custom link field
     """
-    list_display = ['customer', 'customer_asset', 'department', 'is_serviced', 'active', 'is_completed', 'total_amount_due',
+    list_display = ['customer', 'customer_asset', 'department', 'is_serviced', 'active', 'is_completed', 'get_total_amount_due',
                     'get_customer_asset_number_of_times_serviced', 'get_customer_asset_lifetime_revenue',
                     'open_service_order_details_page', ]
     list_filter = ['created_on', 'accepted_by', 'active', 'is_serviced', 'is_completed', ]
     search_fields = ['customer__name__icontains', ]
     ordering = ['-created_on',]
+    list_select_related = ['customer', 'customer_asset__customer', 'customer_asset__asset__brand',
+                           'customer_asset__asset__category', 'department', ]
 
-    def get_customer_asset_number_of_times_serviced(self, obj):
+    def get_queryset(self, request):
         """
-        Calculate the number of times an order has been completed (serviced and finalized) for the given customer asset.
-        Exclude soft deleted records (active must == True).
+        The customer asset columns are calculated with subqueries, in the same query as the page.
         """
-        customer_asset = CustomerAsset.objects.get(pk=obj.customer_asset.pk)
-        service_orders = ServiceOrderHeader.objects.filter(
-            Q(customer_asset_id=customer_asset)
-            & Q(is_completed=True)
-            & Q(active=True)).aggregate(Count('pk'))
+        return super().get_queryset(request).with_customer_asset_statistics()
 
-        if service_orders:
-            return service_orders['pk__count']
-        else:
-            return 0
+    def get_customer_asset_number_of_times_serviced(self, obj):
+        """
+        The number of times an order has been completed (serviced and finalized) for the given customer asset.
+        Soft deleted records are excluded (active must == True).
+        """
+        return obj.customer_asset_times_serviced
 
     def get_customer_asset_lifetime_revenue(self, obj):
         """
-        Calculate total lifetime revenue for a given Customer asset.
+        Total lifetime revenue for a given Customer asset.
         The Service order header must be completed (Serviced and Finalized), both Service order header and detail
         should be active (not soft deleted).
         """
-        customer_asset = CustomerAsset.objects.get(pk=obj.customer_asset.pk)
-        service_orders = ServiceOrderHeader.objects.prefetch_related('serviceorderdetail_set').filter(
-            Q(customer_asset_id=customer_asset)
-            & Q(is_completed=True)
-            & Q(active=True)
-            & Q(serviceorderdetail__active=True)
-        )
+        return f'{obj.customer_asset_lifetime_revenue:.2f}'
 
-        total_amount_due = sum(float(x.total_amount_due) for x in service_orders)
-        return total_amount_due
+    def get_total_amount_due(self, obj):
+        return obj.total_amount_due
 
     def open_service_order_details_page(self, obj):
         """
@@ -65,8 +56,12 @@ class ServiceOrderHeaderAdmin(admin.ModelAdmin):
         order_path = reverse_lazy('detail_service_order', kwargs={'pk': obj.id})
         return format_html('<a href="{}" target="blank">Details</a>', order_path)
 
+    get_total_amount_due.short_description = 'Total amount due'
+    get_total_amount_due.admin_order_field = 'total_amount'
     get_customer_asset_lifetime_revenue.short_description = 'Asset Lifetime Revenue'
+    get_customer_asset_lifetime_revenue.admin_order_field = 'customer_asset_lifetime_revenue'
     get_customer_asset_number_of_times_serviced.short_description = 'Times serviced'
+    get_customer_asset_number_of_times_serviced.admin_order_field = 'customer_asset_times_serviced'
     open_service_order_details_page.short_description = 'Order Details'
 
 
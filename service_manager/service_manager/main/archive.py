@@ -0,0 +1,109 @@
+import datetime
+import logging
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from service_manager.core import fragment_cache
+from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail, ServiceOrderNote, \
+    ArchivedServiceOrderHeader, ArchivedServiceOrderDetail, ArchivedServiceOrderNote
+
+logger = logging.getLogger('service_manager.main')
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_DELETED_AFTER_DAYS = 30
+DEFAULT_COMPLETED_AFTER_DAYS = 2 * 365
+
+# (model, archive model) in the order the rows are copied, the archived rows keep their ids
+ARCHIVED_MODELS = (
+    (ServiceOrderHeader, ArchivedServiceOrderHeader),
+    (ServiceOrderDetail, ArchivedServiceOrderDetail),
+    (ServiceOrderNote, ArchivedServiceOrderNote),
+)
+
+
+def copy_row(obj, archive_model):
+    return archive_model(**{field.attname: getattr(obj, field.attname)
+                            for field in archive_model._meta.concrete_fields if hasattr(obj, field.attname)})
+
+
+@dataclass
+class ArchiveResult:
+    orders: int = 0
+    details: int = 0
+    notes: int = 0
+    seconds: float = 0
+
+
+class ServiceOrderArchiver:
+    """
+    Moves the service orders which are soft deleted for `deleted_after_days` or completed for
+    `completed_after_days`, together with their detail lines and notes, to the archive tables.
+    Every batch is copied and deleted in one transaction, so the rows are always in exactly one of the tables.
+    The rows are deleted without post_delete: the totals and the report facts don't change,
+    the reports, the admin statistics and the API (archived_service_orders/) read the archived orders as well.
+    """
+
+    def __init__(self, batch_size=None, deleted_after_days=None, completed_after_days=None):
+        self.batch_size = batch_size or getattr(settings, 'ARCHIVE_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+        self.deleted_after_days = deleted_after_days if deleted_after_days is not None \
+            else getattr(settings, 'ARCHIVE_DELETED_AFTER_DAYS', DEFAULT_DELETED_AFTER_DAYS)
+        self.completed_after_days = completed_after_days if completed_after_days is not None \
+            else getattr(settings, 'ARCHIVE_COMPLETED_AFTER_DAYS', DEFAULT_COMPLETED_AFTER_DAYS)
+
+    def get_queryset(self, now=None):
+        """
+        The service orders which are due to be archived.
+        """
+        now = now or timezone.now()
+        deleted_before = now - datetime.timedelta(days=self.deleted_after_days)
+        completed_before = now - datetime.timedelta(days=self.completed_after_days)
+        return ServiceOrderHeader.all_records.filter(
+            Q(active=False, updated_on__lt=deleted_before) | Q(is_completed=True, completed_on__lt=completed_before)
+        )
+
+    def archive(self, limit=None):
+        """
+        Archive the due service orders (at most `limit`) and return the number of archived rows.
+        """
+        started = time.monotonic()
+        result = ArchiveResult()
+        now = timezone.now()
+        while limit is None or result.orders < limit:
+            batch_size = self.batch_size if limit is None else min(self.batch_size, limit - result.orders)
+            (orders, details, notes) = self.__archive_batch(now, batch_size)
+            if not orders:
+                break
+
+            result.orders += orders
+            result.details += details
+            result.notes += notes
+
+        result.seconds = time.monotonic() - started
+        logger.info('Archived %d service orders, %d detail lines and %d notes in %.3fs',
+                    result.orders, result.details, result.notes, result.seconds)
+        return result
+
+    @transaction.atomic
+    def __archive_batch(self, now, batch_size):
+        queryset = self.get_queryset(now).order_by('pk')
+        # The orders are locked until they are moved, so they can't be restored or edited meanwhile
+        service_order_ids = list(queryset.select_for_update().values_list('pk', flat=True)[:batch_size])
+        if not service_order_ids:
+            return 0, 0, 0
+
+        querysets = []
+        for (model, archive_model) in ARCHIVED_MODELS:
+            lookup = 'pk__in' if model is ServiceOrderHeader else 'service_order_id__in'
+            rows = model.all_records.filter(**{lookup: service_order_ids})
+            archive_model.objects.bulk_create(copy_row(obj, archive_model) for obj in rows)
+            querysets.append(rows)
+
+        # The detail lines and the notes first, they point to the orders
+        counts = {rows.model: rows._raw_delete(rows.db) for rows in reversed(querysets)}
+        fragment_cache.invalidate(ServiceOrderHeader, *service_order_ids)
+        return counts[ServiceOrderHeader], counts[ServiceOrderDetail], counts[ServiceOrderNote]
@@ -1,8 +1,10 @@
 from django import forms
+from django.utils.translation import gettext_lazy as _
 
 from service_manager.core.forms import BootstrapFormMixin
 from service_manager.customers.models import Customer, CustomerAsset, CustomerRepresentative, CustomerDepartment
 from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail, ServiceOrderNote
+from service_manager.master_data.models import Material
 
 
 class CreateServiceOrderHeaderForm(BootstrapFormMixin, forms.ModelForm):
@@ -33,6 +35,12 @@ class EditServiceOrderDetailForm(BootstrapFormMixin, forms.ModelForm):
         model = ServiceOrderDetail
         fields = ('material', 'quantity', 'discount')
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # The choices show the category of every material
+        self.fields['material'].queryset = Material.objects.select_related('category')
+
 
 class CreateServiceOrderDetailForm(BootstrapFormMixin, forms.ModelForm):
     class Meta:
@@ -42,10 +50,82 @@ class CreateServiceOrderDetailForm(BootstrapFormMixin, forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        # The choices show the category of every material
+        self.fields['material'].queryset = Material.objects.select_related('category')
         self.fields['quantity'].initial = 1
         self.fields['discount'].initial = 0
 
 
+class MaterialChoiceField(forms.ModelChoiceField):
+    """
+    Choice of the materials loaded up front, so the lines of a batch entry share them
+    instead of querying the materials once per line to render and validate it.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(queryset=Material.objects.none(), **kwargs)
+        self.materials = {}
+
+    def set_materials(self, materials):
+        self.materials = materials
+        self.choices = [('', self.empty_label)] + [(pk, self.label_from_instance(x)) for (pk, x) in materials.items()]
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            return self.materials[int(value)]
+        except (KeyError, TypeError, ValueError):
+            raise forms.ValidationError(self.error_messages['invalid_choice'], code='invalid_choice',
+                                        params={'value': value})
+
+
+class ServiceOrderDetailLineForm(BootstrapFormMixin, forms.Form):
+    material = MaterialChoiceField(label=_('Material'))
+    quantity = forms.FloatField(label=_('Quantity'), initial=1)
+    discount = forms.FloatField(label=_('Discount'), initial=0)
+
+    def __init__(self, *args, materials, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['material'].set_materials(materials)
+
+    def to_instance(self, service_order_header):
+        return ServiceOrderDetail(service_order=service_order_header, **self.cleaned_data)
+
+
+class BaseServiceOrderDetailLinesFormSet(forms.BaseFormSet):
+    """
+    Detail lines entered together, the lines left empty are skipped.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.materials = {x.pk: x for x in Material.objects.select_related('category').order_by('name')}
+
+    def get_form_kwargs(self, index):
+        kwargs = super().get_form_kwargs(index)
+        kwargs['materials'] = self.materials
+        return kwargs
+
+    def clean(self):
+        super().clean()
+        if not any(form.has_changed() for form in self.forms):
+            raise forms.ValidationError(_('Enter at least one line.'))
+
+    def to_instances(self, service_order_header):
+        return [form.to_instance(service_order_header) for form in self.forms if form.has_changed()]
+
+
+ServiceOrderDetailLinesFormSet = forms.formset_factory(
+    ServiceOrderDetailLineForm,
+    formset=BaseServiceOrderDetailLinesFormSet,
+    extra=5,
+    max_num=50,
+    absolute_max=50,
+    validate_max=True,
+)
+
+
 class CreateServiceOrderNoteForm(BootstrapFormMixin, forms.ModelForm):
     class Meta:
         model = ServiceOrderNote
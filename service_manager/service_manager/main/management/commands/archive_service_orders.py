@@ -0,0 +1,25 @@
+from django.core.management import BaseCommand
+
+from service_manager.main.archive import ServiceOrderArchiver
+
+
+class Command(BaseCommand):
+    help = 'Move the soft deleted and the long completed service orders to the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Service orders moved per transaction')
+        parser.add_argument('--limit', type=int, help='Archive at most this many service orders')
+        parser.add_argument('--deleted-after-days', type=int,
+                            help='Archive the orders soft deleted at least this many days ago')
+        parser.add_argument('--completed-after-days', type=int,
+                            help='Archive the orders completed at least this many days ago')
+
+    def handle(self, *args, **options):
+        archiver = ServiceOrderArchiver(
+            batch_size=options['batch_size'],
+            deleted_after_days=options['deleted_after_days'],
+            completed_after_days=options['completed_after_days'],
+        )
+        result = archiver.archive(limit=options['limit'])
+        self.stdout.write(f'Archived {result.orders} service orders, {result.details} detail lines '
+                          f'and {result.notes} notes in {result.seconds:.2f}s')
@@ -0,0 +1,26 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from service_manager.main.partitioning import partition_service_order_tables, create_future_partitions
+
+
+class Command(BaseCommand):
+    help = 'Partition the service order tables by month on PostgreSQL and create the partitions of the next months'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, help='Create the partitions of this many months ahead')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        if connections[options['database']].vendor != 'postgresql':
+            raise CommandError('The service order tables can be partitioned only on PostgreSQL')
+        if not settings.SERVICE_ORDER_PARTITIONING:
+            raise CommandError('Set SERVICE_ORDER_PARTITIONING to partition the service order tables')
+
+        tables = partition_service_order_tables(apps, options['database'], options['months_ahead'])
+        for table in tables:
+            self.stdout.write(f'Partitioned {table}')
+        created_count = create_future_partitions(apps, options['database'], options['months_ahead'])
+        self.stdout.write(f'Created {created_count} partitions')
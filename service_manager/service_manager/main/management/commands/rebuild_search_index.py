@@ -0,0 +1,15 @@
+from django.core.management import BaseCommand
+
+from service_manager.core.search import get_search_indexes, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search indexes, e.g. after loading data with raw SQL or fixtures'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        for index in get_search_indexes():
+            rebuild_search_index(index, options['database'])
+            self.stdout.write(f'Rebuilt {index}')
@@ -0,0 +1,137 @@
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from service_manager.customers.managers import ActiveManager, ActiveQuerySet
+
+
+def detail_total_amount_expression(prefix=''):
+    """
+    SQL counterpart of ServiceOrderDetail.total_amount.
+    The discount is applied only when it is positive, the same way the model property does it.
+    """
+    price = F(f'{prefix}material__price')
+    quantity = F(f'{prefix}quantity')
+    discount = F(f'{prefix}discount')
+
+    return Case(
+        When(**{f'{prefix}discount__gt': 0}, then=price * (1 - discount / 100.0) * quantity),
+        default=price * quantity,
+        output_field=FloatField(),
+    )
+
+
+def service_order_total_amount_subquery(order_ref='pk'):
+    """
+    Sum of the active detail lines of the service order referenced by the outer query.
+    """
+    from service_manager.main.models import ServiceOrderDetail
+
+    details = ServiceOrderDetail.all_records.filter(
+        service_order_id=OuterRef(order_ref),
+        active=True,
+    ).order_by().values('service_order_id').annotate(
+        total=Sum(detail_total_amount_expression()),
+    ).values('total')
+
+    return Coalesce(Subquery(details, output_field=FloatField()), Value(0.0))
+
+
+class ServiceOrderHeaderQuerySet(ActiveQuerySet):
+    def with_computed_total_amount(self):
+        """
+        Annotate each order with the total calculated from its detail lines (computed_total_amount).
+        Useful to verify the stored total_amount column.
+        """
+        return self.annotate(computed_total_amount=service_order_total_amount_subquery())
+
+    def refresh_total_amount(self):
+        """
+        Recalculate and store the total amount of every order in the queryset with a single UPDATE.
+        """
+        return self.update(total_amount=service_order_total_amount_subquery())
+
+    def total_amount_sum(self):
+        result = self.aggregate(total_amount_sum=Coalesce(Sum('total_amount'), Value(0.0)))
+        return result['total_amount_sum']
+
+    def with_customer_asset_statistics(self):
+        """
+        Annotate each order with the number of completed orders (customer_asset_times_serviced) and their total
+        amount (customer_asset_lifetime_revenue) for its customer asset. Soft deleted orders are not counted,
+        the archived orders (see main/archive.py) are.
+        """
+        from service_manager.main.models import ArchivedServiceOrderHeader
+
+        def completed_orders(model):
+            return model.all_records.filter(
+                customer_asset_id=OuterRef('customer_asset_id'),
+                is_completed=True,
+                active=True,
+            ).order_by().values('customer_asset_id')
+
+        def times_serviced(model):
+            queryset = completed_orders(model).annotate(times_serviced=Count('pk')).values('times_serviced')
+            return Coalesce(Subquery(queryset, output_field=IntegerField()), Value(0))
+
+        def lifetime_revenue(model):
+            queryset = completed_orders(model).annotate(lifetime_revenue=Sum('total_amount')).values('lifetime_revenue')
+            return Coalesce(Subquery(queryset, output_field=FloatField()), Value(0.0))
+
+        return self.annotate(
+            customer_asset_times_serviced=times_serviced(self.model) + times_serviced(ArchivedServiceOrderHeader),
+            customer_asset_lifetime_revenue=lifetime_revenue(self.model) + lifetime_revenue(ArchivedServiceOrderHeader),
+        )
+
+
+class ServiceOrderHeaderManager(ActiveManager):
+    def get_queryset(self):
+        return ServiceOrderHeaderQuerySet(self.model, using=self._db)
+
+    def with_computed_total_amount(self):
+        return self.get_queryset().with_computed_total_amount()
+
+    def refresh_total_amount(self):
+        return self.get_queryset().refresh_total_amount()
+
+    def total_amount_sum(self):
+        return self.get_queryset().total_amount_sum()
+
+    def with_customer_asset_statistics(self):
+        return self.get_queryset().with_customer_asset_statistics()
+
+
+class ServiceOrderDetailQuerySet(ActiveQuerySet):
+    def delete(self):
+        """
+        Soft delete the detail lines and refresh the totals of the affected service orders.
+        The bulk update does not send post_save, so the totals can't be left to the signals.
+        """
+        from service_manager.main.models import ServiceOrderHeader
+        from service_manager.main.signals import service_order_details_deleted
+
+        service_order_ids = list(self.order_by().values_list('service_order_id', flat=True).distinct())
+        super().delete()
+        ServiceOrderHeader.objects.filter(pk__in=service_order_ids).refresh_total_amount()
+        service_order_details_deleted.send(sender=self.model, service_order_ids=service_order_ids)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Insert the detail lines and refresh the totals of their service orders once, not once per line.
+        The bulk insert does not send post_save, so the totals can't be left to the signals.
+        """
+        from service_manager.main.models import ServiceOrderHeader
+        from service_manager.main.signals import service_order_details_created
+
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            service_order_ids = list({obj.service_order_id for obj in objs})
+            if service_order_ids:
+                ServiceOrderHeader.objects.filter(pk__in=service_order_ids).refresh_total_amount()
+                service_order_details_created.send(sender=self.model, service_order_ids=service_order_ids)
+        return objs
+
+
+class ServiceOrderDetailManager(ActiveManager):
+    def get_queryset(self):
+        return ServiceOrderDetailQuerySet(self.model, using=self._db)
@@ -0,0 +1,49 @@
+# Generated by Django 4.1.1 on 2026-10-18 20:23
+
+from django.db import migrations, models
+from django.db.models import Case, F, FloatField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+
+def calculate_total_amounts(apps, schema_editor):
+    ServiceOrderHeader = apps.get_model("main", "ServiceOrderHeader")
+    ServiceOrderDetail = apps.get_model("main", "ServiceOrderDetail")
+
+    # The discount is applied only when it is positive, like ServiceOrderDetail.total_amount at this point
+    detail_total_amount = Case(
+        When(
+            discount__gt=0,
+            then=F("material__price") * (1 - F("discount") / 100.0) * F("quantity"),
+        ),
+        default=F("material__price") * F("quantity"),
+        output_field=FloatField(),
+    )
+    details = (
+        ServiceOrderDetail.objects.filter(service_order_id=OuterRef("pk"), active=True)
+        .order_by()
+        .values("service_order_id")
+        .annotate(total=Sum(detail_total_amount))
+        .values("total")
+    )
+
+    ServiceOrderHeader.objects.update(
+        total_amount=Coalesce(Subquery(details, output_field=FloatField()), Value(0.0))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0010_alter_serviceorderdetail_discount_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="serviceorderheader",
+            name="total_amount",
+            field=models.FloatField(
+                db_index=True, default=0, editable=False, verbose_name="total_amount"
+            ),
+        ),
+        migrations.RunPython(calculate_total_amounts, migrations.RunPython.noop),
+    ]
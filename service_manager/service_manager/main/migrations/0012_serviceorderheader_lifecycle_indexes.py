@@ -0,0 +1,55 @@
+# Generated by Django 4.1.1 on 2026-10-18 20:38
+
+from django.db import migrations, models
+
+from service_manager.core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("main", "0011_serviceorderheader_total_amount"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="serviceorderheader",
+            index=models.Index(
+                condition=models.Q(("active", True), ("is_serviced", False)),
+                fields=["created_on", "id"],
+                name="soh_pending_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="serviceorderheader",
+            index=models.Index(
+                condition=models.Q(
+                    ("active", True), ("is_completed", False), ("is_serviced", True)
+                ),
+                fields=["serviced_on", "id"],
+                name="soh_serviced_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="serviceorderheader",
+            index=models.Index(
+                condition=models.Q(("is_completed", True)),
+                fields=["completed_on"],
+                name="soh_completed_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="serviceorderheader",
+            index=models.Index(
+                fields=["customer", "is_completed"], name="soh_customer_completed_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="serviceorderheader",
+            index=models.Index(
+                fields=["customer_asset", "-created_on"], name="soh_asset_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 4.1.1 on 2026-10-18 21:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('master_data', '0007_search_indexes'),
+        ('customers', '0010_search_indexes'),
+        ('main', '0012_serviceorderheader_lifecycle_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedServiceOrderHeader',
+            fields=[
+                ('active', models.BooleanField(default=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('created_on', models.DateTimeField()),
+                ('updated_on', models.DateTimeField()),
+                ('archived_on', models.DateTimeField(auto_now_add=True, verbose_name='archived_on')),
+                ('problem_description', models.TextField(verbose_name='problem_description')),
+                ('is_serviced', models.BooleanField(default=False, verbose_name='is_serviced')),
+                ('is_completed', models.BooleanField(default=False, verbose_name='is_completed')),
+                ('serviced_on', models.DateTimeField(blank=True, null=True, verbose_name='serviced_on')),
+                ('completed_on', models.DateTimeField(blank=True, null=True, verbose_name='completed_on')),
+                ('send_emails', models.BooleanField(default=True, verbose_name='send_emails')),
+                ('total_amount', models.FloatField(default=0, verbose_name='total_amount')),
+                ('accepted_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='accepted_by')),
+                ('completed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='completed_by')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='customers.customer', verbose_name='customer')),
+                ('customer_asset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='customers.customerasset', verbose_name='customer_asset')),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='customers.customerdepartment', verbose_name='department')),
+                ('handed_over_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='customers.customerrepresentative', verbose_name='handed_over_by')),
+                ('handed_over_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='customers.customerrepresentative', verbose_name='handed_over_to')),
+                ('serviced_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='serviced_by')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedServiceOrderNote',
+            fields=[
+                ('active', models.BooleanField(default=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('created_on', models.DateTimeField()),
+                ('updated_on', models.DateTimeField()),
+                ('note', models.TextField(verbose_name='note')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='created_by')),
+                ('service_order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='serviceordernote_set', to='main.archivedserviceorderheader', verbose_name='service_order')),
+            ],
+            options={
+                'ordering': ('-created_on',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedServiceOrderDetail',
+            fields=[
+                ('active', models.BooleanField(default=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('created_on', models.DateTimeField()),
+                ('updated_on', models.DateTimeField()),
+                ('quantity', models.FloatField(verbose_name='quantity')),
+                ('discount', models.FloatField(verbose_name='discount')),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='master_data.material', verbose_name='material')),
+                ('service_order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='serviceorderdetail_set', to='main.archivedserviceorderheader', verbose_name='service_order')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from service_manager.main.partitioning import partition_service_order_tables
+
+
+def partition_tables(apps, schema_editor):
+    # Only on PostgreSQL with SERVICE_ORDER_PARTITIONING set, "manage.py partition_service_orders" does it later
+    partition_service_order_tables(apps, schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0013_archived_service_orders"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_tables, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,10 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import Q
 
 from service_manager.accounts.models import Profile, AppUser
 from service_manager.core.models import BaseAuditEntity, ActiveModel
+from service_manager.main.managers import ServiceOrderHeaderManager, ServiceOrderDetailManager
 from service_manager.customers.models import Customer, CustomerAsset, CustomerRepresentative, CustomerDepartment
 from service_manager.master_data.models import CustomerType, Asset, Material
 from django.utils.translation import gettext_lazy as _
@@ -109,9 +111,54 @@ class ServiceOrderHeader(ActiveModel, BaseAuditEntity):
         verbose_name=_('handed_over_to'),
     )
 
+    # Kept up to date by the signals in main/signals.py
+    total_amount = models.FloatField(
+        _('total_amount'),
+        default=0,
+        editable=False,
+        db_index=True,
+    )
+
+    objects = ServiceOrderHeaderManager()
+
+    class Meta:
+        # Matched to the queue, customer and report queries, see main/tests/test_query_plans.py
+        indexes = (
+            models.Index(
+                fields=('created_on', 'id'),
+                condition=Q(active=True, is_serviced=False),
+                name='soh_pending_idx',
+            ),
+            models.Index(
+                fields=('serviced_on', 'id'),
+                condition=Q(active=True, is_serviced=True, is_completed=False),
+                name='soh_serviced_idx',
+            ),
+            models.Index(
+                fields=('completed_on',),
+                condition=Q(is_completed=True),
+                name='soh_completed_idx',
+            ),
+            models.Index(
+                fields=('customer', 'is_completed'),
+                name='soh_customer_completed_idx',
+            ),
+            models.Index(
+                fields=('customer_asset', '-created_on'),
+                name='soh_asset_created_idx',
+            ),
+        )
+
     @property
     def total_amount_due(self):
-        return f'{sum([x.total_amount for x in self.serviceorderdetail_set.all()]):.2f}'
+        return f'{self.total_amount:.2f}'
+
+    def refresh_total_amount(self):
+        """
+        Recalculate the stored total amount from the active detail lines.
+        """
+        ServiceOrderHeader.objects.filter(pk=self.pk).refresh_total_amount()
+        self.refresh_from_db(fields=['total_amount'])
 
     @property
     def status(self):
@@ -144,6 +191,8 @@ class ServiceOrderDetail(ActiveModel, BaseAuditEntity):
         verbose_name=_('material'),
     )
 
+    objects = ServiceOrderDetailManager()
+
     def __str__(self):
         return f'{str(self.service_order)}---{str(self.material)}'
 
@@ -183,3 +232,192 @@ class ServiceOrderNote(ActiveModel, BaseAuditEntity):
 
     class Meta:
         ordering = ('-created_on',)
+
+
+class ArchivedServiceOrderHeader(ActiveModel):
+    """
+    Service order moved out of the main table by main/archive.py, with the same id and values.
+    Its detail lines and notes are archived with it, under the same related names,
+    so the service order page shows it like any other order.
+    """
+    id = models.BigIntegerField(
+        primary_key=True,
+    )
+
+    created_on = models.DateTimeField()
+
+    updated_on = models.DateTimeField()
+
+    archived_on = models.DateTimeField(
+        _('archived_on'),
+        auto_now_add=True,
+    )
+
+    problem_description = models.TextField(
+        _('problem_description'),
+    )
+
+    is_serviced = models.BooleanField(
+        _('is_serviced'),
+        default=False,
+    )
+
+    is_completed = models.BooleanField(
+        _('is_completed'),
+        default=False,
+    )
+
+    serviced_on = models.DateTimeField(
+        _('serviced_on'),
+        null=True,
+        blank=True,
+    )
+
+    completed_on = models.DateTimeField(
+        _('completed_on'),
+        null=True,
+        blank=True,
+    )
+
+    send_emails = models.BooleanField(
+        _('send_emails'),
+        default=True,
+    )
+
+    customer = models.ForeignKey(
+        Customer,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('customer'),
+    )
+
+    customer_asset = models.ForeignKey(
+        CustomerAsset,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('customer_asset'),
+    )
+
+    department = models.ForeignKey(
+        CustomerDepartment,
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name=_('department'),
+    )
+
+    handed_over_by = models.ForeignKey(
+        CustomerRepresentative,
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name=_('handed_over_by'),
+    )
+
+    accepted_by = models.ForeignKey(
+        AppUser,
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name=_('accepted_by'),
+    )
+
+    serviced_by = models.ForeignKey(
+        AppUser,
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name=_('serviced_by'),
+    )
+
+    completed_by = models.ForeignKey(
+        AppUser,
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name=_('completed_by'),
+    )
+
+    handed_over_to = models.ForeignKey(
+        CustomerRepresentative,
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name=_('handed_over_to'),
+    )
+
+    total_amount = models.FloatField(
+        _('total_amount'),
+        default=0,
+    )
+
+    total_amount_due = ServiceOrderHeader.total_amount_due
+    status = ServiceOrderHeader.status
+    __str__ = ServiceOrderHeader.__str__
+
+
+class ArchivedServiceOrderDetail(ActiveModel):
+    id = models.BigIntegerField(
+        primary_key=True,
+    )
+
+    created_on = models.DateTimeField()
+
+    updated_on = models.DateTimeField()
+
+    quantity = models.FloatField(_('quantity'))
+    discount = models.FloatField(_('discount'))
+
+    service_order = models.ForeignKey(
+        ArchivedServiceOrderHeader,
+        on_delete=models.CASCADE,
+        related_name='serviceorderdetail_set',
+        verbose_name=_('service_order'),
+    )
+
+    material = models.ForeignKey(
+        Material,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('material'),
+    )
+
+    discount_percentage = ServiceOrderDetail.discount_percentage
+    discounted_price = ServiceOrderDetail.discounted_price
+    total_amount = ServiceOrderDetail.total_amount
+    __str__ = ServiceOrderDetail.__str__
+
+
+class ArchivedServiceOrderNote(ActiveModel):
+    id = models.BigIntegerField(
+        primary_key=True,
+    )
+
+    created_on = models.DateTimeField()
+
+    updated_on = models.DateTimeField()
+
+    note = models.TextField(_('note'))
+
+    created_by = models.ForeignKey(
+        AppUser,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('created_by'),
+    )
+
+    service_order = models.ForeignKey(
+        ArchivedServiceOrderHeader,
+        on_delete=models.CASCADE,
+        related_name='serviceordernote_set',
+        verbose_name=_('service_order'),
+    )
+
+    class Meta:
+        ordering = ('-created_on',)
@@ -0,0 +1,201 @@
+import datetime
+import logging
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger('service_manager.main')
+
+DEFAULT_MONTHS_AHEAD = 3
+
+# The tables are partitioned by month of this column, which is set once when the row is inserted
+PARTITION_KEY = 'created_on'
+
+PARTITIONED_MODELS = ('main.ServiceOrderHeader', 'main.ServiceOrderDetail', 'main.ServiceOrderNote')
+
+
+def month_start(value):
+    return datetime.datetime(value.year, value.month, 1, tzinfo=datetime.timezone.utc)
+
+
+def next_month(month):
+    return month_start(month + datetime.timedelta(days=32))
+
+
+def months_between(first, last):
+    """
+    The first days of the months from the month of `first` to the month of `last`.
+    """
+    months = []
+    month = month_start(first)
+    while month <= last:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def last_partition_month(months_ahead):
+    """
+    The first day of the month `months_ahead` months from now, the last month which gets a partition.
+    """
+    month = month_start(datetime.datetime.now(datetime.timezone.utc))
+    for _ in range(months_ahead):
+        month = next_month(month)
+    return month
+
+
+def get_months_ahead(months_ahead=None):
+    if months_ahead is not None:
+        return months_ahead
+    return getattr(settings, 'PARTITION_MONTHS_AHEAD', DEFAULT_MONTHS_AHEAD)
+
+
+def partition_name(table, month):
+    return f'{table}_p{month:%Y%m}'
+
+
+def default_partition_name(table):
+    return f'{table}_pdefault'
+
+
+def is_partitioned(connection, table):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)',
+            [connection.ops.quote_name(table)],
+        )
+        return cursor.fetchone() is not None
+
+
+def partitioned_tables(apps, connection):
+    """
+    The tables of PARTITIONED_MODELS which are partitioned already, always empty on the other databases.
+    """
+    if connection.vendor != 'postgresql':
+        return []
+    tables = [apps.get_model(label)._meta.db_table for label in PARTITIONED_MODELS]
+    return [table for table in tables if is_partitioned(connection, table)]
+
+
+def create_partition(connection, table, month):
+    """
+    Add the partition of the month to the table, unless it exists.
+    The rows of the month which went to the default partition meanwhile are moved to it.
+    """
+    name = partition_name(table, month)
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s)', [quote_name(name)])
+        if cursor.fetchone()[0] is not None:
+            return False
+
+        bounds = [month, next_month(month)]
+        cursor.execute(f'CREATE TABLE {quote_name(name)} '
+                       f'(LIKE {quote_name(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {quote_name(default_partition_name(table))} '
+            f'WHERE {quote_name(PARTITION_KEY)} >= %s AND {quote_name(PARTITION_KEY)} < %s RETURNING *) '
+            f'INSERT INTO {quote_name(name)} SELECT * FROM moved',
+            bounds,
+        )
+        # The partition gets the indexes and the foreign keys of the table when it is attached
+        cursor.execute(f'ALTER TABLE {quote_name(table)} ATTACH PARTITION {quote_name(name)} '
+                       f'FOR VALUES FROM (%s) TO (%s)', bounds)
+    logger.info('Created partition %s', name)
+    return True
+
+
+def partition_table(connection, table, months_ahead):
+    """
+    Replace the table with one partitioned by month of PARTITION_KEY and copy the rows over.
+    The indexes and the foreign keys are created again, except the foreign keys to the other partitioned tables:
+    PostgreSQL can't reference a partitioned table by the id alone, as the primary key includes PARTITION_KEY.
+    """
+    quote_name = connection.ops.quote_name
+    unpartitioned = f'{table}_unpartitioned'
+    sequence = f'{table}_id_partitioned_seq'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname NOT IN "
+            "(SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u'))",
+            [table, quote_name(table)],
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype = 'f' "
+            "AND confrelid NOT IN (SELECT partrelid FROM pg_partitioned_table)",
+            [quote_name(table)],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f'SELECT MIN({quote_name(PARTITION_KEY)}), MAX(id) FROM {quote_name(table)}')
+        (first_created_on, last_id) = cursor.fetchone()
+
+        cursor.execute(f'ALTER TABLE {quote_name(table)} RENAME TO {quote_name(unpartitioned)}')
+        cursor.execute(f'CREATE TABLE {quote_name(table)} (LIKE {quote_name(unpartitioned)} '
+                       f'INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE) '
+                       f'PARTITION BY RANGE ({quote_name(PARTITION_KEY)})')
+        cursor.execute(f'ALTER TABLE {quote_name(table)} ADD PRIMARY KEY (id, {quote_name(PARTITION_KEY)})')
+
+        # The ids go on from the last one of the old table, which may have a serial or an identity column
+        cursor.execute(f'CREATE SEQUENCE {quote_name(sequence)} AS bigint')
+        if last_id is not None:
+            cursor.execute('SELECT setval(%s, %s)', [quote_name(sequence), last_id])
+        cursor.execute(f'ALTER TABLE {quote_name(table)} ALTER COLUMN id '
+                       f"SET DEFAULT nextval('{quote_name(sequence)}'::regclass)")
+
+        cursor.execute(f'CREATE TABLE {quote_name(default_partition_name(table))} '
+                       f'PARTITION OF {quote_name(table)} DEFAULT')
+        last_month = last_partition_month(months_ahead)
+        for month in months_between(first_created_on or last_month, last_month):
+            cursor.execute(f'CREATE TABLE {quote_name(partition_name(table, month))} PARTITION OF {quote_name(table)} '
+                           f'FOR VALUES FROM (%s) TO (%s)', [month, next_month(month)])
+
+        cursor.execute(f'INSERT INTO {quote_name(table)} SELECT * FROM {quote_name(unpartitioned)}')
+        # The foreign keys of the other tables to this one go with it
+        cursor.execute(f'DROP TABLE {quote_name(unpartitioned)} CASCADE')
+        cursor.execute(f'ALTER SEQUENCE {quote_name(sequence)} OWNED BY {quote_name(table)}.id')
+
+        for index_definition in index_definitions:
+            cursor.execute(index_definition)
+        for (name, definition) in foreign_keys:
+            cursor.execute(f'ALTER TABLE {quote_name(table)} ADD CONSTRAINT {quote_name(name)} {definition}')
+    logger.info('Partitioned %s by month of %s', table, PARTITION_KEY)
+
+
+def partition_service_order_tables(apps, using='default', months_ahead=None):
+    """
+    Partition the service order tables by month on PostgreSQL, once SERVICE_ORDER_PARTITIONING is enabled.
+    The tables which are partitioned already are left as they are. Returns the newly partitioned tables.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql' or not getattr(settings, 'SERVICE_ORDER_PARTITIONING', False):
+        return []
+
+    months_ahead = get_months_ahead(months_ahead)
+    tables = []
+    with transaction.atomic(using=using):
+        # The order table first, the foreign keys of the others to it are dropped with it
+        for label in PARTITIONED_MODELS:
+            table = apps.get_model(label)._meta.db_table
+            if not is_partitioned(connection, table):
+                partition_table(connection, table, months_ahead)
+                tables.append(table)
+    return tables
+
+
+def create_future_partitions(apps, using='default', months_ahead=None):
+    """
+    Create the partitions of the partitioned tables up to `months_ahead` months from now,
+    so the new rows don't end up in the default partitions. Returns the number of created partitions.
+    """
+    connection = connections[using]
+    last_month = last_partition_month(get_months_ahead(months_ahead))
+    this_month = month_start(datetime.datetime.now(datetime.timezone.utc))
+
+    created_count = 0
+    for table in partitioned_tables(apps, connection):
+        for month in months_between(this_month, last_month):
+            with transaction.atomic(using=using):
+                created_count += create_partition(connection, table, month)
+    return created_count
@@ -1,8 +1,21 @@
-from django.db.models.signals import post_save
-from django.dispatch import receiver
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver, Signal
 
-from service_manager.main.models import ServiceOrderHeader
-from service_manager.main.tasks import send_successful_service_order_creation_email
+from service_manager.accounts.models import AppUser, Profile
+from service_manager.core import fragment_cache
+from service_manager.mailing import outbox
+from service_manager.customers.models import Customer, CustomerAsset, CustomerDepartment, CustomerRepresentative
+from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail, ServiceOrderNote
+from service_manager.main.tasks import send_successful_service_order_creation_email, refresh_material_total_amounts
+from service_manager.master_data.models import Asset, AssetCategory, Brand, CustomerType, Material, \
+    MaterialCategory
+
+# Sent with `service_order_ids` after detail lines are (soft) deleted with a bulk update, which sends no post_save
+service_order_details_deleted = Signal()
+# Sent with `service_order_ids` after detail lines are inserted with bulk_create, which sends no post_save
+service_order_details_created = Signal()
+# Sent with `material_id` after the price of a material is saved with a different value
+material_price_changed = Signal()
 
 
 @receiver(post_save, sender=ServiceOrderHeader)
@@ -11,4 +24,112 @@ def service_order_header_created(sender, instance, created, **kwargs):
         return
     if not instance.send_emails:
         return
-    send_successful_service_order_creation_email.delay(instance.pk)
+    # Sent once the order is committed, without a broker round trip within the request
+    outbox.publish(send_successful_service_order_creation_email, service_order_id=instance.pk)
+
+
+@receiver(post_save, sender=ServiceOrderDetail)
+@receiver(post_delete, sender=ServiceOrderDetail)
+def service_order_detail_changed(sender, instance, **kwargs):
+    """
+    Creating, editing or (soft) deleting a detail line changes the total amount of its service order.
+    """
+    ServiceOrderHeader.objects.filter(pk=instance.service_order_id).refresh_total_amount()
+
+
+@receiver(post_init, sender=Material)
+def remember_material_price(sender, instance, **kwargs):
+    # A deferred price is left out instead of being loaded
+    instance.previous_price = instance.__dict__.get('price')
+
+
+@receiver(post_save, sender=Material)
+def material_changed(sender, instance, created, update_fields=None, **kwargs):
+    """
+    A price change affects the total amount of every service order that uses the material.
+    They are recalculated by a celery task once the change is committed, not within the request.
+    """
+    previous_price = getattr(instance, 'previous_price', None)
+    instance.previous_price = instance.__dict__.get('price')
+    if created:
+        return
+    if update_fields is not None and 'price' not in update_fields:
+        return
+    if previous_price is not None and previous_price == instance.price:
+        return
+
+    outbox.publish(refresh_material_total_amounts, material_id=instance.pk)
+    material_price_changed.send(sender=sender, material_id=instance.pk)
+
+
+@receiver(post_save, sender=ServiceOrderHeader)
+@receiver(post_delete, sender=ServiceOrderHeader)
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+@receiver(post_save, sender=CustomerAsset)
+@receiver(post_delete, sender=CustomerAsset)
+@receiver(post_save, sender=Asset)
+@receiver(post_delete, sender=Asset)
+@receiver(post_save, sender=CustomerType)
+@receiver(post_delete, sender=CustomerType)
+@receiver(post_save, sender=AssetCategory)
+@receiver(post_delete, sender=AssetCategory)
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+@receiver(post_save, sender=CustomerDepartment)
+@receiver(post_delete, sender=CustomerDepartment)
+@receiver(post_save, sender=CustomerRepresentative)
+@receiver(post_delete, sender=CustomerRepresentative)
+@receiver(post_save, sender=Material)
+@receiver(post_delete, sender=Material)
+@receiver(post_delete, sender=AppUser)
+def service_order_page_entity_changed(sender, instance, **kwargs):
+    """
+    Render the cached fragments of the service order pages which show the instance again.
+    """
+    fragment_cache.invalidate(sender, instance.pk)
+
+
+@receiver(post_save, sender=AppUser)
+def user_shown_changed(sender, instance, update_fields=None, **kwargs):
+    # Logging in saves only the last login, which the pages don't show
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    fragment_cache.invalidate(AppUser, instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def user_display_name_changed(sender, instance, **kwargs):
+    """
+    The display name of the user is updated in bulk from the profile, which sends no post_save of the user.
+    """
+    fragment_cache.invalidate(AppUser, instance.app_user_id)
+
+
+@receiver(post_save, sender=ServiceOrderDetail)
+@receiver(post_delete, sender=ServiceOrderDetail)
+@receiver(post_save, sender=ServiceOrderNote)
+@receiver(post_delete, sender=ServiceOrderNote)
+def service_order_line_changed(sender, instance, **kwargs):
+    fragment_cache.invalidate(ServiceOrderHeader, instance.service_order_id)
+
+
+@receiver(service_order_details_created)
+@receiver(service_order_details_deleted)
+def service_order_details_changed_in_bulk(sender, service_order_ids, **kwargs):
+    fragment_cache.invalidate(ServiceOrderHeader, *service_order_ids)
+
+
+@receiver(post_save, sender=MaterialCategory)
+@receiver(post_delete, sender=MaterialCategory)
+def material_category_shown_changed(sender, instance, created=False, **kwargs):
+    """
+    The detail lines show the category of the material, their fragments vary on the versions of the materials.
+    A category has a handful of materials, however many service orders use them.
+    """
+    if created:
+        return
+
+    material_ids = Material.all_records.filter(category_id=instance.pk).values_list('pk', flat=True)
+    fragment_cache.invalidate(Material, *material_ids)
@@ -1,9 +1,9 @@
 from celery import shared_task
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 
 from service_manager import settings
-from service_manager.main.models import ServiceOrderHeader
+from service_manager.mailing.dispatch import queue_email
+from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail
 
 
 @shared_task
@@ -15,7 +15,7 @@ def send_successful_service_order_creation_email(service_order_id):
     }
 
     message = render_to_string('email_templates/service_order_created.html', context)
-    send_mail(
+    queue_email(
         subject='New Service order @ ServiceManager',
         message=None,
         html_message=message,
@@ -27,10 +27,41 @@ def send_successful_service_order_creation_email(service_order_id):
 @shared_task()
 def send_contact_us_email(email_data):
     message = render_to_string('email_templates/contact_us_mail_template.html', email_data)
-    send_mail(
+    queue_email(
         subject='Support request @ ServiceManager',
         message=None,
         html_message=message,
         from_email=settings.EMAIL_HOST_USER,
         recipient_list=[settings.SUPPORT_EMAIL],
     )
+
+
+@shared_task
+def refresh_material_total_amounts(material_id):
+    """
+    Recalculate the total amount of every service order with an active detail line of the material.
+    """
+    service_order_ids = ServiceOrderDetail.objects.filter(material_id=material_id).values('service_order_id')
+    return ServiceOrderHeader.objects.filter(pk__in=service_order_ids).refresh_total_amount()
+
+
+@shared_task
+def archive_service_orders():
+    from service_manager.main.archive import ServiceOrderArchiver
+
+    result = ServiceOrderArchiver().archive()
+    return {
+        'orders': result.orders,
+        'details': result.details,
+        'notes': result.notes,
+        'seconds': result.seconds,
+    }
+
+
+@shared_task
+def create_service_order_partitions():
+    from django.apps import apps
+
+    from service_manager.main.partitioning import create_future_partitions
+
+    return create_future_partitions(apps)
@@ -1,31 +1,41 @@
+import functools
+from importlib import import_module
+
 from django import template
-from service_manager.master_data.urls import urlpatterns as master_data_url_patterns
-from service_manager.customers.urls import urlpatterns as customers_url_patterns
-from service_manager.main.urls import urlpatterns as main_url_patterns
-from service_manager.reports.urls import urlpatterns as reports_url_patterns
 
 register = template.Library()
 
-GROUP_NAMES = {
-    'main': main_url_patterns,
-    'reports': reports_url_patterns,
-    'customers': customers_url_patterns,
-    'master_data': master_data_url_patterns,
+GROUP_URLCONFS = {
+    'main': 'service_manager.main.urls',
+    'reports': 'service_manager.reports.urls',
+    'customers': 'service_manager.customers.urls',
+    'master_data': 'service_manager.master_data.urls',
 }
 
 # todo: handle active tabl selection with JS
 COMMON_TABS = ['index', 'contact_us',]
 
 
-@register.filter(name='is_active_nav_link')
-def is_active_nav_link(url_path, tab_group_name):
-    is_active = False
+@functools.lru_cache(maxsize=None)
+def get_tab_groups():
+    """
+    {url name: tab group name}, built from the urlconfs of the groups the first time a page is rendered.
+    """
+    tab_groups = {}
+    for group_name, urlconf in GROUP_URLCONFS.items():
+        for url_pattern in import_module(urlconf).urlpatterns:
+            if url_pattern.name and url_pattern.name not in COMMON_TABS:
+                tab_groups.setdefault(url_pattern.name, group_name)
+    return tab_groups
 
-    url_patterns = GROUP_NAMES[tab_group_name]
 
-    url_pattern_names = [x.name for x in url_patterns if x.name not in COMMON_TABS]
+@register.simple_tag(name='nav_tab_group')
+def nav_tab_group(resolver_match):
+    if resolver_match is None:
+        return None
+    return get_tab_groups().get(resolver_match.url_name)
 
-    if url_path in url_pattern_names:
-        is_active = True
 
-    return is_active
+@register.filter(name='is_active_nav_link')
+def is_active_nav_link(url_path, tab_group_name):
+    return get_tab_groups().get(url_path) == tab_group_name
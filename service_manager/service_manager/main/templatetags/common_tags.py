@@ -1,14 +1,63 @@
 from django import template
+from django.conf import settings
+from django.db import models
 
-from service_manager.main.models import ServiceOrderHeader
+from service_manager.core.fragment_cache import get_versions, get_related_versions
+from service_manager.core.identity_map import get_identity_map
+from service_manager.main.models import ServiceOrderHeader, Material
 
 register = template.Library()
 
 
 @register.filter(name='soh_is_completed_without_notes')
-def soh_is_completed_without_notes(service_order_id):
-    service_order = ServiceOrderHeader.objects.get(pk=service_order_id)
+def soh_is_completed_without_notes(service_order):
+    identity_map = get_identity_map()
+    # The archived service orders are passed as they are
+    if not isinstance(service_order, models.Model):
+        service_order = identity_map.get(ServiceOrderHeader, service_order)
 
-    if service_order.is_completed and not service_order.serviceordernote_set.all():
+    notes = identity_map.related(service_order, 'serviceordernote_set', 'created_by')
+    if service_order.is_completed and not notes:
         return True
     return False
+
+
+# The active related objects (e.g. "serviceordernote_set") of the instance, loaded once per request
+@register.filter(name='related_objects')
+def related_objects(instance, name):
+    if not instance:
+        return []
+    return get_identity_map().related(instance, name)
+
+
+# The active detail lines of the service order with their materials, loaded once per request
+@register.filter(name='soh_detail_lines')
+def soh_detail_lines(service_order):
+    if not service_order:
+        return []
+    return get_identity_map().related(service_order, 'serviceorderdetail_set', 'material__category')
+
+
+# Version of the cached fragments of the service order page, changed by any edit of the order or what it shows
+@register.filter(name='soh_fragment_version')
+def soh_fragment_version(service_order):
+    customer = service_order.customer
+    customer_asset = service_order.customer_asset
+    asset = customer_asset.asset
+    return get_versions(
+        service_order, customer, customer.type, customer_asset, asset, asset.category, asset.brand,
+        service_order.department, service_order.handed_over_by, service_order.handed_over_to,
+        service_order.accepted_by, service_order.serviced_by, service_order.completed_by,
+    )
+
+
+# Version of the cached detail lines fragment, changed by an edit of the materials of the lines as well.
+# The lines are loaded only when the material ids are not cached with the version of the order yet,
+# the page reuses them when it renders the lines (the ETag of the page reads the version before rendering it)
+@register.filter(name='soh_details_fragment_version')
+def soh_details_fragment_version(service_order):
+    return get_related_versions(
+        service_order, 'materials', Material,
+        load=lambda: [x.material_id for x in soh_detail_lines(service_order)],
+        timeout=settings.SERVICE_ORDER_FRAGMENT_CACHE_TIMEOUT,
+    )
@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from service_manager.customers.models import Customer, CustomerAsset
+from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail
+from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset, MaterialCategory, Material
+
+UserModel = get_user_model()
+
+
+class ServiceOrderHeaderAdminTests(TestCase):
+    USER_DATA = {
+        'email': 'admin@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        UserModel.objects.create_superuser(**self.USER_DATA)
+        self.client.login(**self.USER_DATA)
+
+        self.customer = Customer.objects.create(
+            type=CustomerType.objects.create(name='Business'),
+            name='Testing Inc.',
+            vat='123444121',
+            email_address='testing@inc.com',
+            phone_number='100921122',
+        )
+        self.material = Material.objects.create(name='1hr effort', price=50,
+                                                category=MaterialCategory.objects.create(name='Labor'))
+
+    def __create_customer_asset(self, serial_number):
+        return CustomerAsset.objects.create(
+            customer=self.customer,
+            asset=Asset.objects.create(
+                category=AssetCategory.objects.create(name='Mobile'),
+                brand=Brand.objects.create(name='Apple'),
+                model_name='iPhone',
+                model_number='13 Pro',
+            ),
+            serial_number=serial_number,
+            product_number='California-PN_33',
+        )
+
+    def __create_service_order(self, customer_asset, quantity=0, is_completed=True, active=True):
+        service_order = ServiceOrderHeader.objects.create(
+            customer=self.customer,
+            customer_asset=customer_asset,
+            problem_description='Broken screen',
+            is_completed=is_completed,
+            active=active,
+            send_emails=False,
+        )
+        if quantity:
+            ServiceOrderDetail.objects.create(service_order=service_order, material=self.material,
+                                              quantity=quantity, discount=0)
+        return service_order
+
+    def __get_changelist(self, data=None):
+        return self.client.get(reverse('admin:main_serviceorderheader_changelist'), data=data or {})
+
+    def test_changelist__expect_customer_asset_statistics(self):
+        customer_asset = self.__create_customer_asset('SN-1')
+        self.__create_service_order(customer_asset, quantity=2)
+        self.__create_service_order(customer_asset, quantity=1)
+        self.__create_service_order(customer_asset, quantity=5, is_completed=False)
+        self.__create_service_order(customer_asset, quantity=5, active=False)
+
+        service_order = self.__get_changelist().context['cl'].result_list[0]
+
+        self.assertEqual(service_order.customer_asset_times_serviced, 2)
+        self.assertEqual(service_order.customer_asset_lifetime_revenue, 150)
+
+    def test_changelist__when_rows_are_added__expect_same_number_of_queries(self):
+        self.__create_service_order(self.__create_customer_asset('SN-1'), quantity=1)
+        self.__get_changelist()
+
+        with CaptureQueriesContext(connection) as few_rows_queries:
+            self.__get_changelist()
+
+        for i in range(5):
+            self.__create_service_order(self.__create_customer_asset(f'SN-{i + 2}'), quantity=1)
+
+        with CaptureQueriesContext(connection) as many_rows_queries:
+            self.__get_changelist()
+
+        self.assertEqual(len(few_rows_queries), len(many_rows_queries))
+
+    def test_changelist__when_sorted_by_lifetime_revenue__expect_highest_first(self):
+        self.__create_service_order(self.__create_customer_asset('SN-1'), quantity=1)
+        self.__create_service_order(self.__create_customer_asset('SN-2'), quantity=3)
+
+        list_display = self.__get_changelist().context['cl'].list_display
+        column = list_display.index('get_customer_asset_lifetime_revenue')
+        response = self.__get_changelist({'o': f'-{column}'})
+
+        revenues = [x.customer_asset_lifetime_revenue for x in response.context['cl'].result_list]
+        self.assertEqual(revenues, [150, 50])
@@ -0,0 +1,147 @@
+from django.test import TestCase
+
+from service_manager.customers.models import Customer, CustomerAsset
+from service_manager.mailing.models import OutboxEvent
+from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail
+from service_manager.main.tasks import refresh_material_total_amounts
+from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset, MaterialCategory, Material
+
+
+class ServiceOrderHeaderTotalAmountTests(TestCase):
+    def setUp(self):
+        customer_type = CustomerType.objects.create(
+            name='Business'
+        )
+
+        customer = Customer.objects.create(
+            type=customer_type,
+            name='Testing Inc.',
+            vat='123444121',
+            email_address='testing@inc.com',
+            phone_number='100921122',
+        )
+
+        asset = Asset.objects.create(
+            category=AssetCategory.objects.create(name='Mobile'),
+            brand=Brand.objects.create(name='Apple'),
+            model_name='iPhone',
+            model_number='13 Pro',
+        )
+
+        customer_asset = CustomerAsset.objects.create(
+            customer=customer,
+            asset=asset,
+            serial_number='SN-Apple-21',
+            product_number='California-PN_33',
+        )
+
+        material_category = MaterialCategory.objects.create(name='Labor')
+        self.labor = Material.objects.create(name='1hr effort', price=50, category=material_category)
+        self.screen = Material.objects.create(name='Screen', price=120, category=material_category)
+
+        self.service_order = ServiceOrderHeader.objects.create(
+            customer=customer,
+            customer_asset=customer_asset,
+            problem_description='Broken screen',
+            send_emails=False,
+        )
+
+    def __add_detail(self, material, quantity=1, discount=0):
+        return ServiceOrderDetail.objects.create(
+            service_order=self.service_order,
+            material=material,
+            quantity=quantity,
+            discount=discount,
+        )
+
+    def test_total_amount__when_no_details__expect_zero(self):
+        self.service_order.refresh_from_db()
+
+        self.assertEqual(self.service_order.total_amount, 0)
+        self.assertEqual(self.service_order.total_amount_due, '0.00')
+
+    def test_total_amount__when_details_are_created__expect_sum_of_detail_totals(self):
+        self.__add_detail(self.labor, quantity=2)
+        self.__add_detail(self.screen, discount=10)
+
+        self.service_order.refresh_from_db()
+
+        self.assertAlmostEqual(self.service_order.total_amount, 2 * 50 + 120 * 0.9)
+        self.assertEqual(self.service_order.total_amount_due, '208.00')
+
+    def test_total_amount__when_details_are_bulk_created__expect_total_refreshed_once(self):
+        details = [
+            ServiceOrderDetail(service_order=self.service_order, material=self.labor, quantity=2, discount=0),
+            ServiceOrderDetail(service_order=self.service_order, material=self.screen, quantity=1, discount=10),
+        ]
+
+        # Savepoint, insert, update of the total, days of the report facts and release
+        with self.assertNumQueries(5):
+            ServiceOrderDetail.objects.bulk_create(details)
+
+        self.service_order.refresh_from_db()
+        self.assertAlmostEqual(self.service_order.total_amount, 2 * 50 + 120 * 0.9)
+
+    def test_total_amount__when_detail_is_edited__expect_updated_total(self):
+        detail = self.__add_detail(self.labor)
+        detail.quantity = 3
+        detail.save()
+
+        self.service_order.refresh_from_db()
+
+        self.assertAlmostEqual(self.service_order.total_amount, 150)
+
+    def test_total_amount__when_detail_is_soft_deleted__expect_detail_excluded(self):
+        self.__add_detail(self.labor)
+        detail = self.__add_detail(self.screen)
+        detail.delete()
+
+        self.service_order.refresh_from_db()
+
+        self.assertAlmostEqual(self.service_order.total_amount, 50)
+
+    def test_total_amount__when_details_are_bulk_deleted__expect_zero(self):
+        self.__add_detail(self.labor)
+        self.__add_detail(self.screen)
+        ServiceOrderDetail.objects.filter(service_order=self.service_order).delete()
+
+        self.service_order.refresh_from_db()
+
+        self.assertEqual(self.service_order.total_amount, 0)
+
+    def test_total_amount__when_material_price_changes__expect_updated_total_by_task(self):
+        self.__add_detail(self.labor, quantity=2)
+        self.labor.price = 60
+        self.labor.save()
+
+        event = OutboxEvent.objects.get(task_name=refresh_material_total_amounts.name)
+        refresh_material_total_amounts(**event.kwargs)
+        self.service_order.refresh_from_db()
+
+        self.assertAlmostEqual(self.service_order.total_amount, 120)
+
+    def test_total_amount__when_material_is_saved_with_same_price__expect_no_task(self):
+        self.__add_detail(self.labor, quantity=2)
+        labor = Material.objects.get(pk=self.labor.pk)
+        labor.name = '2hr effort'
+        labor.save()
+
+        self.assertFalse(OutboxEvent.objects.filter(task_name=refresh_material_total_amounts.name).exists())
+
+    def test_with_computed_total_amount__expect_same_as_stored_total(self):
+        self.__add_detail(self.labor, quantity=2, discount=25)
+        self.__add_detail(self.screen)
+
+        service_order = ServiceOrderHeader.objects.with_computed_total_amount().get(pk=self.service_order.pk)
+
+        self.assertAlmostEqual(service_order.computed_total_amount, service_order.total_amount)
+
+    def test_total_amount_sum__expect_sum_in_one_query(self):
+        self.__add_detail(self.labor)
+        self.__add_detail(self.screen)
+
+        with self.assertNumQueries(1):
+            total = ServiceOrderHeader.objects.filter(customer_asset=self.service_order.customer_asset) \
+                .total_amount_sum()
+
+        self.assertAlmostEqual(total, 170)
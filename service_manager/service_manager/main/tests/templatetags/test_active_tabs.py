@@ -0,0 +1,23 @@
+from django.test import TestCase
+from django.urls import resolve, reverse
+
+from service_manager.main.templatetags.active_tabs import nav_tab_group, is_active_nav_link
+
+
+class NavTabGroupTests(TestCase):
+    def test_nav_tab_group__when_url_is_in_group__expect_group_name(self):
+        resolver_match = resolve(reverse('customers_list'))
+
+        self.assertEqual('customers', nav_tab_group(resolver_match))
+
+    def test_nav_tab_group__when_url_is_common_tab__expect_none(self):
+        resolver_match = resolve(reverse('index'))
+
+        self.assertIsNone(nav_tab_group(resolver_match))
+
+    def test_nav_tab_group__when_no_url_is_resolved__expect_none(self):
+        self.assertIsNone(nav_tab_group(None))
+
+    def test_is_active_nav_link__expect_only_own_group_active(self):
+        self.assertTrue(is_active_nav_link('assets_list', 'master_data'))
+        self.assertFalse(is_active_nav_link('assets_list', 'customers'))
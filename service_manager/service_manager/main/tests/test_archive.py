@@ -0,0 +1,185 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from service_manager.accounts.models import Profile
+from service_manager.customers.models import Customer, CustomerAsset
+from service_manager.main.archive import ServiceOrderArchiver
+from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail, ServiceOrderNote, \
+    ArchivedServiceOrderHeader, ArchivedServiceOrderDetail, ArchivedServiceOrderNote
+from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset, MaterialCategory, Material
+from service_manager.reports.models import DailyServiceFact
+
+UserModel = get_user_model()
+
+
+class ServiceOrderArchiverTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserModel.objects.create_user(**self.USER_DATA)
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=self.user)
+        for codename in ('view_serviceorderheader', 'view_customerasset'):
+            self.user.user_permissions.add(Permission.objects.get(codename=codename))
+
+        self.customer_asset = CustomerAsset.objects.create(
+            customer=Customer.objects.create(
+                type=CustomerType.objects.create(name='Business'),
+                name='Testing Inc.',
+                email_address='testing@inc.com',
+                phone_number='100921122',
+            ),
+            asset=Asset.objects.create(
+                category=AssetCategory.objects.create(name='Mobile'),
+                brand=Brand.objects.create(name='Apple'),
+                model_name='iPhone',
+                model_number='13 Pro',
+            ),
+        )
+        self.material = Material.objects.create(name='Screen', price=120,
+                                                category=MaterialCategory.objects.create(name='Parts'))
+        self.now = timezone.now()
+
+    def __create_service_order(self, completed_days_ago=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            service_order = ServiceOrderHeader.objects.create(
+                customer=self.customer_asset.customer,
+                customer_asset=self.customer_asset,
+                problem_description='Broken screen',
+                accepted_by=self.user,
+                send_emails=False,
+            )
+            ServiceOrderDetail.objects.create(service_order=service_order, material=self.material, quantity=2,
+                                              discount=0)
+            ServiceOrderNote.objects.create(service_order=service_order, created_by=self.user, note='Replaced')
+            if completed_days_ago is not None:
+                service_order.refresh_from_db()
+                service_order.is_serviced = True
+                service_order.serviced_on = self.now - datetime.timedelta(days=completed_days_ago)
+                service_order.is_completed = True
+                service_order.completed_on = service_order.serviced_on
+                service_order.save()
+        return ServiceOrderHeader.all_records.get(pk=service_order.pk)
+
+    def __archive(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ServiceOrderArchiver(batch_size=1, deleted_after_days=30, completed_after_days=365).archive()
+
+    def test_archive__when_order_was_completed_long_ago__expect_order_moved_with_details_and_notes(self):
+        service_order = self.__create_service_order(completed_days_ago=400)
+
+        result = self.__archive()
+
+        self.assertEqual((1, 1, 1), (result.orders, result.details, result.notes))
+        self.assertFalse(ServiceOrderHeader.all_records.filter(pk=service_order.pk).exists())
+        self.assertFalse(ServiceOrderDetail.all_records.exists())
+        self.assertFalse(ServiceOrderNote.all_records.exists())
+
+        archived = ArchivedServiceOrderHeader.all_records.get(pk=service_order.pk)
+        self.assertEqual((service_order.created_on, service_order.total_amount),
+                         (archived.created_on, archived.total_amount))
+        self.assertEqual(1, ArchivedServiceOrderDetail.objects.filter(service_order=archived).count())
+        self.assertEqual(1, ArchivedServiceOrderNote.objects.filter(service_order=archived).count())
+
+    def test_archive__when_orders_are_live__expect_orders_kept(self):
+        self.__create_service_order()
+        self.__create_service_order(completed_days_ago=10)
+
+        result = self.__archive()
+
+        self.assertEqual(0, result.orders)
+        self.assertEqual(2, ServiceOrderHeader.all_records.count())
+
+    def test_archive__when_order_was_soft_deleted_long_ago__expect_order_moved(self):
+        service_order = self.__create_service_order()
+        service_order.delete()
+        ServiceOrderHeader.all_records.filter(pk=service_order.pk) \
+            .update(updated_on=self.now - datetime.timedelta(days=31))
+
+        call_command('archive_service_orders', '--deleted-after-days=30', stdout=StringIO())
+
+        self.assertFalse(ArchivedServiceOrderHeader.all_records.get(pk=service_order.pk).active)
+
+    def test_get_detail_page__when_order_is_archived__expect_order_shown(self):
+        service_order = self.__create_service_order(completed_days_ago=400)
+        self.__archive()
+        self.client.login(**self.USER_DATA)
+
+        response = self.client.get(reverse('detail_service_order', kwargs={'pk': service_order.pk}))
+
+        self.assertTrue(response.context['is_archived'])
+        self.assertContains(response, 'Replaced')
+        self.assertContains(response, '240.00')
+
+    def test_get_customer_asset_page__when_order_is_archived__expect_order_in_history(self):
+        archived = self.__create_service_order(completed_days_ago=400)
+        self.__archive()
+        live = self.__create_service_order()
+        self.client.login(**self.USER_DATA)
+
+        response = self.client.get(reverse('customer_asset_detail', kwargs={
+            'customer_id': self.customer_asset.customer_id,
+            'pk': self.customer_asset.pk,
+        }))
+
+        self.assertEqual([live.pk, archived.pk], [x.pk for x in response.context['service_orders']])
+        self.assertEqual('480.00', response.context['service_orders_total_amount'])
+
+    def test_rebuild_daily_facts__when_order_is_archived__expect_same_facts(self):
+        self.__create_service_order(completed_days_ago=400)
+        date_from = f'--from={timezone.localdate() - datetime.timedelta(days=401)}'
+        call_command('rebuild_daily_facts', date_from, stdout=StringIO())
+        expected_facts = list(DailyServiceFact.objects.order_by('day', 'revenue').values('day', 'orders_completed', 'revenue'))
+
+        self.__archive()
+        DailyServiceFact.objects.all().delete()
+        call_command('rebuild_daily_facts', date_from, stdout=StringIO())
+
+        self.assertEqual(expected_facts,
+                         list(DailyServiceFact.objects.order_by('day', 'revenue').values('day', 'orders_completed', 'revenue')))
+
+    def test_get_finished_orders_report__when_order_is_archived__expect_order_listed_and_exported(self):
+        archived = self.__create_service_order(completed_days_ago=400)
+        self.__archive()
+        live = self.__create_service_order(completed_days_ago=10)
+        self.client.login(**self.USER_DATA)
+
+        response = self.client.get(reverse('finished_orders'))
+        export_response = self.client.get(reverse('finished_orders_export'))
+
+        self.assertEqual([live.pk, archived.pk], [x.pk for x in response.context['object_list']])
+        rows = b''.join(export_response.streaming_content).decode().splitlines()[1:]
+        self.assertEqual([str(archived.pk), str(live.pk)], [x.split(',')[0] for x in rows])
+
+    def test_with_customer_asset_statistics__when_order_is_archived__expect_order_counted(self):
+        self.__create_service_order(completed_days_ago=400)
+        self.__archive()
+        live = self.__create_service_order(completed_days_ago=10)
+
+        service_order = ServiceOrderHeader.objects.with_customer_asset_statistics().get(pk=live.pk)
+
+        self.assertEqual((2, 480), (service_order.customer_asset_times_serviced,
+                                    service_order.customer_asset_lifetime_revenue))
+
+    def test_get_api__when_order_is_archived__expect_order_in_archived_service_orders(self):
+        service_order = self.__create_service_order(completed_days_ago=400)
+        self.__archive()
+        self.user.user_permissions.add(Permission.objects.get(codename='view_serviceorderdetail'))
+        self.client.login(**self.USER_DATA)
+
+        response = self.client.get(reverse('api_v1_archived_service_order', kwargs={'pk': service_order.pk}),
+                                   {'fields': 'id,total_amount', 'include': 'details', 'fields[details]': 'quantity'})
+
+        self.assertEqual({'data': {'id': service_order.pk, 'total_amount': 240.0, 'details': [{'quantity': 2.0}]}},
+                         response.json())
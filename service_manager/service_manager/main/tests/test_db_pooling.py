@@ -0,0 +1,97 @@
+import gc
+import os
+import tempfile
+import threading
+
+from django.db import OperationalError, connections
+from django.test import SimpleTestCase
+
+from service_manager.core.db_backends.pooling import get_pool_stats
+from service_manager.core.db_backends.sqlite3.base import DatabaseWrapper
+
+
+class PooledDatabaseWrapperTests(SimpleTestCase):
+    def setUp(self):
+        # Every test gets its own pool
+        self.alias = f'pool_test_{self._testMethodName}'
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.settings_dict = {
+            **connections['default'].settings_dict,
+            'NAME': os.path.join(directory.name, 'pool.sqlite3'),
+            'POOL_SIZE': 1,
+            'POOL_TIMEOUT': 0.05,
+        }
+
+    def __connect(self):
+        wrapper = DatabaseWrapper(self.settings_dict, alias=self.alias)
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def test_connect__when_pool_is_full__expect_error_after_timeout(self):
+        self.__connect()
+
+        with self.assertRaisesMessage(OperationalError, f'No connection of "{self.alias}" got free'):
+            self.__connect()
+        self.assertEqual(1, get_pool_stats()[self.alias].timeouts)
+
+    def test_connect__when_connection_is_closed__expect_next_one_opened(self):
+        self.__connect().close()
+
+        self.__connect()
+
+        self.assertEqual((2, 1), (get_pool_stats()[self.alias].connects, get_pool_stats()[self.alias].in_use))
+
+    def test_connect__when_other_thread_closes_its_connection__expect_wait_recorded(self):
+        self.settings_dict['POOL_TIMEOUT'] = 5
+        wrapper = self.__connect()
+        wrapper.inc_thread_sharing()
+        threading.Timer(0.1, wrapper.close).start()
+
+        self.__connect()
+
+        self.assertGreaterEqual(get_pool_stats()[self.alias].max_wait, 0.05)
+
+    def test_connect__when_pool_size_is_not_set__expect_no_limit(self):
+        self.settings_dict['POOL_SIZE'] = 0
+
+        self.__connect()
+        self.__connect()
+
+        self.assertNotIn(self.alias, get_pool_stats())
+
+    def test_connect__when_other_connection_is_idle__expect_it_closed_and_reopened_later(self):
+        idle = self.__connect()
+        idle.mark_idle()
+
+        self.__connect()
+        idle.mark_busy()
+
+        self.assertIsNone(idle.connection)
+        self.assertEqual(1, get_pool_stats()[self.alias].idle_closed)
+
+    def test_connect__when_thread_of_idle_connection_ended__expect_its_slot_free(self):
+        self.settings_dict['POOL_TIMEOUT'] = 1
+
+        def request():
+            wrapper = DatabaseWrapper(self.settings_dict, alias=self.alias)
+            wrapper.ensure_connection()
+            wrapper.mark_idle()
+
+        for _ in range(3):
+            thread = threading.Thread(target=request)
+            thread.start()
+            thread.join()
+
+        self.__connect()
+        self.assertEqual(1, get_pool_stats()[self.alias].in_use)
+
+    def test_connect__when_connection_without_thread_is_collected__expect_its_slot_free(self):
+        wrapper = DatabaseWrapper(self.settings_dict, alias=self.alias)
+        wrapper.ensure_connection()
+        del wrapper
+        gc.collect()
+
+        self.__connect()
+        self.assertEqual(1, get_pool_stats()[self.alias].in_use)
@@ -0,0 +1,99 @@
+import unittest
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from service_manager.accounts.models import Profile
+from service_manager.core.db_routers import PIN_COOKIE_NAME, ReadYourWritesMiddleware, read_from_replica, \
+    routing_state
+from service_manager.core.query_budget import QueryRecorder
+from service_manager.main.models import ServiceOrderHeader
+
+UserModel = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def test_db_for_read__when_outside_of_replica_block__expect_primary(self):
+        self.assertEqual('default', router.db_for_read(ServiceOrderHeader))
+
+    def test_db_for_read__when_reading_from_replica__expect_replica(self):
+        with read_from_replica():
+            self.assertEqual('replica_1', router.db_for_read(ServiceOrderHeader))
+
+    def test_db_for_read__when_reading_users_or_sessions_from_replica__expect_primary(self):
+        with read_from_replica():
+            self.assertEqual(['default', 'default'], [router.db_for_read(x) for x in (UserModel, Session)])
+
+    def test_db_for_read__when_written_before__expect_primary(self):
+        with read_from_replica():
+            router.db_for_write(ServiceOrderHeader)
+
+            self.assertEqual('default', router.db_for_read(ServiceOrderHeader))
+
+    def test_db_for_read__when_request_is_pinned__expect_primary(self):
+        with routing_state(pinned=True), read_from_replica():
+            self.assertEqual('default', router.db_for_read(ServiceOrderHeader))
+
+    def test_middleware__when_request_wrote__expect_pin_cookie(self):
+        def write(request):
+            router.db_for_write(ServiceOrderHeader)
+            return HttpResponse()
+
+        response = ReadYourWritesMiddleware(write)(RequestFactory().post('/'))
+
+        self.assertIn(PIN_COOKIE_NAME, response.cookies)
+
+    def test_middleware__when_request_only_read__expect_no_pin_cookie(self):
+        def read(request):
+            with read_from_replica():
+                return HttpResponse(router.db_for_read(ServiceOrderHeader))
+
+        response = ReadYourWritesMiddleware(read)(RequestFactory().get('/'))
+
+        self.assertEqual(b'replica_1', response.content)
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+
+@unittest.skipUnless(settings.DATABASE_REPLICAS, 'Set DB_REPLICAS to test with a replica')
+class ReplicaReadTests(TransactionTestCase):
+    """
+    Run with a replica configured, e.g. with SQLite:
+    DB_REPLICAS=/tmp/replica.sqlite3 manage.py test service_manager.main.tests.test_db_routers
+    The replica is a test mirror of the default database, so only the committed rows can be read from it.
+    """
+    databases = '__all__'
+
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        cache.clear()
+        user = UserModel.objects.create_user(**self.USER_DATA)
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=user)
+        user.user_permissions.add(Permission.objects.get(codename='view_serviceorderheader'))
+        self.client.login(**self.USER_DATA)
+
+    def __get_replica_query_count(self, url_name):
+        recorder = QueryRecorder()
+        with connections[settings.DATABASE_REPLICAS[0]].execute_wrapper(recorder):
+            response = self.client.get(reverse(url_name))
+        self.assertEqual(200, response.status_code)
+        return recorder.count
+
+    def test_get_list__expect_read_from_replica(self):
+        self.assertGreater(self.__get_replica_query_count('finished_orders'), 0)
+
+    def test_get_list__when_client_wrote_recently__expect_read_from_primary(self):
+        self.client.cookies[PIN_COOKIE_NAME] = '1'
+
+        self.assertEqual(0, self.__get_replica_query_count('service_orders_list_pending_service'))
@@ -0,0 +1,85 @@
+import datetime
+import unittest
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from service_manager.customers.models import Customer, CustomerAsset
+from service_manager.main import partitioning
+from service_manager.main.models import ServiceOrderHeader
+from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset
+from service_manager.reports.views import FinishedOrdersListView
+
+UTC = datetime.timezone.utc
+
+
+class PartitionMonthsTests(SimpleTestCase):
+    def test_months_between__when_range_spans_a_year__expect_first_days_of_the_months(self):
+        months = partitioning.months_between(datetime.datetime(2022, 11, 17, 8, 30, tzinfo=UTC),
+                                             datetime.datetime(2023, 2, 1, tzinfo=UTC))
+
+        self.assertEqual([datetime.datetime(2022, 11, 1, tzinfo=UTC), datetime.datetime(2022, 12, 1, tzinfo=UTC),
+                          datetime.datetime(2023, 1, 1, tzinfo=UTC), datetime.datetime(2023, 2, 1, tzinfo=UTC)],
+                         months)
+
+    def test_next_month__when_month_is_january__expect_february(self):
+        self.assertEqual(datetime.datetime(2023, 2, 1, tzinfo=UTC),
+                         partitioning.next_month(datetime.datetime(2023, 1, 1, tzinfo=UTC)))
+
+    def test_partition_name__expect_table_and_month(self):
+        self.assertEqual('main_serviceorderheader_p202301',
+                         partitioning.partition_name('main_serviceorderheader', datetime.datetime(2023, 1, 1)))
+
+    def test_last_partition_month__when_no_months_ahead__expect_this_month(self):
+        now = datetime.datetime.now(UTC)
+
+        self.assertEqual(datetime.datetime(now.year, now.month, 1, tzinfo=UTC), partitioning.last_partition_month(0))
+
+
+class PartitioningTests(TestCase):
+    def test_partition_service_order_tables__when_partitioning_is_disabled__expect_nothing_partitioned(self):
+        with override_settings(SERVICE_ORDER_PARTITIONING=False):
+            self.assertEqual([], partitioning.partition_service_order_tables(apps))
+
+    @unittest.skipIf(connection.vendor == 'postgresql', 'Partitioning is supported on PostgreSQL')
+    def test_command__when_database_is_not_postgresql__expect_error(self):
+        with self.assertRaisesMessage(CommandError, 'only on PostgreSQL'):
+            call_command('partition_service_orders', stdout=StringIO())
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'Declarative partitioning of PostgreSQL')
+    def test_finished_orders_report__when_tables_are_partitioned__expect_later_partitions_pruned(self):
+        customer_asset = CustomerAsset.objects.create(
+            customer=Customer.objects.create(
+                type=CustomerType.objects.create(name='Business'),
+                name='Testing Inc.',
+                email_address='testing@inc.com',
+                phone_number='100921122',
+            ),
+            asset=Asset.objects.create(
+                category=AssetCategory.objects.create(name='Mobile'),
+                brand=Brand.objects.create(name='Apple'),
+                model_name='iPhone',
+                model_number='13 Pro',
+            ),
+        )
+        ServiceOrderHeader.objects.create(
+            customer=customer_asset.customer,
+            customer_asset=customer_asset,
+            problem_description='Broken screen',
+            send_emails=False,
+        )
+        with override_settings(SERVICE_ORDER_PARTITIONING=True):
+            partitioning.partition_service_order_tables(apps, months_ahead=1)
+            self.assertEqual(1, ServiceOrderHeader.all_records.count())
+
+            view = FinishedOrdersListView()
+            view.setup(RequestFactory().get('/reports/', {'from': '2022-01-01', 'to': '2022-01-31'}))
+            plan = view.get_queryset().explain()
+
+        table = ServiceOrderHeader._meta.db_table
+        this_month = partitioning.last_partition_month(0)
+        self.assertIn(partitioning.default_partition_name(table), plan)
+        self.assertNotIn(partitioning.partition_name(table, this_month), plan)
@@ -0,0 +1,208 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from service_manager.accounts.models import Profile
+from service_manager.core.query_budget import QueryRecorder, get_query_budgets
+from service_manager.core.testing import QueryBudgetTestMixin
+from service_manager.api.urls import urlpatterns as api_url_patterns
+from service_manager.customers.models import Customer, CustomerAsset, CustomerRepresentative, CustomerDepartment
+from service_manager.customers.urls import urlpatterns as customers_url_patterns
+from service_manager.main.archive import copy_row
+from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail, ServiceOrderNote, \
+    ArchivedServiceOrderHeader, ArchivedServiceOrderDetail
+from service_manager.main.urls import urlpatterns as main_url_patterns
+from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset, MaterialCategory, Material
+from service_manager.master_data.urls import urlpatterns as master_data_url_patterns
+
+UserModel = get_user_model()
+
+
+class QueryBudgetsTests(QueryBudgetTestMixin, TestCase):
+    """
+    Open every page with several rows per list and check the number of queries against the declared budgets.
+    """
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    # The budgets are measured with this many rows in every list
+    ROWS_COUNT = 6
+
+    # Fragment which is only rendered as part of the service order page and fails on its own
+    NOT_RENDERED_URL_NAMES = ('service_order_details',)
+
+    def setUp(self):
+        user = UserModel.objects.create_user(**self.USER_DATA)
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=user)
+        group = Group.objects.create(name='Everything')
+        group.permissions.set(Permission.objects.all())
+        user.groups.add(group)
+
+        customer_type = CustomerType.objects.create(name='Business')
+        customer = Customer.objects.create(
+            type=customer_type,
+            name='Testing Inc.',
+            vat='123444121',
+            email_address='testing@inc.com',
+            phone_number='100921122',
+        )
+
+        material_category = MaterialCategory.objects.create(name='Labor')
+
+        for i in range(self.ROWS_COUNT):
+            asset = Asset.objects.create(
+                category=AssetCategory.objects.create(name=f'Category {i}'),
+                brand=Brand.objects.create(name=f'Brand {i}'),
+                model_name=f'Model {i}',
+                model_number=f'{i}',
+            )
+            customer_asset = CustomerAsset.objects.create(
+                customer=customer,
+                asset=asset,
+                serial_number=f'SN-{i}',
+                product_number=f'PN-{i}',
+            )
+            CustomerRepresentative.objects.create(
+                customer=customer,
+                first_name=f'First {i}',
+                last_name=f'Last {i}',
+                phone_number='1234556',
+            )
+            CustomerDepartment.objects.create(customer=customer, name=f'Department {i}')
+            material = Material.objects.create(name=f'Material {i}', price=10 * i, category=material_category)
+
+            for is_serviced in (False, True):
+                service_order = ServiceOrderHeader.objects.create(
+                    customer=customer,
+                    customer_asset=customer_asset,
+                    problem_description=f'Problem {i}',
+                    accepted_by=user,
+                    is_serviced=is_serviced,
+                    send_emails=False,
+                )
+                ServiceOrderDetail.objects.create(service_order=service_order, material=material, quantity=1,
+                                                  discount=0)
+                ServiceOrderNote.objects.create(service_order=service_order, created_by=user, note=f'Note {i}')
+
+        # A copy of every order in the archive tables as well, the reports and the API read both
+        for service_order in ServiceOrderHeader.objects.all():
+            copy_row(service_order, ArchivedServiceOrderHeader).save()
+        for service_order_detail in ServiceOrderDetail.objects.all():
+            copy_row(service_order_detail, ArchivedServiceOrderDetail).save()
+
+        self.client.login(**self.USER_DATA)
+
+    def __get_url_kwargs(self):
+        customer_asset = CustomerAsset.objects.first()
+        service_order = ServiceOrderHeader.objects.filter(is_serviced=False).first()
+        service_order_detail = ServiceOrderDetail.objects.filter(service_order=service_order).first()
+        service_order_note = ServiceOrderNote.objects.filter(service_order=service_order).first()
+        customer_id = customer_asset.customer_id
+
+        return {
+            'detail_service_order': {'pk': service_order.pk},
+            'create_service_order': {'customer_id': customer_id, 'asset_id': customer_asset.pk},
+            'delete_service_order': {'pk': service_order.pk},
+            'create_service_order_detail': {'order_id': service_order.pk},
+            'create_service_order_details': {'order_id': service_order.pk},
+            'service_order_details': {'order_id': service_order.pk},
+            'edit_service_order_detail': {'order_id': service_order.pk, 'pk': service_order_detail.pk},
+            'delete_service_order_detail': {'order_id': service_order.pk, 'pk': service_order_detail.pk},
+            'complete_service_order': {'pk': service_order.pk},
+            'create_service_order_note': {'order_id': service_order.pk},
+            'service_order_notes': {'order_id': service_order.pk},
+            'service_order_note_detail': {'order_id': service_order.pk, 'pk': service_order_note.pk},
+            'edit_service_order_note': {'order_id': service_order.pk, 'pk': service_order_note.pk},
+            'delete_service_order_note': {'order_id': service_order.pk, 'pk': service_order_note.pk},
+            'handover_service_order': {'pk': service_order.pk},
+            'rollback_service_order': {'pk': service_order.pk},
+            'customer_detail': {'pk': customer_id},
+            'customer_assets': {'customer_id': customer_id},
+            'customer_representatives': {'customer_id': customer_id},
+            'customer_departments': {'customer_id': customer_id},
+            'edit_customer': {'pk': customer_id},
+            'delete_customer': {'pk': customer_id},
+            'import_customer_records': {'customer_id': customer_id},
+            'create_customer_asset': {'customer_id': customer_id},
+            'customer_asset_detail': {'customer_id': customer_id, 'pk': customer_asset.pk},
+            'edit_customer_asset': {'customer_id': customer_id, 'pk': customer_asset.pk},
+            'delete_customer_asset': {'customer_id': customer_id, 'pk': customer_asset.pk},
+            'create_customer_representative': {'customer_id': customer_id},
+            'edit_customer_representative': {'customer_id': customer_id,
+                                             'pk': CustomerRepresentative.objects.first().pk},
+            'delete_customer_representative': {'customer_id': customer_id,
+                                               'pk': CustomerRepresentative.objects.first().pk},
+            'create_customer_department': {'customer_id': customer_id},
+            'edit_customer_department': {'customer_id': customer_id, 'pk': CustomerDepartment.objects.first().pk},
+            'delete_customer_department': {'customer_id': customer_id, 'pk': CustomerDepartment.objects.first().pk},
+            'edit_asset': {'pk': customer_asset.asset_id},
+            'delete_asset': {'pk': customer_asset.asset_id},
+            'edit_material': {'pk': Material.objects.first().pk},
+            'delete_material': {'pk': Material.objects.first().pk},
+            'edit_material_category': {'pk': MaterialCategory.objects.first().pk},
+            'delete_material_category': {'pk': MaterialCategory.objects.first().pk},
+            'edit_brand': {'pk': Brand.objects.first().pk},
+            'delete_brand': {'pk': Brand.objects.first().pk},
+            'edit_asset_category': {'pk': AssetCategory.objects.first().pk},
+            'delete_asset_category': {'pk': AssetCategory.objects.first().pk},
+            'api_v1_service_order': {'pk': service_order.pk},
+            'api_v1_service_order_detail': {'pk': service_order_detail.pk},
+            'api_v1_archived_service_order': {'pk': service_order.pk},
+            'api_v1_archived_service_order_detail': {'pk': service_order_detail.pk},
+            'api_v1_customer': {'pk': customer_id},
+            'api_v1_customer_asset': {'pk': customer_asset.pk},
+        }
+
+    @staticmethod
+    def __get_url_names():
+        url_patterns = main_url_patterns + customers_url_patterns + master_data_url_patterns + api_url_patterns
+        return [x.name for x in url_patterns if x.name]
+
+    def test_query_budgets__expect_budget_declared_for_every_url(self):
+        budgets = get_query_budgets()
+
+        for url_name in self.__get_url_names():
+            with self.subTest(url_name=url_name):
+                self.assertIn(url_name, budgets)
+
+    def test_get__expect_queries_within_budget(self):
+        url_kwargs = self.__get_url_kwargs()
+
+        for url_name in self.__get_url_names():
+            if url_name in self.NOT_RENDERED_URL_NAMES:
+                continue
+
+            with self.subTest(url_name=url_name):
+                # The budgets are for the pages rendered without cached fragments
+                cache.clear()
+                url = reverse(url_name, kwargs=url_kwargs.get(url_name))
+                # Outside of the test transaction the on-commit callbacks run within the request.
+                # A query per row would make the budget depend on the number of rows
+                with self.assertQueryBudget(url_name), self.assertNoRepeatedQueries(threshold=self.ROWS_COUNT), \
+                        self.captureOnCommitCallbacks(execute=True):
+                    response = self.client.get(url)
+
+                self.assertLess(response.status_code, 400)
+
+    def test_query_recorder__when_relation_is_loaded_per_row__expect_repeated_shape(self):
+        recorder = QueryRecorder()
+        with recorder.record():
+            service_orders = list(ServiceOrderHeader.objects.filter(is_serviced=False))
+            for service_order in service_orders:
+                str(service_order.customer_asset.asset)
+
+        repeated_shapes = recorder.repeated_shapes(threshold=self.ROWS_COUNT)
+
+        self.assertEqual(len(repeated_shapes), 4)
+        self.assertTrue(all(times == self.ROWS_COUNT for times in repeated_shapes.values()))
+
+    def test_query_recorder__when_relation_is_selected__expect_no_repeated_shape(self):
+        with self.assertNoRepeatedQueries(threshold=2):
+            service_orders = ServiceOrderHeader.objects.filter(is_serviced=False) \
+                .select_related('customer_asset__asset__brand', 'customer_asset__asset__category')
+            for service_order in service_orders:
+                str(service_order.customer_asset.asset)
@@ -0,0 +1,91 @@
+import datetime
+import re
+
+from django.db import connection
+from django.test import RequestFactory, TestCase
+
+from service_manager.core.pagination import KeysetPaginator, NEXT, encode_cursor
+from service_manager.main.models import ServiceOrderHeader
+from service_manager.main.views import ServiceOrderHeaderPendingServiceListView, ServiceOrderHeaderServicedListView
+from service_manager.reports.views import FinishedOrdersListView
+
+
+class QueryPlansTests(TestCase):
+    """
+    Snapshot the indexes the planner picks for the hot service order queries and fail when a query
+    falls back to scanning the whole service order table.
+    On PostgreSQL sequential scans are disabled while explaining, so the plan shows whether an index can be used
+    at all, even for the few rows of the test database.
+    """
+    TABLE = ServiceOrderHeader._meta.db_table
+
+    def __view(self, view_class, path, data=None):
+        view = view_class()
+        view.setup(RequestFactory().get(path, data=data or {}))
+        return view
+
+    def __view_queryset(self, view_class, path, data=None):
+        return self.__view(view_class, path, data).get_queryset()
+
+    def __explain(self, queryset):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            try:
+                return queryset.explain()
+            finally:
+                if connection.vendor == 'postgresql':
+                    cursor.execute('SET LOCAL enable_seqscan = on')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = self.__explain(queryset)
+
+        full_scans = (
+            rf'Seq Scan on "?{self.TABLE}"?',
+            rf'\bSCAN "?{self.TABLE}"?(?!\S* USING)(?: AS \S+)?$',
+        )
+        for pattern in full_scans:
+            self.assertIsNone(re.search(pattern, plan, re.MULTILINE), f'Sequential scan of {self.TABLE}:\n{plan}')
+        self.assertIn(index_name, plan, f'{index_name} is not used:\n{plan}')
+
+    def __first_page(self, queryset):
+        return KeysetPaginator(queryset, 10, queryset.query.order_by).page_queryset()
+
+    def __next_page(self, queryset):
+        cursor = encode_cursor(NEXT, [datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc), 1])
+        return KeysetPaginator(queryset, 10, queryset.query.order_by).page_queryset(cursor)
+
+    def test_pending_queue__expect_pending_index(self):
+        queryset = self.__view_queryset(ServiceOrderHeaderPendingServiceListView, '/service-orders/pending/')
+
+        self.assertUsesIndex(self.__first_page(queryset), 'soh_pending_idx')
+        self.assertUsesIndex(self.__next_page(queryset), 'soh_pending_idx')
+
+    def test_serviced_queue__expect_serviced_index(self):
+        queryset = self.__view_queryset(ServiceOrderHeaderServicedListView, '/service-orders/serviced/')
+
+        self.assertUsesIndex(self.__first_page(queryset), 'soh_serviced_idx')
+        self.assertUsesIndex(self.__next_page(queryset), 'soh_serviced_idx')
+
+    def test_finished_orders_report__expect_completed_index(self):
+        # The list joins the live orders with the archived ones, the live ones are the hot query
+        view = self.__view(FinishedOrdersListView, '/reports/', {'from': '2022-01-01', 'to': '2022-01-31'})
+        queryset = view.get_finished_orders()
+
+        self.assertUsesIndex(queryset, 'soh_completed_idx')
+
+    def test_customer_open_orders__expect_customer_index(self):
+        queryset = ServiceOrderHeader.objects.filter(customer_id=1, is_completed=False)
+
+        self.assertUsesIndex(queryset, 'soh_customer_completed_idx')
+
+    def test_customer_asset_history__expect_asset_index(self):
+        queryset = ServiceOrderHeader.objects.filter(customer_asset_id=1).order_by('-created_on')
+
+        self.assertUsesIndex(queryset, 'soh_asset_created_idx')
+
+    def test_unindexed_query__expect_sequential_scan_reported(self):
+        queryset = ServiceOrderHeader.objects.filter(problem_description='Broken screen')
+
+        with self.assertRaisesMessage(AssertionError, 'Sequential scan'):
+            self.assertUsesIndex(queryset, 'soh_pending_idx')
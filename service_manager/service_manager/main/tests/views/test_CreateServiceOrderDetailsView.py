@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from service_manager.accounts.models import Profile
+from service_manager.customers.models import Customer, CustomerAsset
+from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail
+from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset, MaterialCategory, \
+    Material
+
+UserModel = get_user_model()
+
+
+class CreateServiceOrderDetailsViewTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        cache.clear()
+        user = UserModel.objects.create_user(**self.USER_DATA)
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=user)
+        for codename in ('add_serviceorderdetail', 'view_serviceorderheader'):
+            user.user_permissions.add(Permission.objects.get(codename=codename))
+
+        customer = Customer.objects.create(
+            type=CustomerType.objects.create(name='Business'),
+            name='Testing Inc.',
+            email_address='testing@inc.com',
+            phone_number='100921122',
+        )
+        asset = Asset.objects.create(
+            category=AssetCategory.objects.create(name='Phones'),
+            brand=Brand.objects.create(name='Apple'),
+            model_name='iPhone',
+            model_number='13 Pro',
+        )
+        self.service_order = ServiceOrderHeader.objects.create(
+            customer=customer,
+            customer_asset=CustomerAsset.objects.create(customer=customer, asset=asset),
+            problem_description='Broken screen',
+            send_emails=False,
+        )
+        category = MaterialCategory.objects.create(name='Parts')
+        self.screen = Material.objects.create(name='Screen', price=100, category=category)
+        self.labor = Material.objects.create(name='Labor', price=20, category=category)
+
+        self.client.login(**self.USER_DATA)
+
+    def __post(self, lines, total_forms=5):
+        data = {
+            'form-TOTAL_FORMS': total_forms,
+            'form-INITIAL_FORMS': 0,
+        }
+        for (i, line) in enumerate(lines):
+            data.update({f'form-{i}-{name}': value for (name, value) in line.items()})
+        for i in range(len(lines), total_forms):
+            data.update({f'form-{i}-material': '', f'form-{i}-quantity': 1, f'form-{i}-discount': 0})
+        return self.client.post(reverse('create_service_order_details', kwargs={'order_id': self.service_order.pk}),
+                                data)
+
+    def test_get__expect_correct_template(self):
+        response = self.client.get(reverse('create_service_order_details',
+                                           kwargs={'order_id': self.service_order.pk}))
+
+        self.assertEqual(200, response.status_code)
+        self.assertTemplateUsed(response, 'service_order_detail/service_order_details_batch_create.html')
+
+    def test_post__when_lines_are_valid__expect_saved_and_total_refreshed(self):
+        response = self.__post([
+            {'material': self.screen.pk, 'quantity': 1, 'discount': 10},
+            {'material': self.labor.pk, 'quantity': 2, 'discount': 0},
+        ])
+
+        self.assertRedirects(response, reverse('create_service_order_detail',
+                                               kwargs={'order_id': self.service_order.pk}))
+        self.assertEqual(2, ServiceOrderDetail.objects.filter(service_order=self.service_order).count())
+        self.service_order.refresh_from_db()
+        self.assertEqual(130, self.service_order.total_amount)
+
+    def test_post__when_a_line_is_invalid__expect_nothing_saved(self):
+        response = self.__post([
+            {'material': self.screen.pk, 'quantity': 1, 'discount': 0},
+            {'material': 0, 'quantity': 1, 'discount': 0},
+        ])
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn('material', response.context['form'].errors[1])
+        self.assertFalse(ServiceOrderDetail.objects.exists())
+
+    def test_post__when_no_line_is_entered__expect_error(self):
+        response = self.__post([])
+
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.context['form'].non_form_errors())
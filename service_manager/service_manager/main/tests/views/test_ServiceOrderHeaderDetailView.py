@@ -1,10 +1,18 @@
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from service_manager.customers.models import Customer, CustomerAsset
-from service_manager.main.models import ServiceOrderHeader
-from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset
+from service_manager.accounts.models import Profile
+from service_manager.core.identity_map import IdentityMapMiddleware, get_identity_map
+from service_manager.customers.models import Customer, CustomerAsset, CustomerRepresentative
+from service_manager.main.models import ServiceOrderHeader, ServiceOrderNote, ServiceOrderDetail
+from service_manager.main.templatetags.common_tags import soh_is_completed_without_notes
+from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset, MaterialCategory, \
+    Material
 
 UserModel = get_user_model()
 
@@ -75,3 +83,356 @@ class ServiceOrderHeaderDetailViewTests(TestCase):
 
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, f'/accounts/login/?next=/service_order/{service_order.pk}/')
+
+
+class ServiceOrderHeaderDetailViewNotesTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        self.user = UserModel.objects.create_user(**self.USER_DATA)
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=self.user)
+        self.user.user_permissions.add(Permission.objects.get(codename='view_serviceorderheader'))
+
+        customer = Customer.objects.create(
+            type=CustomerType.objects.create(name='Business'),
+            name='Testing Inc.',
+            vat='123444121',
+            email_address='testing@inc.com',
+            phone_number='100921122',
+        )
+        asset = Asset.objects.create(
+            category=AssetCategory.objects.create(name='Monitor'),
+            brand=Brand.objects.create(name='Apple'),
+            model_name='iPhone',
+            model_number='13 Pro',
+        )
+        customer_asset = CustomerAsset.objects.create(
+            customer=customer,
+            asset=asset,
+            serial_number='SN-Apple-21',
+            product_number='California-PN_33',
+        )
+        self.service_order = ServiceOrderHeader.objects.create(
+            customer=customer,
+            customer_asset=customer_asset,
+            problem_description='First SOH Description',
+            send_emails=False,
+        )
+        ServiceOrderNote.objects.create(service_order=self.service_order, created_by=self.user, note='Checked')
+        ServiceOrderNote.objects.create(service_order=self.service_order, created_by=self.user, note='Removed',
+                                        active=False)
+
+    def test_get__when_notes_are_rendered__expect_notes_loaded_once(self):
+        self.client.login(**self.USER_DATA)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('detail_service_order', kwargs={'pk': self.service_order.pk}))
+
+        notes_table = ServiceOrderNote._meta.db_table
+        notes_queries = [x['sql'] for x in context.captured_queries if f'FROM "{notes_table}"' in x['sql']]
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(1, len(notes_queries))
+        self.assertContains(response, 'Checked')
+        self.assertNotContains(response, 'Removed')
+
+    def test_filter__when_service_order_is_registered__expect_no_queries(self):
+        def get_response(request):
+            service_order = get_identity_map().add(
+                ServiceOrderHeader.objects.prefetch_related('serviceordernote_set').get(pk=self.service_order.pk))
+
+            with self.assertNumQueries(0):
+                self.assertFalse(soh_is_completed_without_notes(service_order.pk))
+                self.assertFalse(soh_is_completed_without_notes(service_order.pk))
+
+        IdentityMapMiddleware(get_response)(None)
+
+
+class ServiceOrderHeaderDetailViewFragmentCacheTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        cache.clear()
+
+        self.user = UserModel.objects.create_user(**self.USER_DATA)
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=self.user)
+        for codename in ('view_serviceorderheader', 'change_serviceorderdetail'):
+            self.user.user_permissions.add(Permission.objects.get(codename=codename))
+
+        self.customer = Customer.objects.create(
+            type=CustomerType.objects.create(name='Business'),
+            name='Testing Inc.',
+            vat='123444121',
+            email_address='testing@inc.com',
+            phone_number='100921122',
+        )
+        self.brand = Brand.objects.create(name='Apple')
+        asset = Asset.objects.create(
+            category=AssetCategory.objects.create(name='Monitor'),
+            brand=self.brand,
+            model_name='iPhone',
+            model_number='13 Pro',
+        )
+        customer_asset = CustomerAsset.objects.create(
+            customer=self.customer,
+            asset=asset,
+            serial_number='SN-Apple-21',
+            product_number='California-PN_33',
+        )
+        self.representative = CustomerRepresentative.objects.create(
+            customer=self.customer,
+            first_name='Jane',
+            last_name='Doe',
+            phone_number='100921123',
+        )
+        self.service_order = ServiceOrderHeader.objects.create(
+            customer=self.customer,
+            customer_asset=customer_asset,
+            handed_over_by=self.representative,
+            accepted_by=self.user,
+            problem_description='First SOH Description',
+            send_emails=False,
+        )
+        self.material_category = MaterialCategory.objects.create(name='Parts')
+        self.material = Material.objects.create(
+            name='Screen',
+            price=100,
+            category=self.material_category,
+        )
+        for _ in range(3):
+            ServiceOrderDetail.objects.create(service_order=self.service_order, material=self.material, quantity=1,
+                                              discount=0)
+        ServiceOrderNote.objects.create(service_order=self.service_order, created_by=self.user, note='Checked')
+
+        self.client.login(**self.USER_DATA)
+
+    def __get(self):
+        return self.client.get(reverse('detail_service_order', kwargs={'pk': self.service_order.pk}))
+
+    def test_get__when_page_was_rendered__expect_notes_and_details_not_loaded(self):
+        self.__get()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.__get()
+
+        tables = (ServiceOrderNote._meta.db_table, ServiceOrderDetail._meta.db_table)
+        queries = [x['sql'] for x in context.captured_queries if any(f'FROM "{table}"' in x['sql'] for table in tables)]
+        self.assertEqual([], queries)
+        self.assertContains(response, 'Checked')
+        self.assertContains(response, 'Screen')
+
+    def test_get__when_note_is_added__expect_note_shown(self):
+        self.__get()
+
+        ServiceOrderNote.objects.create(service_order=self.service_order, created_by=self.user, note='Replaced')
+        response = self.__get()
+
+        self.assertContains(response, 'Replaced')
+
+    def test_get__when_customer_is_renamed__expect_new_name_shown(self):
+        self.__get()
+
+        self.customer.name = 'Renamed Inc.'
+        self.customer.save()
+        response = self.__get()
+
+        self.assertContains(response, 'Renamed Inc.')
+
+    def test_get__when_material_is_renamed__expect_new_name_shown(self):
+        self.__get()
+
+        self.material.name = 'Display'
+        self.material.save()
+        response = self.__get()
+
+        self.assertContains(response, 'Display')
+
+    def test_get__when_material_is_renamed__expect_notes_not_loaded_again(self):
+        self.__get()
+
+        self.material.name = 'Display'
+        self.material.save()
+        with CaptureQueriesContext(connection) as context:
+            response = self.__get()
+
+        table = ServiceOrderNote._meta.db_table
+        self.assertEqual([], [x['sql'] for x in context.captured_queries if f'FROM "{table}"' in x['sql']])
+        self.assertContains(response, 'Display')
+
+    def test_get__when_details_are_rendered__expect_them_loaded_with_one_query(self):
+        with CaptureQueriesContext(connection) as context:
+            self.__get()
+
+        tables = (ServiceOrderDetail._meta.db_table, Material._meta.db_table, MaterialCategory._meta.db_table)
+        queries = [x['sql'] for x in context.captured_queries if any(f'FROM "{table}"' in x['sql'] for table in tables)]
+        self.assertEqual(1, len(queries))
+
+    def test_get__when_material_category_is_renamed__expect_new_name_shown(self):
+        self.__get()
+
+        self.material_category.name = 'Spare Parts'
+        self.material_category.save()
+        response = self.__get()
+
+        self.assertContains(response, 'Spare Parts')
+
+    def test_get__when_brand_is_renamed__expect_new_name_shown(self):
+        self.__get()
+
+        self.brand.name = 'Samsung'
+        self.brand.save()
+        response = self.__get()
+
+        self.assertContains(response, 'Samsung')
+
+    def test_get__when_representative_is_renamed__expect_new_name_shown(self):
+        self.__get()
+
+        self.representative.first_name = 'John'
+        self.representative.save()
+        response = self.__get()
+
+        self.assertContains(response, 'John Doe')
+
+    def test_get__when_profile_of_user_is_renamed__expect_new_display_name_shown(self):
+        self.__get()
+
+        profile = Profile.objects.get(app_user=self.user)
+        profile.last_name = 'Renamed'
+        profile.save()
+        response = self.__get()
+
+        self.assertContains(response, 'Dev Renamed')
+
+    def test_get__when_user_lacks_permission__expect_separate_fragment(self):
+        self.__get()
+
+        self.user.user_permissions.remove(Permission.objects.get(codename='change_serviceorderdetail'))
+        self.user = UserModel.objects.get(pk=self.user.pk)
+        response = self.__get()
+
+        self.assertNotContains(response, reverse('complete_service_order', kwargs={'pk': self.service_order.pk}))
+
+
+class ServiceOrderHeaderDetailViewConditionalGetTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        cache.clear()
+
+        self.user = UserModel.objects.create_user(**self.USER_DATA)
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=self.user)
+        self.user.user_permissions.add(Permission.objects.get(codename='view_serviceorderheader'))
+
+        self.customer = Customer.objects.create(
+            type=CustomerType.objects.create(name='Business'),
+            name='Testing Inc.',
+            email_address='testing@inc.com',
+            phone_number='100921122',
+        )
+        customer_asset = CustomerAsset.objects.create(
+            customer=self.customer,
+            asset=Asset.objects.create(
+                category=AssetCategory.objects.create(name='Monitor'),
+                brand=Brand.objects.create(name='Apple'),
+                model_name='iPhone',
+                model_number='13 Pro',
+            ),
+        )
+        self.representative = CustomerRepresentative.objects.create(
+            customer=self.customer,
+            first_name='Jane',
+            last_name='Doe',
+            phone_number='100921123',
+        )
+        self.service_order = ServiceOrderHeader.objects.create(
+            customer=self.customer,
+            customer_asset=customer_asset,
+            handed_over_by=self.representative,
+            accepted_by=self.user,
+            problem_description='First SOH Description',
+            send_emails=False,
+        )
+        self.material_category = MaterialCategory.objects.create(name='Parts')
+        ServiceOrderDetail.objects.create(
+            service_order=self.service_order,
+            material=Material.objects.create(name='Screen', price=100, category=self.material_category),
+            quantity=1,
+            discount=0,
+        )
+
+        self.client.login(**self.USER_DATA)
+
+    def __get(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(reverse('detail_service_order', kwargs={'pk': self.service_order.pk}), **headers)
+
+    def test_get__when_page_is_unchanged__expect_not_modified(self):
+        etag = self.__get()['ETag']
+
+        response = self.__get(etag)
+
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(b'', response.content)
+
+    def test_get__when_note_is_added__expect_page_rendered(self):
+        etag = self.__get()['ETag']
+
+        ServiceOrderNote.objects.create(service_order=self.service_order, created_by=self.user, note='Checked')
+        response = self.__get(etag)
+
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response['ETag'])
+
+    def test_get__when_customer_is_renamed__expect_page_rendered(self):
+        etag = self.__get()['ETag']
+
+        self.customer.name = 'Renamed Inc.'
+        self.customer.save()
+        response = self.__get(etag)
+
+        self.assertContains(response, 'Renamed Inc.')
+
+    def test_get__when_representative_is_renamed__expect_page_rendered(self):
+        etag = self.__get()['ETag']
+
+        self.representative.first_name = 'John'
+        self.representative.save()
+        response = self.__get(etag)
+
+        self.assertContains(response, 'John Doe')
+
+    def test_get__when_material_category_is_renamed__expect_page_rendered(self):
+        etag = self.__get()['ETag']
+
+        self.material_category.name = 'Spare Parts'
+        self.material_category.save()
+        response = self.__get(etag)
+
+        self.assertContains(response, 'Spare Parts')
+
+    def test_get__when_profile_of_user_is_renamed__expect_page_rendered(self):
+        etag = self.__get()['ETag']
+
+        profile = Profile.objects.get(app_user=self.user)
+        profile.last_name = 'Renamed'
+        profile.save()
+        response = self.__get(etag)
+
+        self.assertContains(response, 'Dev Renamed')
+
+    def test_get__when_permissions_change__expect_page_rendered(self):
+        etag = self.__get()['ETag']
+
+        self.user.user_permissions.add(Permission.objects.get(codename='change_serviceorderheader'))
+        response = self.__get(etag)
+
+        self.assertEqual(200, response.status_code)
@@ -1,7 +1,11 @@
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from service_manager.accounts.models import Profile
 from service_manager.customers.models import Customer, CustomerAsset
 from service_manager.main.models import ServiceOrderHeader
 from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset
@@ -115,3 +119,100 @@ class ServiceOrderHeaderPendingServiceListViewTests(TestCase):
         context = response.context['object_list']
         self.assertEqual(len(context), 1)
         self.assertQuerysetEqual(context, service_orders, transform=lambda x: x)
+
+
+class ServiceOrderHeaderPendingServiceListViewPaginationTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        customer_type = CustomerType.objects.create(
+            name='Business'
+        )
+
+        customer = Customer.objects.create(
+            type=customer_type,
+            name='Testing Inc.',
+            vat='123444121',
+            email_address='testing@inc.com',
+            phone_number='100921122',
+        )
+
+        asset = Asset.objects.create(
+            category=AssetCategory.objects.create(name='Mobile'),
+            brand=Brand.objects.create(name='Apple'),
+            model_name='iPhone',
+            model_number='13 Pro',
+        )
+
+        CustomerAsset.objects.create(
+            customer=customer,
+            asset=asset,
+            serial_number='SN-Apple-21',
+            product_number='California-PN_33',
+        )
+
+    def __login_with_view_permission(self):
+        user = UserModel.objects.create_user(**self.USER_DATA)
+        user.user_permissions.add(Permission.objects.get(codename='view_serviceorderheader'))
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=user)
+        self.client.login(**self.USER_DATA)
+        return user
+
+    def __create_service_orders(self, count, accepted_by):
+        customer_asset = CustomerAsset.objects.first()
+        for i in range(count):
+            ServiceOrderHeader.objects.create(
+                customer=customer_asset.customer,
+                customer_asset=customer_asset,
+                problem_description=f'SOH Description {i}',
+                accepted_by=accepted_by,
+                send_emails=False,
+            )
+
+    def test_get__when_more_orders_than_page_size__expect_paginated(self):
+        user = self.__login_with_view_permission()
+        self.__create_service_orders(15, user)
+
+        url = reverse('service_orders_list_pending_service')
+        first_page = self.client.get(url)
+        response = self.client.get(url, data={'cursor': first_page.context['page_obj'].next_cursor})
+
+        self.assertTrue(response.context['is_paginated'])
+        self.assertEqual(response.context['paginator'].count, 15)
+        self.assertEqual(len(response.context['object_list']), 5)
+        self.assertFalse(response.context['page_obj'].has_next())
+
+    def test_get__when_sorted_by_id_descending__expect_newest_first(self):
+        user = self.__login_with_view_permission()
+        self.__create_service_orders(3, user)
+
+        response = self.client.get(reverse('service_orders_list_pending_service'), data={'sort': '-id'})
+
+        service_orders = ServiceOrderHeader.objects.filter(is_serviced=False).order_by('-pk')
+        self.assertQuerysetEqual(response.context['object_list'], service_orders, transform=lambda x: x)
+
+    def test_get__when_sort_is_not_allowed__expect_default_sort(self):
+        self.__login_with_view_permission()
+
+        response = self.client.get(reverse('service_orders_list_pending_service'), data={'sort': 'problem_description'})
+
+        self.assertEqual(response.context['sort'], 'created_on')
+
+    def test_get__when_rows_are_added__expect_same_number_of_queries(self):
+        user = self.__login_with_view_permission()
+        url = reverse('service_orders_list_pending_service')
+        self.__create_service_orders(2, user)
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as few_rows_queries:
+            self.client.get(url)
+
+        self.__create_service_orders(8, user)
+
+        with CaptureQueriesContext(connection) as many_rows_queries:
+            self.client.get(url)
+
+        self.assertEqual(len(few_rows_queries), len(many_rows_queries))
@@ -1,8 +1,13 @@
+import datetime
+
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
 from django.db.models import Q
 from django.test import TestCase
 from django.urls import reverse
 
+from service_manager.accounts.models import Profile
 from service_manager.customers.models import Customer, CustomerAsset
 from service_manager.main.models import ServiceOrderHeader
 from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset
@@ -116,3 +121,75 @@ class ServiceOrderHeaderServicedListViewTests(TestCase):
 
         self.assertEqual(len(context), 1)
         self.assertQuerysetEqual(context, service_orders, transform=lambda x: x)
+
+
+class ServiceOrderHeaderServicedListViewPaginationTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        cache.clear()
+        user = UserModel.objects.create_user(**self.USER_DATA)
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=user)
+        user.user_permissions.add(Permission.objects.get(codename='view_serviceorderheader'))
+        self.client.login(**self.USER_DATA)
+
+        customer_asset = CustomerAsset.objects.create(
+            customer=Customer.objects.create(
+                type=CustomerType.objects.create(name='Business'),
+                name='Testing Inc.',
+                email_address='testing@inc.com',
+                phone_number='100921122',
+            ),
+            asset=Asset.objects.create(
+                category=AssetCategory.objects.create(name='Mobile'),
+                brand=Brand.objects.create(name='Apple'),
+                model_name='iPhone',
+                model_number='13 Pro',
+            ),
+        )
+        # The admin can mark an order serviced without the time it was serviced
+        for i in range(15):
+            ServiceOrderHeader.objects.create(
+                customer=customer_asset.customer,
+                customer_asset=customer_asset,
+                problem_description='Broken screen',
+                is_serviced=True,
+                serviced_on=datetime.datetime(2022, 1, i + 1, tzinfo=datetime.timezone.utc) if i % 3 == 0 else None,
+                send_emails=False,
+            )
+
+    def __follow(self, cursor_name, **params):
+        url = reverse('service_orders_list_serviced')
+        response = self.client.get(url, params)
+        pages = [[x.pk for x in response.context['object_list']]]
+        while getattr(response.context['page_obj'], f'has_{cursor_name}')():
+            cursor = getattr(response.context['page_obj'], f'{cursor_name}_cursor')
+            response = self.client.get(url, {**params, 'cursor': cursor})
+            self.assertEqual(200, response.status_code)
+            pages.append([x.pk for x in response.context['object_list']])
+        return pages
+
+    def test_get__when_serviced_on_is_null__expect_every_order_once(self):
+        for sort in ('serviced_on', '-serviced_on'):
+            with self.subTest(sort=sort):
+                pks = sum(self.__follow('next', sort=sort), [])
+
+                self.assertEqual(sorted(ServiceOrderHeader.objects.values_list('pk', flat=True)), sorted(pks))
+                self.assertEqual(len(pks), len(set(pks)))
+
+    def test_get__when_going_back_from_last_page__expect_same_pages(self):
+        pages = self.__follow('next')
+        response = self.client.get(reverse('service_orders_list_serviced'),
+                                   {'cursor': self.__last_page_previous_cursor(pages)})
+
+        self.assertEqual(pages[-2], [x.pk for x in response.context['object_list']])
+
+    def __last_page_previous_cursor(self, pages):
+        url = reverse('service_orders_list_serviced')
+        response = self.client.get(url)
+        for _ in pages[1:]:
+            response = self.client.get(url, {'cursor': response.context['page_obj'].next_cursor})
+        return response.context['page_obj'].previous_cursor
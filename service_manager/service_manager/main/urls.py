@@ -1,14 +1,13 @@
 from django.conf import settings
 from django.conf.urls.static import static
 from django.urls import path
-import service_manager.main.signals
 from service_manager.main.views import get_index, ServiceOrderHeaderPendingServiceListView, \
     ServiceOrderHeaderDetailView, \
     CreateServiceOrderHeader, CreateServiceOrderDetailView, ServiceOrderDetailsListView, \
     EditServiceOrderDetailView, DeleteServiceOrderDetailView, complete_service_order, CreateServiceOrderNoteView, \
     ServiceOrderNotesListView, EditServiceOrderNoteView, DeleteServiceOrderNoteView, DeleteServiceOrderHeaderView, \
     ServiceOrderHeaderServicedListView, rollback_service_order, HandoverServiceOrderView, ServiceOrderNoteDetailView, \
-    contact_us
+    contact_us, CreateServiceOrderDetailsView
 
 urlpatterns = [
                   path('', get_index, name='index'),
@@ -26,6 +25,9 @@ urlpatterns = [
                   path('service_order/<int:order_id>/service_order_detail/create/',
                        CreateServiceOrderDetailView.as_view(),
                        name='create_service_order_detail'),
+                  path('service_order/<int:order_id>/service_order_details/create/',
+                       CreateServiceOrderDetailsView.as_view(),
+                       name='create_service_order_details'),
                   path('service_order/<int:order_id>/service_order_details/', ServiceOrderDetailsListView.as_view(),
                        name='service_order_details'),
                   path('service_order/<int:order_id>/service_order_detail/edit/<int:pk>/',
@@ -49,3 +51,27 @@ urlpatterns = [
                        name='handover_service_order'),
                   path('service_order/<int:pk>/rollback/', rollback_service_order, name='rollback_service_order'),
               ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+# Maximum number of queries per page, enforced by main/tests/test_query_budgets.py
+query_budgets = {
+    'index': 5,
+    'contact_us': 5,
+    'service_orders_list_pending_service': 6,
+    'service_orders_list_serviced': 6,
+    'detail_service_order': 9,
+    'create_service_order': 9,
+    'delete_service_order': 6,
+    'create_service_order_detail': 9,
+    'create_service_order_details': 9,
+    'service_order_details': 4,
+    'edit_service_order_detail': 8,
+    'delete_service_order_detail': 8,
+    'complete_service_order': 7,
+    'create_service_order_note': 6,
+    'service_order_notes': 4,
+    'service_order_note_detail': 7,
+    'edit_service_order_note': 7,
+    'delete_service_order_note': 6,
+    'handover_service_order': 8,
+    'rollback_service_order': 7,
+}
@@ -1,17 +1,26 @@
 import datetime
 
+from django.conf import settings
 from django.contrib.auth.decorators import permission_required
 from django.db.models import Q
-from django.shortcuts import render, redirect
+from django.http import Http404
+from django.shortcuts import render, redirect, get_object_or_404
 import django.views.generic as views
 from django.urls import reverse_lazy, reverse
 from django.contrib.auth import mixins as auth_mixins
 
+from service_manager.core.identity_map import get_identity_map
+from service_manager.core.pagination import KeysetPaginationMixin
+from service_manager.core import fragment_cache
+from service_manager.core.views import SortableListViewMixin, ConditionalGetMixin, ReplicaReadMixin
+from service_manager.mailing import outbox
 from service_manager.main.forms import CreateServiceOrderHeaderForm, CreateServiceOrderDetailForm, \
-    EditServiceOrderDetailForm, CreateServiceOrderNoteForm, HandoverServiceOrderForm, ContactForm
+    EditServiceOrderDetailForm, CreateServiceOrderNoteForm, HandoverServiceOrderForm, ContactForm, \
+    ServiceOrderDetailLinesFormSet
 from service_manager.main.models import Customer, CustomerAsset, ServiceOrderHeader, ServiceOrderDetail, \
-    ServiceOrderNote
+    ServiceOrderNote, ArchivedServiceOrderHeader, Material
 from service_manager.main.tasks import send_contact_us_email
+from service_manager.main.templatetags.common_tags import soh_details_fragment_version
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
 
@@ -20,45 +29,94 @@ def get_index(request):
     return render(request, 'index.html')
 
 
-class ServiceOrderHeaderPendingServiceListView(auth_mixins.PermissionRequiredMixin, views.ListView):
+class ServiceOrderHeaderPendingServiceListView(ReplicaReadMixin, auth_mixins.PermissionRequiredMixin,
+                                               SortableListViewMixin, KeysetPaginationMixin, views.ListView):
     model = ServiceOrderHeader
     template_name = 'service_order_header/list_views/service_orders_service.html'
-    ordering = ('created_on', 'customer')
-    RELATED_ENTITIES = ['serviceordernote_set', 'serviceorderdetail_set', ]
+    paginate_by = 10
+    sort_fields = {
+        'id': 'pk',
+        'created_on': 'created_on',
+    }
+    default_sort = 'created_on'
+    RELATED_ENTITIES = ['customer', 'customer_asset__asset__brand', 'customer_asset__asset__category',
+                        'accepted_by', ]
 
     permission_required = 'main.view_serviceorderheader'
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        return queryset.filter(is_serviced=False).prefetch_related(*self.RELATED_ENTITIES)
+        return queryset.filter(is_serviced=False).select_related(*self.RELATED_ENTITIES)
 
 
-class ServiceOrderHeaderServicedListView(auth_mixins.PermissionRequiredMixin, views.ListView):
+class ServiceOrderHeaderServicedListView(ReplicaReadMixin, auth_mixins.PermissionRequiredMixin,
+                                         SortableListViewMixin, KeysetPaginationMixin, views.ListView):
     model = ServiceOrderHeader
     template_name = 'service_order_header/list_views/service_orders_complete.html'
-    ordering = ('serviced_on', 'customer')
-    RELATED_ENTITIES = ['serviceordernote_set', 'serviceorderdetail_set', ]
+    paginate_by = 10
+    sort_fields = {
+        'id': 'pk',
+        'created_on': 'created_on',
+        'serviced_on': 'serviced_on',
+    }
+    default_sort = 'serviced_on'
+    RELATED_ENTITIES = ['customer', 'customer_asset__asset__brand', 'customer_asset__asset__category', ]
 
     permission_required = 'main.view_serviceorderheader'
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        return queryset.filter(Q(is_serviced=True) & Q(is_completed=False)).prefetch_related(*self.RELATED_ENTITIES)
+        return queryset.filter(Q(is_serviced=True) & Q(is_completed=False)) \
+            .select_related(*self.RELATED_ENTITIES)
 
 
-class ServiceOrderHeaderDetailView(auth_mixins.PermissionRequiredMixin, views.DetailView):
+class ServiceOrderHeaderDetailView(auth_mixins.PermissionRequiredMixin, ConditionalGetMixin, views.DetailView):
     model = ServiceOrderHeader
     template_name = 'service_order_header/core/service_order_details.html'
     context_object_name = 'service_order_header'
+    RELATED_ENTITIES = ['customer__type', 'customer_asset__asset__category', 'customer_asset__asset__brand',
+                        'department', 'handed_over_by', 'accepted_by', 'serviced_by', 'handed_over_to',
+                        'completed_by', ]
 
     permission_required = 'main.view_serviceorderheader'
 
+    # The total amount is refreshed with a bulk update, which doesn't change updated_on
+    etag_fields = ('updated_on', 'total_amount', 'customer__updated_on', 'customer__type__updated_on',
+                   'customer_asset__updated_on', 'customer_asset__asset__updated_on',
+                   'customer_asset__asset__category__updated_on', 'customer_asset__asset__brand__updated_on',
+                   'department__updated_on', 'handed_over_by__updated_on', 'handed_over_to__updated_on',
+                   'accepted_by__display_name', 'serviced_by__display_name', 'completed_by__display_name')
+
+    # The detail lines and the notes are covered by the version of the cached fragments and the materials
+    # of the lines by their own versions, which the signals bump when they change,
+    # so the unchanged pages don't query them
+    def get_etag_versions(self):
+        service_order = ServiceOrderHeader(pk=self.kwargs['pk'])
+        return [fragment_cache.get_versions(service_order), soh_details_fragment_version(service_order)]
+
     # Override the queryset in order to include the (soft) deleted SOHs
     # This is needed when showing the service history of a given Customer Asset
     def get_queryset(self, *args, **kwargs):
-        queryset = ServiceOrderHeader.all_records.all()
+        queryset = ServiceOrderHeader.all_records.select_related(*self.RELATED_ENTITIES)
         return queryset
 
+    # Register the SOH, so the template tags reuse it together with its notes
+    # The archived SOHs (see main/archive.py) are read from the archive tables, which have no ETag
+    def get_object(self, queryset=None):
+        try:
+            service_order = super().get_object(queryset)
+        except Http404:
+            service_order = get_object_or_404(
+                ArchivedServiceOrderHeader.all_records.select_related(*self.RELATED_ENTITIES), pk=self.kwargs['pk'])
+        return get_identity_map().add(service_order)
+
+    # The notes and the detail lines are loaded only when their cached fragments are rendered again
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['fragment_cache_timeout'] = settings.SERVICE_ORDER_FRAGMENT_CACHE_TIMEOUT
+        context['is_archived'] = isinstance(self.object, ArchivedServiceOrderHeader)
+        return context
+
 
 class CreateServiceOrderHeader(auth_mixins.PermissionRequiredMixin, views.CreateView):
     model = ServiceOrderHeader
@@ -131,8 +189,11 @@ class CreateServiceOrderDetailView(auth_mixins.PermissionRequiredMixin, views.Cr
 
         service_order_header_id = self.kwargs['order_id']
         if service_order_header_id:
-            context['service_order_header'] = ServiceOrderHeader.objects.prefetch_related(
-                'serviceorderdetail_set').get(pk=int(service_order_header_id))
+            context['service_order_header'] = get_identity_map().add(
+                ServiceOrderHeader.objects
+                .select_related(*ServiceOrderHeaderDetailView.RELATED_ENTITIES)
+                .get(pk=int(service_order_header_id)))
+            context['fragment_cache_timeout'] = settings.SERVICE_ORDER_FRAGMENT_CACHE_TIMEOUT
 
         return context
 
@@ -147,6 +208,39 @@ class CreateServiceOrderDetailView(auth_mixins.PermissionRequiredMixin, views.Cr
         return super().form_valid(form)
 
 
+class CreateServiceOrderDetailsView(auth_mixins.PermissionRequiredMixin, views.FormView):
+    """
+    Batch entry of detail lines: the lines are validated together, inserted with one query
+    and the total of the service order is refreshed once.
+    """
+    template_name = 'service_order_detail/service_order_details_batch_create.html'
+    form_class = ServiceOrderDetailLinesFormSet
+    # The initial data of a formset is a list, one item per form
+    initial = []
+
+    permission_required = 'main.add_serviceorderdetail'
+
+    def get_service_order_header(self):
+        return get_identity_map().add(
+            ServiceOrderHeader.objects
+            .select_related(*ServiceOrderHeaderDetailView.RELATED_ENTITIES)
+            .get(pk=int(self.kwargs['order_id'])))
+
+    def get_success_url(self):
+        return reverse_lazy('create_service_order_detail', kwargs={'order_id': self.kwargs['order_id']})
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['service_order_header'] = self.get_service_order_header()
+        context['fragment_cache_timeout'] = settings.SERVICE_ORDER_FRAGMENT_CACHE_TIMEOUT
+        return context
+
+    def form_valid(self, form):
+        service_order_header = ServiceOrderHeader.objects.get(pk=self.kwargs['order_id'])
+        ServiceOrderDetail.objects.bulk_create(form.to_instances(service_order_header))
+        return super().form_valid(form)
+
+
 class EditServiceOrderDetailView(auth_mixins.PermissionRequiredMixin, views.UpdateView):
     model = ServiceOrderDetail
     template_name = 'service_order_detail/service_order_detail_edit.html'
@@ -313,7 +407,7 @@ def contact_us(request):
                 'email_address': form.cleaned_data['email_address'],
                 'message': form.cleaned_data['message'],
             }
-            send_contact_us_email.delay(email_data)
+            outbox.publish(send_contact_us_email, email_data=email_data)
             messages.success(request, _("The email message was sent."))
             return redirect('index')
 
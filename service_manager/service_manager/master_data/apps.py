@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class MasterDataConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'service_manager.master_data'
+
+    def ready(self):
+        from service_manager.core import search
+
+        search.register(self.get_model('Asset'), ('model_name', 'model_number'))
+        search.register(self.get_model('Material'), ('name', 'category__name'))
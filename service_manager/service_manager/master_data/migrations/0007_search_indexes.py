@@ -0,0 +1,15 @@
+from django.db import migrations
+
+from service_manager.core.search import CreateSearchIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("master_data", "0006_alter_asset_brand_alter_asset_category_and_more"),
+    ]
+
+    operations = [
+        CreateSearchIndex(model_name="asset", fields=("model_name", "model_number")),
+        CreateSearchIndex(model_name="material", fields=("name", "category__name")),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 
 from service_manager.core.models import BaseAuditEntity, ActiveModel
+from service_manager.customers.managers import SearchIndexedManager
 from django.utils.translation import gettext_lazy as _
 
 
@@ -72,6 +73,8 @@ class Asset(ActiveModel, BaseAuditEntity):
         verbose_name=_('category'),
     )
 
+    objects = SearchIndexedManager()
+
     def __str__(self):
         return f'{self.brand} {self.model_name} {self.model_number} ({self.category})'
 
@@ -104,5 +107,7 @@ class Material(ActiveModel, BaseAuditEntity):
         verbose_name=_('category'),
     )
 
+    objects = SearchIndexedManager()
+
     def __str__(self):
         return f'{self.name} ({str(self.category)})'
@@ -28,3 +28,27 @@ urlpatterns = [
     path('asset_categories/<int:pk>/', EditAssetCategoryView.as_view(), name='edit_asset_category'),
     path('asset_categories/delete/<int:pk>/', DeleteAssetCategoryView.as_view(), name='delete_asset_category'),
 ]
+
+# Maximum number of queries per page, enforced by main/tests/test_query_budgets.py
+query_budgets = {
+    'assets_list': 6,
+    'create_asset': 7,
+    'edit_asset': 8,
+    'delete_asset': 6,
+    'materials_list': 6,
+    'create_material': 6,
+    'edit_material': 7,
+    'delete_material': 6,
+    'material_categories_list': 6,
+    'create_material_category': 5,
+    'edit_material_category': 6,
+    'delete_material_category': 6,
+    'brands_list': 6,
+    'create_brand': 5,
+    'edit_brand': 6,
+    'delete_brand': 6,
+    'asset_categories_list': 6,
+    'create_asset_category': 5,
+    'edit_asset_category': 6,
+    'delete_asset_category': 6,
+}
@@ -1,15 +1,17 @@
 import django.views.generic as views
-from django.db.models import Q
 from django.urls import reverse_lazy
 from django.contrib.auth import mixins as auth_mixins
 
-from service_manager.core.views import BootstrapFormViewMixin
+from service_manager.core.views import BootstrapFormViewMixin, ReplicaReadMixin
+from service_manager.core.pagination import KeysetPaginationMixin
+from service_manager.core.search import search
 from service_manager.master_data.forms import CreateAssetForm, EditAssetForm, CreateMaterialForm, EditMaterialForm, \
     EditMaterialCategoryForm, EditBrandForm, EditAssetCategoryForm
 from service_manager.master_data.models import Asset, Material, MaterialCategory, Brand, AssetCategory
 
 
-class AssetsListView(auth_mixins.PermissionRequiredMixin, views.ListView):
+class AssetsListView(ReplicaReadMixin, auth_mixins.PermissionRequiredMixin, KeysetPaginationMixin,
+                     views.ListView):
     model = Asset
     template_name = 'asset/assets.html'
     ordering = ('category', 'brand', 'model_name', 'model_number')
@@ -18,21 +20,12 @@ class AssetsListView(auth_mixins.PermissionRequiredMixin, views.ListView):
 
     permission_required = 'master_data.view_asset'
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-
-        request = self.request.GET.copy()
-        params = request.pop('page', True) and request.urlencode()
-        context['params'] = params
-
-        return context
-
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related('category', 'brand')
 
         search_text = self.request.GET.get('search_value', None)
         if search_text:
-            queryset = queryset.filter(Q(model_name__icontains=search_text) | Q(model_number__icontains=search_text))
+            queryset = search(queryset, search_text)
         return queryset
 
 
@@ -62,28 +55,20 @@ class DeleteAssetView(auth_mixins.PermissionRequiredMixin, views.DeleteView):
     permission_required = 'master_data.change_asset'
 
 
-class MaterialsListView(auth_mixins.PermissionRequiredMixin, views.ListView):
+class MaterialsListView(ReplicaReadMixin, auth_mixins.PermissionRequiredMixin, KeysetPaginationMixin,
+                        views.ListView):
     model = Material
     template_name = 'material/materials.html'
     ordering = ('category', 'name')
 
     paginate_by = 10
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-
-        request = self.request.GET.copy()
-        params = request.pop('page', True) and request.urlencode()
-        context['params'] = params
-
-        return context
-
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related('category')
 
         search_text = self.request.GET.get('search_value', None)
         if search_text:
-            queryset = queryset.filter(Q(name__icontains=search_text) | Q(category__name__icontains=search_text))
+            queryset = search(queryset, search_text)
         return queryset
 
     permission_required = 'master_data.view_material'
@@ -115,7 +100,8 @@ class DeleteMaterialView(auth_mixins.PermissionRequiredMixin, views.DeleteView):
     permission_required = 'master_data.change_material'
 
 
-class MaterialCategoriesListView(auth_mixins.PermissionRequiredMixin, views.ListView):
+class MaterialCategoriesListView(ReplicaReadMixin, auth_mixins.PermissionRequiredMixin, KeysetPaginationMixin,
+                                 views.ListView):
     model = MaterialCategory
     template_name = 'material_category/material_categories.html'
     ordering = ('name',)
@@ -124,15 +110,6 @@ class MaterialCategoriesListView(auth_mixins.PermissionRequiredMixin, views.List
 
     permission_required = 'master_data.view_materialcategory'
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-
-        request = self.request.GET.copy()
-        params = request.pop('page', True) and request.urlencode()
-        context['params'] = params
-
-        return context
-
     def get_queryset(self):
         queryset = super().get_queryset()
 
@@ -168,7 +145,8 @@ class DeleteMaterialCategoryView(auth_mixins.PermissionRequiredMixin, views.Dele
     permission_required = 'master_data.change_materialcategory'
 
 
-class BrandsListView(auth_mixins.PermissionRequiredMixin, views.ListView):
+class BrandsListView(ReplicaReadMixin, auth_mixins.PermissionRequiredMixin, KeysetPaginationMixin,
+                     views.ListView):
     model = Brand
     template_name = 'brands/brands.html'
     ordering = ('name',)
@@ -177,15 +155,6 @@ class BrandsListView(auth_mixins.PermissionRequiredMixin, views.ListView):
 
     permission_required = 'master_data.view_brand'
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-
-        request = self.request.GET.copy()
-        params = request.pop('page', True) and request.urlencode()
-        context['params'] = params
-
-        return context
-
     def get_queryset(self):
         queryset = super().get_queryset()
 
@@ -221,7 +190,8 @@ class DeleteBrandView(auth_mixins.PermissionRequiredMixin, views.DeleteView):
     permission_required = 'master_data.change_brand'
 
 
-class AssetCategoriesListView(auth_mixins.PermissionRequiredMixin, views.ListView):
+class AssetCategoriesListView(ReplicaReadMixin, auth_mixins.PermissionRequiredMixin, KeysetPaginationMixin,
+                              views.ListView):
     model = AssetCategory
     template_name = 'asset_category/asset_categories.html'
     ordering = ('name',)
@@ -230,15 +200,6 @@ class AssetCategoriesListView(auth_mixins.PermissionRequiredMixin, views.ListVie
 
     permission_required = 'master_data.view_assetcategory'
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-
-        request = self.request.GET.copy()
-        params = request.pop('page', True) and request.urlencode()
-        context['params'] = params
-
-        return context
-
     def get_queryset(self):
         queryset = super().get_queryset()
 
@@ -1,3 +1,18 @@
 from django.contrib import admin
 
-# Register your models here.
+from service_manager.reports.models import DailyServiceFact
+
+
+@admin.register(DailyServiceFact)
+class DailyServiceFactAdmin(admin.ModelAdmin):
+    list_display = ('day', 'asset_category', 'brand', 'material_category', 'technician', 'orders_received',
+                    'orders_serviced', 'orders_completed', 'revenue', 'material_quantity',)
+    list_filter = ('day', 'asset_category', 'brand', 'material_category',)
+    list_select_related = ('asset_category', 'brand', 'material_category', 'technician',)
+    date_hierarchy = 'day'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ReportsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'service_manager.reports'
+
+    def ready(self):
+        import service_manager.reports.signals
@@ -0,0 +1,22 @@
+from django import forms
+from django.utils.translation import gettext_lazy as _
+
+
+class FinishedOrdersFilterForm(forms.Form):
+    """
+    The "from" - "to" date range of the finished orders report, both days included.
+    """
+    date_from = forms.DateField(input_formats=['%Y-%m-%d'])
+    date_to = forms.DateField(input_formats=['%Y-%m-%d'])
+
+    @classmethod
+    def from_query(cls, params):
+        return cls({'date_from': params.get('from'), 'date_to': params.get('to')})
+
+    def clean(self):
+        cleaned_data = super().clean()
+        date_from = cleaned_data.get('date_from')
+        date_to = cleaned_data.get('date_to')
+        if date_from and date_to and date_from > date_to:
+            raise forms.ValidationError(_('The "from" date must not be after the "to" date.'))
+        return cleaned_data
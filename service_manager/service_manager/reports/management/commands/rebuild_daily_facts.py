@@ -0,0 +1,52 @@
+import datetime
+
+from django.core.management import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from service_manager.main.models import ServiceOrderHeader, ArchivedServiceOrderHeader
+from service_manager.reports.managers import day_of
+from service_manager.reports.models import DailyServiceFact
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily service facts, by default for the whole order history'
+
+    # Days rebuilt in one transaction
+    BATCH_DAYS = 31
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='date_from', type=self.parse_date, help='First day (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='date_to', type=self.parse_date, help='Last day (YYYY-MM-DD)')
+
+    @staticmethod
+    def parse_date(value):
+        try:
+            return datetime.datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError(f'Invalid date "{value}", expected YYYY-MM-DD')
+
+    def handle(self, *args, **options):
+        date_from = options['date_from'] or self.first_day()
+        date_to = options['date_to'] or timezone.localdate()
+        if date_from is None:
+            self.stdout.write('There are no service orders')
+            return
+        if date_from > date_to:
+            raise CommandError('--from is after --to')
+
+        batch_from = date_from
+        while batch_from <= date_to:
+            batch_to = min(batch_from + datetime.timedelta(days=self.BATCH_DAYS - 1), date_to)
+            DailyServiceFact.objects.rebuild(batch_from, batch_to)
+            self.stdout.write(f'Rebuilt {batch_from} - {batch_to}')
+            batch_from = batch_to + datetime.timedelta(days=1)
+
+    @staticmethod
+    def first_day():
+        first_created_on = [
+            model.all_records.aggregate(first=Min('created_on'))['first']
+            for model in (ServiceOrderHeader, ArchivedServiceOrderHeader)
+        ]
+        first_created_on = [x for x in first_created_on if x is not None]
+        return day_of(min(first_created_on)) if first_created_on else None
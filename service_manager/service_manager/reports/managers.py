@@ -0,0 +1,139 @@
+import datetime
+from collections import defaultdict
+
+from django.db import models, transaction
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from service_manager.main.managers import detail_total_amount_expression
+
+MEASURES = ('orders_received', 'orders_serviced', 'orders_completed', 'revenue', 'material_quantity')
+
+DIMENSIONS = ('asset_category_id', 'brand_id', 'material_category_id', 'technician_id')
+
+
+def day_of(value):
+    """
+    The local date of a datetime, the same date TruncDate gives in the database.
+    """
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return timezone.localtime(value).date()
+
+
+def day_ranges(days):
+    """
+    Group the days into (first, last) ranges of consecutive days.
+    """
+    ranges = []
+    for day in sorted(set(days)):
+        if ranges and ranges[-1][1] + datetime.timedelta(days=1) == day:
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return [tuple(day_range) for day_range in ranges]
+
+
+class DailyServiceFactQuerySet(models.QuerySet):
+    def between(self, date_from, date_to):
+        return self.filter(day__gte=date_from, day__lte=date_to)
+
+    def totals(self, *dimensions):
+        """
+        Sum the measures grouped by the given dimensions (e.g. "day", "brand__name").
+        """
+        sums = {measure: Coalesce(Sum(measure), Value(0), output_field=self.model._meta.get_field(measure))
+                for measure in MEASURES}
+        if not dimensions:
+            return self.aggregate(**sums)
+        return self.order_by(*dimensions).values(*dimensions).annotate(**sums)
+
+
+class DailyServiceFactManager(models.Manager):
+    def get_queryset(self):
+        return DailyServiceFactQuerySet(self.model, using=self._db)
+
+    def between(self, date_from, date_to):
+        return self.get_queryset().between(date_from, date_to)
+
+    def totals(self, *dimensions):
+        return self.get_queryset().totals(*dimensions)
+
+    def rebuild_days(self, days):
+        for (date_from, date_to) in day_ranges(days):
+            self.rebuild(date_from, date_to)
+
+    def rebuild(self, date_from, date_to):
+        """
+        Replace the facts of the days from `date_from` to `date_to` (inclusive) with aggregates
+        of the service orders. A handful of grouped queries, whatever the number of orders.
+        The days are locked first, the orders are aggregated once the rebuilds before are committed.
+        """
+        start = timezone.make_aware(datetime.datetime.combine(date_from, datetime.time.min))
+        end = timezone.make_aware(datetime.datetime.combine(date_to + datetime.timedelta(days=1), datetime.time.min))
+
+        with transaction.atomic(using=self.db):
+            self.__lock_days(date_from, date_to)
+
+            facts = defaultdict(lambda: dict.fromkeys(MEASURES, 0))
+            for rows in self.__aggregates(start, end):
+                for row in rows:
+                    measures = {measure: row.pop(measure) for measure in MEASURES if measure in row}
+                    fact = facts[tuple(sorted(row.items()))]
+                    for (measure, value) in measures.items():
+                        fact[measure] += value or 0
+
+            self.filter(day__gte=date_from, day__lte=date_to).delete()
+            self.bulk_create(
+                self.model(**dict(key), **measures) for (key, measures) in facts.items()
+            )
+
+    def __lock_days(self, date_from, date_to):
+        from service_manager.reports.models import DailyServiceFactDay
+
+        days = [date_from + datetime.timedelta(days=i) for i in range((date_to - date_from).days + 1)]
+        DailyServiceFactDay.objects.using(self.db).bulk_create(
+            (DailyServiceFactDay(day=day) for day in days), ignore_conflicts=True)
+        # Always in the same order, so two rebuilds of overlapping days don't deadlock
+        list(DailyServiceFactDay.objects.using(self.db).select_for_update()
+             .filter(day__gte=date_from, day__lte=date_to).order_by('day').values_list('pk', flat=True))
+
+    @staticmethod
+    def __aggregates(start, end):
+        from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail, ArchivedServiceOrderHeader, \
+            ArchivedServiceOrderDetail
+
+        # The archived orders (see main/archive.py) are counted like the others
+        for (order_model, detail_model) in ((ServiceOrderHeader, ServiceOrderDetail),
+                                            (ArchivedServiceOrderHeader, ArchivedServiceOrderDetail)):
+            orders = order_model.all_records.filter(active=True).order_by()
+            asset = {
+                'asset_category_id': models.F('customer_asset__asset__category_id'),
+                'brand_id': models.F('customer_asset__asset__brand_id'),
+            }
+
+            order_events = (
+                ('orders_received', 'created_on', 'accepted_by_id', {}),
+                ('orders_serviced', 'serviced_on', 'serviced_by_id', {'is_serviced': True}),
+                ('orders_completed', 'completed_on', 'serviced_by_id', {'is_completed': True}),
+            )
+            for (measure, date_field, technician, conditions) in order_events:
+                yield orders.filter(**{f'{date_field}__gte': start, f'{date_field}__lt': end}, **conditions) \
+                    .values(day=TruncDate(date_field), technician_id=models.F(technician), **asset) \
+                    .annotate(**{measure: Count('pk')})
+
+            details = detail_model.all_records.filter(
+                active=True,
+                service_order__active=True,
+                service_order__is_completed=True,
+                service_order__completed_on__gte=start,
+                service_order__completed_on__lt=end,
+            ).order_by().values(
+                day=TruncDate('service_order__completed_on'),
+                asset_category_id=models.F('service_order__customer_asset__asset__category_id'),
+                brand_id=models.F('service_order__customer_asset__asset__brand_id'),
+                material_category_id=models.F('material__category_id'),
+                technician_id=models.F('service_order__serviced_by_id'),
+            )
+            yield details.annotate(revenue=Sum(detail_total_amount_expression()), material_quantity=Sum('quantity'))
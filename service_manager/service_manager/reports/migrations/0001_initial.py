@@ -0,0 +1,41 @@
+# Generated by Django 4.1.1 on 2026-10-18 20:52
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('master_data', '0007_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyServiceFact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='day')),
+                ('orders_received', models.PositiveIntegerField(default=0, verbose_name='orders_received')),
+                ('orders_serviced', models.PositiveIntegerField(default=0, verbose_name='orders_serviced')),
+                ('orders_completed', models.PositiveIntegerField(default=0, verbose_name='orders_completed')),
+                ('revenue', models.FloatField(default=0, verbose_name='revenue')),
+                ('material_quantity', models.FloatField(default=0, verbose_name='material_quantity')),
+                ('asset_category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='master_data.assetcategory', verbose_name='asset_category')),
+                ('brand', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='master_data.brand', verbose_name='brand')),
+                ('material_category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='master_data.materialcategory', verbose_name='material_category')),
+                ('technician', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='technician')),
+            ],
+            options={
+                'ordering': ('day',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='dailyservicefact',
+            index=models.Index(fields=['day'], name='daily_service_fact_day_idx'),
+        ),
+    ]
@@ -1,3 +1,108 @@
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+from service_manager.accounts.models import AppUser
+from service_manager.master_data.models import AssetCategory, Brand, MaterialCategory
+from service_manager.reports.managers import DailyServiceFactManager
+
+
+class DailyServiceFact(models.Model):
+    """
+    Pre-aggregated service orders per day, asset category, brand, material category and technician.
+    The order counts are stored without a material category, revenue and material quantity per material category,
+    so every measure can be summed over any set of rows.
+    Rebuilt day by day by the celery tasks the order lifecycle signals publish (see reports/signals.py).
+    """
+
+    day = models.DateField(
+        _('day'),
+    )
+
+    asset_category = models.ForeignKey(
+        AssetCategory,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name=_('asset_category'),
+    )
+
+    brand = models.ForeignKey(
+        Brand,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name=_('brand'),
+    )
+
+    material_category = models.ForeignKey(
+        MaterialCategory,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name=_('material_category'),
+    )
+
+    # Who accepted the received orders and who serviced the rest
+    technician = models.ForeignKey(
+        AppUser,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name=_('technician'),
+    )
+
+    orders_received = models.PositiveIntegerField(
+        _('orders_received'),
+        default=0,
+    )
+
+    orders_serviced = models.PositiveIntegerField(
+        _('orders_serviced'),
+        default=0,
+    )
+
+    orders_completed = models.PositiveIntegerField(
+        _('orders_completed'),
+        default=0,
+    )
+
+    # Recognized on the day the order is completed
+    revenue = models.FloatField(
+        _('revenue'),
+        default=0,
+    )
+
+    material_quantity = models.FloatField(
+        _('material_quantity'),
+        default=0,
+    )
+
+    objects = DailyServiceFactManager()
+
+    def __str__(self):
+        return f'{self.day}---{self.asset_category}---{self.brand}---{self.material_category}---{self.technician}'
+
+    class Meta:
+        ordering = ('day',)
+        indexes = (
+            models.Index(fields=('day',), name='daily_service_fact_day_idx'),
+        )
+
+
+class DailyServiceFactDay(models.Model):
+    """
+    A day the facts were rebuilt for. Its row is locked while the facts of the day are rebuilt,
+    so the concurrent rebuilds of a day run one after the other and don't insert the facts twice.
+    """
+
+    day = models.DateField(
+        _('day'),
+        unique=True,
+    )
+
+    def __str__(self):
+        return f'{self.day}'
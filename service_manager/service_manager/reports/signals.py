@@ -0,0 +1,74 @@
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from service_manager.mailing import outbox
+from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail
+from service_manager.main.signals import service_order_details_created, service_order_details_deleted, \
+    material_price_changed
+from service_manager.reports.managers import day_of
+from service_manager.reports.tasks import rebuild_daily_facts, rebuild_material_daily_facts, \
+    rebuild_service_order_daily_facts
+
+
+def publish_facts_rebuild(days):
+    """
+    The facts of the days are rebuilt by a celery task once the change is committed, not within the request.
+    """
+    if days:
+        outbox.publish(rebuild_daily_facts, days=sorted(day.isoformat() for day in days))
+
+
+def lifecycle_days(created_on, serviced_on, completed_on):
+    return {day_of(value) for value in (created_on, serviced_on, completed_on) if value}
+
+
+def completion_days(service_orders):
+    return service_orders.filter(is_completed=True, completed_on__isnull=False) \
+        .order_by() \
+        .annotate(day=TruncDate('completed_on')) \
+        .values_list('day', flat=True) \
+        .distinct()
+
+
+def loaded_lifecycle_days(service_order):
+    # The deferred fields are left out instead of being loaded one by one
+    return lifecycle_days(*(service_order.__dict__.get(x) for x in ('created_on', 'serviced_on', 'completed_on')))
+
+
+@receiver(post_init, sender=ServiceOrderHeader)
+def remember_service_order_days(sender, instance, **kwargs):
+    """
+    Keep the days the order counted on when it was loaded, they have to be rebuilt as well when they change.
+    """
+    instance.previous_fact_days = loaded_lifecycle_days(instance)
+
+
+@receiver(post_save, sender=ServiceOrderHeader)
+def service_order_saved(sender, instance, **kwargs):
+    days = loaded_lifecycle_days(instance)
+    publish_facts_rebuild(days | getattr(instance, 'previous_fact_days', set()))
+    instance.previous_fact_days = days
+
+
+@receiver(post_save, sender=ServiceOrderDetail)
+@receiver(post_delete, sender=ServiceOrderDetail)
+def service_order_detail_changed(sender, instance, **kwargs):
+    """
+    The revenue of an order is counted on the day it is completed, which the task looks up.
+    """
+    outbox.publish(rebuild_service_order_daily_facts, service_order_ids=[instance.service_order_id])
+
+
+@receiver(service_order_details_created)
+@receiver(service_order_details_deleted)
+def service_order_details_changed_in_bulk(sender, service_order_ids, **kwargs):
+    outbox.publish(rebuild_service_order_daily_facts, service_order_ids=sorted(service_order_ids))
+
+
+@receiver(material_price_changed)
+def material_revenue_changed(sender, material_id, **kwargs):
+    """
+    A price change may touch every completion day, those are rebuilt by a celery task instead of the request.
+    """
+    outbox.publish(rebuild_material_daily_facts, material_id=material_id)
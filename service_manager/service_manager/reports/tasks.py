@@ -0,0 +1,40 @@
+import datetime
+
+from celery import shared_task
+
+
+@shared_task
+def rebuild_daily_facts(days):
+    """
+    Rebuild the facts of the days (YYYY-MM-DD) an order was received, serviced or completed on.
+    """
+    from service_manager.reports.models import DailyServiceFact
+
+    DailyServiceFact.objects.rebuild_days(datetime.date.fromisoformat(day) for day in days)
+    return len(days)
+
+
+@shared_task
+def rebuild_service_order_daily_facts(service_order_ids):
+    """
+    Rebuild the completion days of the orders, after their detail lines changed.
+    """
+    from service_manager.main.models import ServiceOrderHeader
+    from service_manager.reports.models import DailyServiceFact
+    from service_manager.reports.signals import completion_days
+
+    days = set(completion_days(ServiceOrderHeader.all_records.filter(pk__in=service_order_ids)))
+    DailyServiceFact.objects.rebuild_days(days)
+    return len(days)
+
+
+@shared_task
+def rebuild_material_daily_facts(material_id):
+    """
+    Rebuild the completion days of the orders which use the material, after its price changed.
+    """
+    from service_manager.main.models import ServiceOrderDetail
+
+    service_order_ids = ServiceOrderDetail.all_records.filter(material_id=material_id) \
+        .values_list('service_order_id', flat=True).distinct()
+    return rebuild_service_order_daily_facts(list(service_order_ids))
@@ -0,0 +1,202 @@
+import datetime
+from contextlib import contextmanager
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from service_manager.customers.models import Customer, CustomerAsset
+from service_manager.main.models import ServiceOrderHeader, ServiceOrderDetail
+from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset, MaterialCategory, Material
+from service_manager.mailing.models import OutboxEvent
+from service_manager.reports.models import DailyServiceFact, DailyServiceFactDay
+from service_manager.reports.tasks import rebuild_daily_facts, rebuild_material_daily_facts, \
+    rebuild_service_order_daily_facts
+
+UserModel = get_user_model()
+
+
+class DailyServiceFactTests(TestCase):
+    def setUp(self):
+        customer = Customer.objects.create(
+            type=CustomerType.objects.create(name='Business'),
+            name='Testing Inc.',
+            vat='123444121',
+            email_address='testing@inc.com',
+            phone_number='100921122',
+        )
+
+        self.category = AssetCategory.objects.create(name='Mobile')
+        self.brand = Brand.objects.create(name='Apple')
+        self.customer_asset = CustomerAsset.objects.create(
+            customer=customer,
+            asset=Asset.objects.create(category=self.category, brand=self.brand, model_name='iPhone',
+                                       model_number='13 Pro'),
+            serial_number='SN-Apple-21',
+            product_number='California-PN_33',
+        )
+
+        self.labor = MaterialCategory.objects.create(name='Labor')
+        self.parts = MaterialCategory.objects.create(name='Parts')
+        self.effort = Material.objects.create(name='1hr effort', price=50, category=self.labor)
+        self.screen = Material.objects.create(name='Screen', price=120, category=self.parts)
+
+        self.technician = UserModel.objects.create_user(email='tech@dev.com', password='dev')
+        self.today = timezone.localdate()
+
+    @contextmanager
+    def __published_tasks_run(self):
+        """
+        Run the rebuilds published to the outbox meanwhile, the way the celery worker does after drain_outbox().
+        """
+        tasks = {x.name: x for x in (rebuild_daily_facts, rebuild_service_order_daily_facts)}
+        yield
+        for event in OutboxEvent.objects.pending().filter(task_name__in=tasks).order_by('pk'):
+            tasks[event.task_name](**event.kwargs)
+            event.published_on = timezone.now()
+            event.save()
+
+    def __create_service_order(self):
+        with self.__published_tasks_run():
+            return ServiceOrderHeader.objects.create(
+                customer=self.customer_asset.customer,
+                customer_asset=self.customer_asset,
+                problem_description='Broken screen',
+                accepted_by=self.technician,
+                send_emails=False,
+            )
+
+    def __service(self, service_order):
+        with self.__published_tasks_run():
+            service_order.is_serviced = True
+            service_order.serviced_by = self.technician
+            service_order.serviced_on = timezone.now()
+            service_order.save()
+
+    def __complete(self, service_order, completed_on=None):
+        with self.__published_tasks_run():
+            service_order.is_completed = True
+            service_order.completed_on = completed_on or timezone.now()
+            service_order.save()
+
+    def __add_detail(self, service_order, material, quantity):
+        with self.__published_tasks_run():
+            return ServiceOrderDetail.objects.create(service_order=service_order, material=material,
+                                                     quantity=quantity, discount=0)
+
+    def __facts(self):
+        return list(DailyServiceFact.objects.order_by('material_category__name').values(
+            'day', 'asset_category', 'brand', 'material_category', 'technician', 'orders_received',
+            'orders_serviced', 'orders_completed', 'revenue', 'material_quantity',
+        ))
+
+    def test_facts__when_order_is_received__expect_received_count(self):
+        self.__create_service_order()
+        self.__create_service_order()
+
+        totals = DailyServiceFact.objects.between(self.today, self.today).totals()
+
+        self.assertEqual(totals['orders_received'], 2)
+        self.assertEqual(totals['orders_serviced'], 0)
+        fact = DailyServiceFact.objects.get()
+        self.assertEqual((fact.asset_category, fact.brand, fact.technician),
+                         (self.category, self.brand, self.technician))
+
+    def test_facts__when_order_is_saved__expect_rebuild_published_instead_of_run(self):
+        service_order = self.__create_service_order()
+
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(2):
+            service_order.problem_description = 'Broken screen and battery'
+            service_order.save()
+
+        self.assertEqual({'days': [self.today.isoformat()]},
+                         OutboxEvent.objects.filter(task_name=rebuild_daily_facts.name).last().kwargs)
+
+    def test_facts__when_order_is_completed__expect_revenue_per_material_category(self):
+        service_order = self.__create_service_order()
+        self.__service(service_order)
+        self.__add_detail(service_order, self.effort, 2)
+        self.__add_detail(service_order, self.screen, 1)
+        self.__complete(service_order)
+
+        totals = DailyServiceFact.objects.totals('material_category__name')
+
+        self.assertEqual(list(totals), [
+            {'material_category__name': None, 'orders_received': 1, 'orders_serviced': 1, 'orders_completed': 1,
+             'revenue': 0, 'material_quantity': 0},
+            {'material_category__name': 'Labor', 'orders_received': 0, 'orders_serviced': 0, 'orders_completed': 0,
+             'revenue': 100, 'material_quantity': 2},
+            {'material_category__name': 'Parts', 'orders_received': 0, 'orders_serviced': 0, 'orders_completed': 0,
+             'revenue': 120, 'material_quantity': 1},
+        ])
+
+    def test_facts__when_detail_is_added_after_completion__expect_revenue_updated(self):
+        service_order = self.__create_service_order()
+        self.__complete(service_order)
+        detail = self.__add_detail(service_order, self.effort, 1)
+
+        with self.__published_tasks_run():
+            detail.quantity = 3
+            detail.save()
+
+        self.assertEqual(DailyServiceFact.objects.totals()['revenue'], 150)
+
+    def test_facts__when_material_price_changes__expect_rebuilt_by_task(self):
+        service_order = self.__create_service_order()
+        self.__add_detail(service_order, self.effort, 2)
+        self.__complete(service_order)
+
+        with self.__published_tasks_run():
+            self.effort.price = 60
+            self.effort.save()
+
+        self.assertEqual(DailyServiceFact.objects.totals()['revenue'], 100)
+        event = OutboxEvent.objects.get(task_name=rebuild_material_daily_facts.name)
+        rebuild_material_daily_facts(**event.kwargs)
+        self.assertEqual(DailyServiceFact.objects.totals()['revenue'], 120)
+
+    def test_rebuild__when_day_is_rebuilt_twice__expect_facts_once(self):
+        self.__create_service_order()
+
+        DailyServiceFact.objects.rebuild(self.today, self.today)
+        DailyServiceFact.objects.rebuild(self.today, self.today)
+
+        self.assertEqual(DailyServiceFact.objects.totals()['orders_received'], 1)
+        self.assertEqual(1, DailyServiceFactDay.objects.filter(day=self.today).count())
+
+    def test_facts__when_service_is_rolled_back__expect_serviced_count_removed(self):
+        service_order = self.__create_service_order()
+        self.__service(service_order)
+
+        with self.__published_tasks_run():
+            service_order.is_serviced = False
+            service_order.serviced_by = None
+            service_order.serviced_on = None
+            service_order.save()
+
+        self.assertEqual(DailyServiceFact.objects.totals()['orders_serviced'], 0)
+
+    def test_facts__when_completion_day_changes__expect_both_days_rebuilt(self):
+        service_order = self.__create_service_order()
+        self.__add_detail(service_order, self.effort, 1)
+        last_week = timezone.now() - datetime.timedelta(days=7)
+        self.__complete(service_order, completed_on=last_week)
+
+        self.__complete(service_order, completed_on=timezone.now())
+
+        self.assertEqual(DailyServiceFact.objects.filter(day=timezone.localdate(last_week)).count(), 0)
+        self.assertEqual(DailyServiceFact.objects.between(self.today, self.today).totals()['revenue'], 50)
+
+    def test_rebuild_command__expect_same_facts_as_incremental_updates(self):
+        service_order = self.__create_service_order()
+        self.__service(service_order)
+        self.__add_detail(service_order, self.screen, 1)
+        self.__complete(service_order)
+        expected_facts = self.__facts()
+
+        DailyServiceFact.objects.all().delete()
+        call_command('rebuild_daily_facts', stdout=StringIO())
+
+        self.assertEqual(self.__facts(), expected_facts)
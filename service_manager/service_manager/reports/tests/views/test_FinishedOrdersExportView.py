@@ -0,0 +1,119 @@
+import csv
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from service_manager.accounts.models import Profile
+from service_manager.customers.models import Customer, CustomerAsset
+from service_manager.main.models import ServiceOrderHeader
+from service_manager.master_data.models import CustomerType, AssetCategory, Brand, Asset
+
+UserModel = get_user_model()
+
+
+class FinishedOrdersExportViewTests(TestCase):
+    USER_DATA = {
+        'email': 'dev@dev.com',
+        'password': 'dev',
+    }
+
+    def setUp(self):
+        customer = Customer.objects.create(
+            type=CustomerType.objects.create(name='Business'),
+            name='Testing Inc.',
+            vat='123444121',
+            email_address='testing@inc.com',
+            phone_number='100921122',
+        )
+
+        self.customer_asset = CustomerAsset.objects.create(
+            customer=customer,
+            asset=Asset.objects.create(
+                category=AssetCategory.objects.create(name='Mobile'),
+                brand=Brand.objects.create(name='Apple'),
+                model_name='iPhone',
+                model_number='13 Pro',
+            ),
+            serial_number='SN-Apple-21',
+            product_number='California-PN_33',
+        )
+
+    def __login(self, with_permission=True):
+        user = UserModel.objects.create_user(**self.USER_DATA)
+        if with_permission:
+            user.user_permissions.add(Permission.objects.get(codename='view_serviceorderheader'))
+        Profile.objects.create(first_name='Dev', last_name='User', app_user=user)
+        self.client.login(**self.USER_DATA)
+
+    def __create_service_order(self, completed_on, is_completed=True):
+        return ServiceOrderHeader.objects.create(
+            customer=self.customer_asset.customer,
+            customer_asset=self.customer_asset,
+            problem_description='Broken screen',
+            is_serviced=True,
+            serviced_on=completed_on,
+            is_completed=is_completed,
+            completed_on=completed_on if is_completed else None,
+            send_emails=False,
+        )
+
+    def __get_rows(self, data=None):
+        response = self.client.get(reverse('finished_orders_export'), data=data or {})
+        content = b''.join(response.streaming_content).decode()
+        return response, list(csv.reader(content.splitlines()))
+
+    def test_get__when_orders_are_finished__expect_csv_rows(self):
+        self.__login()
+        completed_on = datetime.datetime(2022, 11, 3, 10, 30, tzinfo=datetime.timezone.utc)
+        service_order = self.__create_service_order(completed_on)
+        self.__create_service_order(completed_on, is_completed=False)
+
+        response, rows = self.__get_rows()
+
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0][:3], ['ID', 'Name', 'Category'])
+        self.assertEqual(rows[1], [
+            str(service_order.pk), 'Testing Inc.', 'Mobile', 'Apple', 'iPhone', '13 Pro', 'SN-Apple-21',
+            'California-PN_33', timezone.localtime(service_order.created_on).strftime('%Y-%m-%d %H:%M:%S'),
+            '2022-11-03 10:30:00', '2022-11-03 10:30:00',
+        ])
+
+    def test_get__when_filtered_by_dates__expect_orders_in_range_only(self):
+        self.__login()
+        in_range = self.__create_service_order(datetime.datetime(2022, 11, 3, tzinfo=datetime.timezone.utc))
+        self.__create_service_order(datetime.datetime(2022, 12, 3, tzinfo=datetime.timezone.utc))
+
+        response, rows = self.__get_rows({'from': '2022-11-01', 'to': '2022-11-30'})
+
+        self.assertEqual([row[0] for row in rows[1:]], [str(in_range.pk)])
+        self.assertIn('finished_orders_2022-11-01_2022-11-30.csv', response['Content-Disposition'])
+
+    def test_get__when_filtered_by_dates__expect_whole_last_day_only(self):
+        self.__login()
+        last_day = self.__create_service_order(datetime.datetime(2022, 11, 30, 23, 30, tzinfo=datetime.timezone.utc))
+        self.__create_service_order(datetime.datetime(2022, 12, 1, tzinfo=datetime.timezone.utc))
+
+        response, rows = self.__get_rows({'from': '2022-11-01', 'to': '2022-11-30'})
+
+        self.assertEqual([row[0] for row in rows[1:]], [str(last_day.pk)])
+
+    def test_get__when_date_is_malformed__expect_bad_request(self):
+        self.__login()
+
+        for data in ({'from': '2022-11-01', 'to': 'yesterday'}, {'from': '2022-11-30', 'to': '2022-11-01'}):
+            with self.subTest(data=data):
+                response = self.client.get(reverse('finished_orders_export'), data=data)
+
+                self.assertEqual(response.status_code, 400)
+
+    def test_get__when_user_has_no_permission__expect_forbidden(self):
+        self.__login(with_permission=False)
+
+        response = self.client.get(reverse('finished_orders_export'))
+
+        self.assertEqual(response.status_code, 403)
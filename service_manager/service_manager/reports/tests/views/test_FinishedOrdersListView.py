@@ -0,0 +1,23 @@
+import datetime
+
+from django.test import TestCase
+from django.urls import reverse
+
+from service_manager.reports.models import DailyServiceFact
+
+
+class FinishedOrdersListViewTests(TestCase):
+    def test_get__when_filtered_by_dates__expect_totals_of_daily_facts_in_range(self):
+        DailyServiceFact.objects.create(day=datetime.date(2022, 11, 1), orders_completed=2, revenue=150)
+        DailyServiceFact.objects.create(day=datetime.date(2022, 11, 30), orders_completed=1, revenue=50)
+        DailyServiceFact.objects.create(day=datetime.date(2022, 12, 1), orders_completed=4, revenue=400)
+
+        response = self.client.get(reverse('finished_orders'), {'from': '2022-11-01', 'to': '2022-11-30'})
+
+        totals = response.context['totals']
+        self.assertEqual((3, 200), (totals['orders_completed'], totals['revenue']))
+
+    def test_get__when_date_is_malformed__expect_bad_request(self):
+        response = self.client.get(reverse('finished_orders'), {'from': '2022-13-01', 'to': '2022-11-30'})
+
+        self.assertEqual(response.status_code, 400)
@@ -1,7 +1,8 @@
 from django.urls import path
 
-from service_manager.reports.views import FinishedOrdersListView
+from service_manager.reports.views import FinishedOrdersListView, FinishedOrdersExportView
 
 urlpatterns = [
     path('finished_orders/', FinishedOrdersListView.as_view(), name='finished_orders'),
+    path('finished_orders/export/', FinishedOrdersExportView.as_view(), name='finished_orders_export'),
 ]
\ No newline at end of file
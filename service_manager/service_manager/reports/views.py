@@ -1,26 +1,169 @@
+import csv
 import datetime as dt
+from itertools import chain
+from operator import attrgetter
 
+from django.conf import settings
+from django.contrib.auth import mixins as auth_mixins
+from django.core.exceptions import BadRequest
+from django.db import router
 from django.db.models import Q
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 import django.views.generic as views
 
-from service_manager.main.models import ServiceOrderHeader
+from service_manager.core.views import ReplicaReadMixin
+from service_manager.main.models import ServiceOrderHeader, ArchivedServiceOrderHeader
+from service_manager.reports.forms import FinishedOrdersFilterForm
+from service_manager.reports.models import DailyServiceFact
 
 
-class FinishedOrdersListView(views.ListView):
+class FinishedOrdersFilterMixin:
+    """
+    Completed service orders, optionally within the "from" - "to" date range of the request.
+    The orders moved to the archive (see main/archive.py) are read from the archive table the same way.
+    """
+
+    def get_date_range(self):
+        """
+        The aware bounds of the range, from the start of the "from" day to the start of the day after "to".
+        A malformed range is a bad request, instead of a report of every order.
+        """
+        params = self.request.GET
+        if not (params.get('from') and params.get('to')):
+            return None
+
+        form = FinishedOrdersFilterForm.from_query(params)
+        if not form.is_valid():
+            raise BadRequest(form.errors.as_text())
+
+        date_from = timezone.make_aware(dt.datetime.combine(form.cleaned_data['date_from'], dt.time.min))
+        date_to = timezone.make_aware(
+            dt.datetime.combine(form.cleaned_data['date_to'] + dt.timedelta(days=1), dt.time.min))
+        return date_from, date_to
+
+    def get_finished_orders(self, model=ServiceOrderHeader):
+        query_set = model.objects.filter(is_completed=True)
+
+        date_range = self.get_date_range()
+        if date_range:
+            date_from, date_to = date_range
+            # return query_set.filter(Q(completed_on__gte=date_from))
+            query_set = query_set.filter(Q(completed_on__gte=date_from), Q(completed_on__lt=date_to))
+            if settings.SERVICE_ORDER_PARTITIONING:
+                # An order is created before it is completed, the bound on created_on (the partition key)
+                # lets PostgreSQL skip the partitions of the later months
+                query_set = query_set.filter(created_on__lt=date_to)
+            return query_set
+        return query_set
+
+
+class FinishedOrdersListView(ReplicaReadMixin, FinishedOrdersFilterMixin, views.ListView):
     model = ServiceOrderHeader
     template_name = 'finished_orders.html'
-    RELATED_ENTITIES = ['serviceordernote_set', 'serviceorderdetail_set', 'customer__customerasset_set', ]
+    RELATED_ENTITIES = ['customer', 'customer_asset__asset__category', 'customer_asset__asset__brand', ]
 
     def get_queryset(self):
-        date_from = self.request.GET.get('from', None)
-        date_to = self.request.GET.get('to', None)
-
-        query_set = ServiceOrderHeader.objects.filter(is_completed=True).prefetch_related(*self.RELATED_ENTITIES)
-        if date_from and date_to:
-            date_from = dt.datetime.strptime(date_from, '%Y-%m-%d')
-            date_to = dt.datetime.strptime(date_to, '%Y-%m-%d')
-            date_to += dt.timedelta(days=1)
-            # return query_set.filter(Q(completed_on__gte=date_from))
-            return query_set.filter(Q(completed_on__gte=date_from), Q(completed_on__lte=date_to))
-        return query_set
+        return sorted(
+            chain(
+                self.get_finished_orders().select_related(*self.RELATED_ENTITIES),
+                self.get_finished_orders(ArchivedServiceOrderHeader).select_related(*self.RELATED_ENTITIES),
+            ),
+            key=attrgetter('created_on'),
+            reverse=True,
+        )
+
+    # The totals are summed from the daily facts (see reports/models.py) instead of all the orders of the range
+    def get_totals(self):
+        facts = DailyServiceFact.objects.all()
+        date_range = self.get_date_range()
+        if date_range:
+            date_from, date_to = date_range
+            facts = facts.between(timezone.localdate(date_from), timezone.localdate(date_to - dt.timedelta(days=1)))
+        return facts.totals()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['params'] = self.request.GET.urlencode()
+        context['totals'] = self.get_totals()
+        return context
+
+
+class Echo:
+    """
+    File-like object which returns what is written to it, so csv.writer can feed a streaming response.
+    """
+
+    def write(self, value):
+        return value
+
+
+class FinishedOrdersExportView(ReplicaReadMixin, auth_mixins.PermissionRequiredMixin, FinishedOrdersFilterMixin,
+                               views.View):
+    """
+    The finished orders of the report as CSV.
+    The rows are read in chunks (with a server-side cursor on PostgreSQL) and written out as they come,
+    so the memory use doesn't grow with the number of orders and the download starts right away.
+    """
+    CHUNK_SIZE = 2000
+
+    COLUMNS = (
+        ('id', _('ID')),
+        ('customer__name', _('Name')),
+        ('customer_asset__asset__category__name', _('Category')),
+        ('customer_asset__asset__brand__name', _('Brand')),
+        ('customer_asset__asset__model_name', _('Model Name')),
+        ('customer_asset__asset__model_number', _('Model Number')),
+        ('customer_asset__serial_number', _('Serial Number')),
+        ('customer_asset__product_number', _('Product Number')),
+        ('created_on', _('Accepted On')),
+        ('serviced_on', _('Serviced On')),
+        ('completed_on', _('Returned On')),
+    )
+
+    permission_required = 'main.view_serviceorderheader'
+
+    def get(self, request, *args, **kwargs):
+        # The range is checked before the response starts streaming
+        filename = self.get_filename()
+        # The rows are streamed after the view returned, so the database is chosen now
+        rows = self.get_rows(using=router.db_for_read(ServiceOrderHeader))
+        response = StreamingHttpResponse(rows, content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def get_filename(self):
+        date_range = self.get_date_range()
+        if not date_range:
+            return 'finished_orders.csv'
+        date_from, date_to = date_range
+        return f'finished_orders_{timezone.localdate(date_from):%Y-%m-%d}_' \
+               f'{timezone.localdate(date_to - dt.timedelta(days=1)):%Y-%m-%d}.csv'
+
+    def get_rows(self, using=None):
+        writer = csv.writer(Echo())
+        yield writer.writerow([str(title) for (field, title) in self.COLUMNS])
+
+        fields = [field for (field, title) in self.COLUMNS]
+        archived_rows = self.get_finished_orders(ArchivedServiceOrderHeader).using(using).order_by() \
+            .values_list(*fields)
+        rows = self.get_finished_orders() \
+            .using(using) \
+            .order_by() \
+            .values_list(*fields) \
+            .union(archived_rows, all=True) \
+            .order_by('completed_on', 'id') \
+            .iterator(chunk_size=self.CHUNK_SIZE)
+
+        for row in rows:
+            yield writer.writerow([self.format_value(value) for value in row])
+
+    @staticmethod
+    def format_value(value):
+        if isinstance(value, dt.datetime):
+            return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S')
+        if value is None:
+            return ''
+        return value
@@ -54,21 +54,30 @@ PROJECT_APPS = (
     'service_manager.customers',
     'service_manager.master_data',
     'service_manager.reports',
+    'service_manager.mailing',
+    'service_manager.api',
 )
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + PROJECT_APPS
 
 MIDDLEWARE = [
+    "service_manager.core.db_routers.ReadYourWritesMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     'django.middleware.locale.LocaleMiddleware',
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "service_manager.core.identity_map.IdentityMapMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Count the queries of every request and log the pages over their budget or with N+1 queries
+# (see core/query_budget.py). Recording every query has a cost, so it is on by default only with DEBUG
+if os.environ.get('QUERY_BUDGET_MIDDLEWARE', '1' if DEBUG else '0') == '1':
+    MIDDLEWARE.insert(0, "service_manager.core.query_budget.QueryBudgetMiddleware")
+
 ROOT_URLCONF = "service_manager.urls"
 
 TEMPLATES = [
@@ -101,6 +110,35 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD'),
         'HOST': os.environ.get('DB_HOST'),
         'PORT': os.environ.get('DB_PORT'),
+        # The web and the celery worker processes keep their connections open for DB_CONN_MAX_AGE seconds
+        # and check them before a request or a task reuses them
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', '1') == '1',
+        # With DB_ENGINE=service_manager.core.db_backends.postgresql every process opens at most DB_POOL_SIZE
+        # connections and waits up to DB_POOL_TIMEOUT seconds for a free one (see core/db_backends/pooling.py)
+        'POOL_SIZE': int(os.environ.get('DB_POOL_SIZE', 0)),
+        'POOL_TIMEOUT': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+    }
+}
+
+# Read replicas of the default database, one per entry of DB_REPLICAS: the host of the replica, or its database
+# file on SQLite. The list and report pages read from them (see core/db_routers.py), the clients which wrote
+# read from the primary for DB_REPLICA_PIN_SECONDS afterwards, until the replicas caught up
+DATABASE_REPLICAS = []
+for (replica_number, replica) in enumerate(filter(None, os.environ.get('DB_REPLICAS', '').split(',')), start=1):
+    replica_location = {'NAME': replica} if 'sqlite' in (DATABASES['default']['ENGINE'] or '') else {'HOST': replica}
+    DATABASES[f'replica_{replica_number}'] = {**DATABASES['default'], **replica_location, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica_{replica_number}')
+DATABASE_ROUTERS = ['service_manager.core.db_routers.PrimaryReplicaRouter']
+DB_REPLICA_PIN_SECONDS = int(os.environ.get('DB_REPLICA_PIN_SECONDS', 5))
+
+# The fragment caches are invalidated by signals and the email flushes are scheduled once,
+# so every process has to share the same cache
+# (e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache and CACHE_LOCATION=redis://...)
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
     }
 }
 
@@ -179,12 +217,59 @@ LOGGING = {
         'django.db.backends': {
             'level': 'DEBUG',
             'handlers': ['console'],
-        }
+        },
+        'service_manager.query_budget': {
+            'level': 'WARNING',
+            'handlers': ['console'],
+        },
+        'service_manager.mailing': {
+            'level': 'INFO',
+            'handlers': ['console'],
+        },
+        'service_manager.customers': {
+            'level': 'INFO',
+            'handlers': ['console'],
+        },
+        'service_manager.main': {
+            'level': 'INFO',
+            'handlers': ['console'],
+        },
+        'service_manager.db': {
+            'level': 'WARNING',
+            'handlers': ['console'],
+        },
     }
 }
 
+# Number of times the same query shape may run in one request before it is reported as N+1
+QUERY_BUDGET_N_PLUS_ONE_THRESHOLD = int(os.environ.get('QUERY_BUDGET_N_PLUS_ONE_THRESHOLD', 5))
+
+# Row counts of the cursor paginated lists: exact counts from this size on are cached for a short time,
+# above the estimate threshold PostgreSQL's planner estimate is shown instead of counting the rows
+KEYSET_PAGINATION_COUNT_CACHE_MIN_ROWS = int(os.environ.get('KEYSET_PAGINATION_COUNT_CACHE_MIN_ROWS', 1000))
+KEYSET_PAGINATION_COUNT_CACHE_TIMEOUT = int(os.environ.get('KEYSET_PAGINATION_COUNT_CACHE_TIMEOUT', 60))
+KEYSET_PAGINATION_COUNT_ESTIMATE_THRESHOLD = int(os.environ.get('KEYSET_PAGINATION_COUNT_ESTIMATE_THRESHOLD', 10000))
+
+# Seconds the fragments of the service order page are cached. Edits of the order, its detail lines, notes,
+# customer and asset render them again right away, the timeout only bounds e.g. renamed users or categories
+SERVICE_ORDER_FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('SERVICE_ORDER_FRAGMENT_CACHE_TIMEOUT', 60 * 60))
+
+# Dotted path of the search backend, chosen by the database vendor when not set (see core/search.py)
+SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND')
+
 AUTH_USER_MODEL = 'accounts.AppUser'
 
+AUTHENTICATION_BACKENDS = [
+    'service_manager.accounts.backends.CachedPermissionsBackend',
+]
+
+# Seconds the permissions of a user are cached. Changes of users, groups and permissions invalidate them right away,
+# but only in the process which made them unless the cache is shared, so the default of a per-process cache is short
+PERMISSIONS_CACHE_TIMEOUT = int(os.environ.get(
+    'PERMISSIONS_CACHE_TIMEOUT',
+    60 if CACHES['default']['BACKEND'].endswith('.LocMemCache') else 60 * 60,
+))
+
 LOGIN_URL = reverse_lazy('login_user')
 LOGOUT_REDIRECT_URL = reverse_lazy('index')
 
@@ -194,6 +279,37 @@ CELERY_ACCEPT_CONTENT = ['application/json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 
+# The outbox events (see mailing/outbox.py) are published by celery beat every OUTBOX_DRAIN_INTERVAL seconds,
+# or by "manage.py drain_outbox --interval" running as its own process
+OUTBOX_DRAIN_INTERVAL = float(os.environ.get('OUTBOX_DRAIN_INTERVAL', 2))
+OUTBOX_DRAIN_BATCH_SIZE = int(os.environ.get('OUTBOX_DRAIN_BATCH_SIZE', 500))
+# The service orders soft deleted for ARCHIVE_DELETED_AFTER_DAYS or completed for ARCHIVE_COMPLETED_AFTER_DAYS
+# are moved to the archive tables (see main/archive.py) every ARCHIVE_INTERVAL seconds, ARCHIVE_BATCH_SIZE at a time
+ARCHIVE_INTERVAL = float(os.environ.get('ARCHIVE_INTERVAL', 24 * 60 * 60))
+ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', 500))
+ARCHIVE_DELETED_AFTER_DAYS = int(os.environ.get('ARCHIVE_DELETED_AFTER_DAYS', 30))
+ARCHIVE_COMPLETED_AFTER_DAYS = int(os.environ.get('ARCHIVE_COMPLETED_AFTER_DAYS', 2 * 365))
+# On PostgreSQL the service order tables are partitioned by month of created_on once SERVICE_ORDER_PARTITIONING
+# is set (see main/partitioning.py), the partitions of the next PARTITION_MONTHS_AHEAD months are created
+# every PARTITION_INTERVAL seconds
+SERVICE_ORDER_PARTITIONING = bool(os.environ.get('SERVICE_ORDER_PARTITIONING'))
+PARTITION_MONTHS_AHEAD = int(os.environ.get('PARTITION_MONTHS_AHEAD', 3))
+PARTITION_INTERVAL = float(os.environ.get('PARTITION_INTERVAL', 24 * 60 * 60))
+CELERY_BEAT_SCHEDULE = {
+    'publish-outbox-events': {
+        'task': 'service_manager.mailing.tasks.publish_outbox_events',
+        'schedule': OUTBOX_DRAIN_INTERVAL,
+    },
+    'archive-service-orders': {
+        'task': 'service_manager.main.tasks.archive_service_orders',
+        'schedule': ARCHIVE_INTERVAL,
+    },
+    'create-service-order-partitions': {
+        'task': 'service_manager.main.tasks.create_service_order_partitions',
+        'schedule': PARTITION_INTERVAL,
+    },
+}
+
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.environ.get('EMAIL_HOST')
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER')
@@ -203,6 +319,29 @@ EMAIL_USE_SSL = bool(os.environ.get('EMAIL_USE_SSL'))
 
 SUPPORT_EMAIL = os.environ.get('SUPPORT_EMAIL')
 
+# The queued emails are sent this many seconds after the first one of a burst, in batches over one connection,
+# at most EMAIL_SEND_RATE emails per second (0 for no limit) and retried up to EMAIL_MAX_ATTEMPTS times
+EMAIL_FLUSH_DELAY = int(os.environ.get('EMAIL_FLUSH_DELAY', 5))
+EMAIL_BATCH_SIZE = int(os.environ.get('EMAIL_BATCH_SIZE', 50))
+EMAIL_SEND_RATE = float(os.environ.get('EMAIL_SEND_RATE', 0))
+EMAIL_MAX_ATTEMPTS = int(os.environ.get('EMAIL_MAX_ATTEMPTS', 3))
+# Only one flush is scheduled at a time, which takes a cache shared by the processes (see CACHES). Celery beat sends
+# whatever is left in the queue every EMAIL_SWEEP_INTERVAL seconds as well, e.g. when scheduling the flush failed
+EMAIL_SWEEP_INTERVAL = float(os.environ.get('EMAIL_SWEEP_INTERVAL', 60))
+CELERY_BEAT_SCHEDULE['send-queued-emails'] = {
+    'task': 'service_manager.mailing.tasks.send_queued_emails',
+    'schedule': EMAIL_SWEEP_INTERVAL,
+}
+
+# Rows of the customer CSV imports which are validated and inserted together
+IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 2000))
+# Processes which validate the rows of the imports uploaded from the site, 0 to validate them in the request
+IMPORT_WORKERS = int(os.environ.get('IMPORT_WORKERS', 0))
+
+# Rows per page of the JSON API, the "limit" parameter can ask for up to API_MAX_PAGE_SIZE
+API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', 25))
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 100))
+
 MESSAGE_TAGS = {
     messages.DEBUG: 'alert-secondary',
     messages.INFO: 'alert-info',
@@ -25,4 +25,6 @@ urlpatterns = i18n_patterns(
     path('accounts/', include('service_manager.accounts.urls')),
     path('reports/', include('service_manager.reports.urls')),
     re_path(r'^rosetta/', include('rosetta.urls'))
-)
+) + [
+    path('api/v1/', include('service_manager.api.urls')),
+]
@@ -0,0 +1,9 @@
+// The full jQuery is kept, base.html loads the slim build (without ajax) afterwards
+(function ($) {
+    // The pages of a fragment (e.g. a tab of the customer detail page) are loaded in place
+    $(document).on('click', '[data-fragment-url] .page-link[href]', function (event) {
+        var container = $(this).closest('[data-fragment-url]');
+        event.preventDefault();
+        container.load(container.data('fragment-url') + this.search);
+    });
+})(jQuery);